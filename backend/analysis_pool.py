@@ -0,0 +1,251 @@
+import os
+import time
+import logging
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from metrics import metrics
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# The analyzer owned by each worker process
+_analyzer = None
+
+
+class AnalysisUnavailable(Exception):
+    """Raised when the pool cannot produce a result; status_code is the HTTP status to report."""
+    status_code = 503
+
+
+class PoolBusy(AnalysisUnavailable):
+    """Raised when the pool's queue is full."""
+    status_code = 503
+
+
+class AnalysisTimeout(AnalysisUnavailable):
+    """Raised when a task does not finish within its timeout."""
+    status_code = 504
+
+
+def _init_worker(analyzer_kwargs, warmup, started):
+    """Build this worker's analyzer once, warm it up and report back."""
+    global _analyzer
+    from analyzer import ResumeAnalyzer
+    from startup import Readiness, warm_up
+
+    _analyzer = ResumeAnalyzer(**analyzer_kwargs)
+    if warmup:
+        warm_up(_analyzer, Readiness())
+    started.put(os.getpid())
+
+
+def _call(method, args, kwargs, timed=False):
+    """Run an analyzer method in the worker, returning its stage timings too if timed."""
+    if not timed:
+        return getattr(_analyzer, method)(*args, **kwargs), None
+    metrics.enable()
+    with metrics.collect() as timings:
+        result = getattr(_analyzer, method)(*args, **kwargs)
+    return result, timings
+
+
+class AnalysisPool:
+    """
+    Runs ResumeAnalyzer methods in a pool of worker processes so CPU-bound
+    analysis does not hold the serving process's GIL. Each worker builds and
+    warms up its own analyzer once. The number of queued and running tasks is
+    bounded, every task has a timeout, and tasks still waiting in the queue
+    are cancelled when their caller gives up.
+
+    A timeout does not free capacity: a task that has started keeps its worker
+    and its queue slot until it finishes, so workers stuck on slow inputs make
+    later callers time out too, until the queue fills and they are turned
+    away with PoolBusy. Keep max_pending small enough that queued tasks can
+    start within the timeout.
+
+    When a worker dies, the pool is relaunched on a background thread, and
+    callers get AnalysisUnavailable until the new workers are ready.
+    """
+
+    def __init__(self, analyzer_kwargs=None, workers=None, max_pending=None, timeout=30,
+                 warmup=True, start_method=None, startup_timeout=300):
+        """
+        Initialize the AnalysisPool and start its workers.
+
+        Args:
+            analyzer_kwargs (dict): Keyword arguments for each worker's ResumeAnalyzer
+            workers (int): Number of worker processes, the CPU count by default
+            max_pending (int): Maximum queued plus running tasks, 2 per worker by default
+            timeout (float): Default seconds to wait for a result
+            warmup (bool): Run a warm-up analysis in each worker before it takes tasks
+            start_method (str): multiprocessing start method; 'fork' where available, so
+                workers do not re-import the serving module, otherwise 'spawn'
+            startup_timeout (float): Seconds all workers together have to start and warm up
+        """
+        self.analyzer_kwargs = analyzer_kwargs or {}
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self.timeout = timeout
+        self.warmup = warmup
+        self.startup_timeout = startup_timeout
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._restarting = False
+        self._executor = self._launch()
+
+    def _launch(self):
+        """
+        Start a new executor's worker processes and wait until each has warmed up.
+
+        Returns:
+            ProcessPoolExecutor: The ready executor
+
+        Raises:
+            TimeoutError: If the workers are not ready within startup_timeout
+        """
+        started = self._context.Queue()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self.analyzer_kwargs, self.warmup, started)
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        try:
+            # Workers start on the first submission; a no-op task launches them
+            executor.submit(os.getpid).result(timeout=self.startup_timeout)
+            for _ in range(self.workers):
+                started.get(timeout=max(deadline - time.monotonic(), 0))
+        except (queue.Empty, FutureTimeoutError):
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise TimeoutError(f"Analysis workers did not start within {self.startup_timeout} seconds")
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        logger.info(f"Analysis pool ready with {self.workers} workers")
+        return executor
+
+    def _restart(self, executor):
+        """
+        Start replacing a broken executor on a background thread, unless another
+        thread already has or is doing so. Returns at once; callers are turned
+        away with AnalysisUnavailable until the new workers are ready.
+
+        Args:
+            executor (ProcessPoolExecutor): The executor the failed task was submitted to
+        """
+        with self._lock:
+            if self._executor is not executor or self._restarting:
+                return
+            self._restarting = True
+        logger.warning("Analysis pool is broken (a worker died); restarting it")
+        threading.Thread(target=self._relaunch, args=(executor,), name='analysis-pool-restart',
+                         daemon=True).start()
+
+    def _relaunch(self, executor):
+        """Replace a broken executor with a newly launched one."""
+        try:
+            executor.shutdown(wait=False, cancel_futures=True)
+            replacement = self._launch()
+        except Exception as e:
+            # The broken executor stays current, so the next submission tries again
+            logger.error(f"Failed to restart the analysis pool: {str(e)}", exc_info=True)
+            with self._lock:
+                self._restarting = False
+            return
+        with self._lock:
+            self._executor = replacement
+            self._restarting = False
+
+    def _submit(self, method, args, kwargs):
+        """Queue a call, returning its future and the executor it was submitted to."""
+        if self._restarting:
+            raise AnalysisUnavailable("Analysis pool is restarting, try again shortly")
+        if not self._slots.acquire(blocking=False):
+            raise PoolBusy("Analysis queue is full, try again shortly")
+        executor = self._executor
+        try:
+            future = executor.submit(_call, method, args, kwargs, metrics.enabled)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._restart(executor)
+            raise AnalysisUnavailable("Analysis pool is restarting, try again shortly")
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the task actually stops running
+        future.add_done_callback(lambda _: self._slots.release())
+        return future, executor
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Queue an analyzer method call.
+
+        Args:
+            method (str): ResumeAnalyzer method name, e.g. 'analyze'
+            *args: Positional arguments; must be picklable
+            **kwargs: Keyword arguments; must be picklable
+
+        Returns:
+            concurrent.futures.Future: The pending result, paired with the worker's
+                stage timings when metrics are enabled
+
+        Raises:
+            PoolBusy: If the queue is full
+            AnalysisUnavailable: If the pool is being restarted
+        """
+        future, _ = self._submit(method, args, kwargs)
+        return future
+
+    def run(self, method, *args, timeout=None, **kwargs):
+        """
+        Call an analyzer method in a worker and wait for the result.
+
+        Args:
+            method (str): ResumeAnalyzer method name
+            *args: Positional arguments
+            timeout (float): Seconds to wait, the pool default if None
+            **kwargs: Keyword arguments
+
+        Returns:
+            The method's return value
+
+        Raises:
+            PoolBusy: If the queue is full
+            AnalysisTimeout: If the result is not ready in time; a task that already
+                started keeps running, and keeps its worker and queue slot, until it ends
+            AnalysisUnavailable: If the worker crashed or the pool is being restarted
+        """
+        future, executor = self._submit(method, args, kwargs)
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            result, timings = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Drop the task if it has not started; a running task finishes in the background
+            future.cancel()
+            raise AnalysisTimeout(f"Analysis did not finish within {timeout} seconds")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise AnalysisUnavailable("Analysis worker crashed, try again")
+
+        # Record the worker's stage timings as if they were measured here
+        for stage, seconds in timings or ():
+            metrics.observe(stage, seconds)
+        return result
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers, cancelling queued tasks.
+
+        Args:
+            wait (bool): Wait for running tasks to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
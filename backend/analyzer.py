@@ -1,38 +1,95 @@
-import re
-import string
 import logging
-from collections import Counter
-import nltk
+import heapq
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 import numpy as np
+from document import ParsedDocument
+from patterns import PatternRegistry
+from lemma_cache import LemmaCache
+from job_profile import JobProfile, JobProfileCache, job_id_for
+from vocabulary import Vocabulary, match_ids, match_matrix
+from tokenizer import fast_word_tokenize, PUNCTUATION_TABLE
+from startup import configure_nltk_data, ensure_nltk_resources
+from skill_matcher import SkillMatcher, DEFAULT_TAXONOMY_PATH
+from shared_tables import SharedTables
+from metrics import metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change alters analysis results (rule-based scoring or the
+# Gemini prompt), so cached results from older code are not served
+ANALYZER_VERSION = '2'
+
 class ResumeAnalyzer:
     """
     A class to analyze resumes against job descriptions.
     Uses NLP techniques to compare and score the match.
     """
     
-    def __init__(self):
-        """Initialize the ResumeAnalyzer with necessary NLTK resources."""
-        # Download required NLTK resources
+    def __init__(self, lemma_cache_size=50000, lemma_preload_path=None, job_profile_cache_size=1000,
+                 tokenizer='fast', nltk_data_path=None, nltk_download=True, skills_taxonomy_path=None,
+                 shared_tables_path=None, job_store=None, vocabulary_size=200000):
+        """
+        Initialize the ResumeAnalyzer with necessary NLTK resources.
+        
+        Args:
+            lemma_cache_size (int): Maximum number of tokens kept in the lemma cache
+            lemma_preload_path (str): Optional word frequency list used to warm the lemma cache
+            job_profile_cache_size (int): Maximum number of compiled job descriptions kept
+            tokenizer (str): 'fast' for the built-in tokenizer, or 'nltk' for nltk.word_tokenize
+            nltk_data_path (str): Optional directory with pre-packaged NLTK resources
+            nltk_download (bool): Whether to download NLTK resources missing locally
+            skills_taxonomy_path (str): Skills taxonomy file, data/skills_taxonomy.txt by default
+            shared_tables_path (str): Optional tables file built by shared_tables.py; its lemmas,
+                stopwords and compiled taxonomy are memory-mapped instead of loaded per process
+            job_store (JobStore): Optional store of registered job descriptions shared by
+                all workers, so job ids resolve in any worker and after restarts
+            vocabulary_size (int): Keyword tokens interned before the vocabulary starts over
+        """
+        # Select the tokenizer; both produce identical tokens on preprocessed text
+        if tokenizer == 'fast':
+            self._tokenize = fast_word_tokenize
+        elif tokenizer == 'nltk':
+            self._tokenize = word_tokenize
+        else:
+            raise ValueError(f"Unknown tokenizer: {tokenizer}")
+        
+        # Map the shared tables file if one is configured
+        self.shared_tables = None
+        if shared_tables_path:
+            try:
+                self.shared_tables = SharedTables(shared_tables_path)
+                logger.info(f"Mapped shared tables from {shared_tables_path}")
+            except Exception as e:
+                logger.warning(f"Failed to open shared tables: {str(e)}. Loading private copies instead.")
+        
+        # Load NLTK resources from local data, downloading only what is missing
         try:
-            self._download_nltk_resources()
+            self._load_nltk_resources(tokenizer, nltk_data_path, nltk_download)
         except Exception as e:
-            logger.warning(f"Failed to download NLTK resources: {str(e)}. Some features may not work properly.")
+            logger.warning(f"Failed to load NLTK resources: {str(e)}. Some features may not work properly.")
         
-        # Initialize lemmatizer
+        # Initialize lemmatizer behind a bounded cache
         self.lemmatizer = WordNetLemmatizer()
+        lemmatize = self.shared_tables.lemmatize if self.shared_tables is not None else self.lemmatizer.lemmatize
+        self.lemma_cache = LemmaCache(lemmatize, maxsize=lemma_cache_size)
+        if lemma_preload_path:
+            try:
+                loaded = self.lemma_cache.preload(lemma_preload_path)
+                logger.info(f"Preloaded {loaded} lemmas from {lemma_preload_path}")
+            except Exception as e:
+                logger.warning(f"Failed to preload lemma cache: {str(e)}")
         
         # Get stopwords
         try:
-            self.stop_words = set(stopwords.words('english'))
+            if self.shared_tables is not None:
+                self.stop_words = set(self.shared_tables.stopwords)
+            else:
+                self.stop_words = set(stopwords.words('english'))
         except:
             # Fallback stopwords if NLTK download fails
             self.stop_words = {
@@ -59,6 +116,53 @@ class ResumeAnalyzer:
             'experience': r'(?i)(experience|work experience|employment|job history|professional experience|career)'
         }
         
+        # Define degree patterns, highest degree first
+        self.degree_patterns = {
+            'phd': r'(?i)(phd|ph\.d|doctor of philosophy|doctorate)',
+            'masters': r'(?i)(master|ms|m\.s|m\.a|mba|m\.b\.a)',
+            'bachelors': r'(?i)(bachelor|bs|b\.s|ba|b\.a|undergraduate)',
+            'associate': r'(?i)(associate|a\.a|a\.s)',
+            'highschool': r'(?i)(high school|diploma|ged)'
+        }
+        
+        # Define years of experience and field of study patterns
+        self.years_pattern = r'(\d+)[\+]?\s*(?:years|yrs|yr)(?:\s*of)?\s*(?:experience|exp)'
+        self.field_patterns = [
+            r'(?i)degree in ([^,.]+)',
+            r'(?i)background in ([^,.]+)',
+            r'(?i)(computer science|engineering|business|marketing|finance|accounting|economics|mathematics|statistics)'
+        ]
+        
+        # Define specific experience requirement patterns
+        self.requirement_patterns = [
+            r'(?i)experience (?:in|with) ([^,.]+)',
+            r'(?i)knowledge of ([^,.]+)',
+            r'(?i)familiarity with ([^,.]+)'
+        ]
+        
+        # Define contact information and achievement patterns
+        self.contact_patterns = [
+            r'(?i)(?:\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)',  # Email
+            r'(?i)(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',    # Phone
+            r'(?i)linkedin\.com/in/[\w-]+'                                    # LinkedIn
+        ]
+        self.achievement_patterns = [
+            r'(?i)increased|improved|reduced|saved|achieved|won|delivered|managed|led'
+        ]
+        
+        # Compile all patterns once into a single-pass scanner
+        self.patterns = PatternRegistry(
+            self.section_patterns, self.degree_patterns, self.years_pattern, self.field_patterns,
+            self.requirement_patterns, self.contact_patterns, self.achievement_patterns
+        )
+        
+        # Token ids shared by all documents for vectorized keyword matching
+        self.vocabulary = Vocabulary(max_size=vocabulary_size)
+        
+        # Compiled job descriptions, reused across resumes
+        self.job_profiles = JobProfileCache(maxsize=job_profile_cache_size)
+        self.job_store = job_store
+        
         # Define common skills and education keywords
         self.common_skills = {
             'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin', 'go', 'rust', 'typescript'],
@@ -68,12 +172,92 @@ class ResumeAnalyzer:
             'ml_ai': ['machine learning', 'deep learning', 'ai', 'artificial intelligence', 'nlp', 'computer vision', 'tensorflow', 'pytorch', 'scikit-learn'],
             'tools': ['git', 'github', 'gitlab', 'bitbucket', 'jira', 'confluence', 'jenkins', 'travis', 'circleci']
         }
+        
+        # Compile the skills taxonomy, falling back to the common skills above
+        try:
+            if self.shared_tables is not None:
+                self.skill_matcher = self.shared_tables.skill_matcher()
+            else:
+                self.skill_matcher = SkillMatcher.from_file(skills_taxonomy_path or DEFAULT_TAXONOMY_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to load skills taxonomy: {str(e)}. Using built-in common skills.")
+            self.skill_matcher = SkillMatcher(self.common_skills)
+    
+    def _load_nltk_resources(self, tokenizer, nltk_data_path, nltk_download):
+        """Make required NLTK resources available, downloading missing ones if enabled."""
+        configure_nltk_data(nltk_data_path)
+        # Shared tables replace the stopwords and WordNet corpora
+        packages = ['stopwords', 'wordnet'] if self.shared_tables is None else []
+        if tokenizer == 'nltk':
+            packages.append('punkt')
+        ensure_nltk_resources(packages, download=nltk_download, download_dir=nltk_data_path)
+    
+    def parse(self, text):
+        """
+        Parse a document once so every analysis step can share the result.
+        
+        Args:
+            text (str or ParsedDocument): The text to parse
+            
+        Returns:
+            ParsedDocument: The parsed document
+        """
+        if isinstance(text, ParsedDocument):
+            return text
+        return ParsedDocument(text, self)
+    
+    def compile_job(self, job_description):
+        """
+        Compile a job description into a cached, reusable JobProfile.
+        
+        Args:
+            job_description (str or JobProfile): Job description text
+            
+        Returns:
+            JobProfile: The compiled job profile
+        """
+        if isinstance(job_description, JobProfile):
+            return job_description
+        
+        profile = self.job_profiles.get(job_id_for(job_description))
+        if profile is not None and profile.text == job_description:
+            return profile
+        
+        return self.job_profiles.put(JobProfile(job_description, self).compile())
     
-    def _download_nltk_resources(self):
-        """Download required NLTK resources."""
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        nltk.download('wordnet', quiet=True)
+    def register_job(self, job_description):
+        """
+        Compile a job description and register it in the job store, so its id
+        can be used by any worker.
+        
+        Args:
+            job_description (str): Job description text
+            
+        Returns:
+            JobProfile: The compiled job profile
+        """
+        profile = self.compile_job(job_description)
+        if self.job_store is not None:
+            self.job_store.put(profile.job_id, profile.text)
+        return profile
+    
+    def get_job_profile(self, job_id):
+        """
+        Look up a previously compiled job description, recompiling a registered
+        one that this worker has not seen or has evicted.
+        
+        Args:
+            job_id (str): Job id returned when the job was compiled
+            
+        Returns:
+            JobProfile: The job profile, or None if unknown or expired
+        """
+        profile = self.job_profiles.get(job_id)
+        if profile is not None or self.job_store is None:
+            return profile
+        
+        text = self.job_store.get(job_id)
+        return self.compile_job(text) if text is not None else None
     
     def preprocess_text(self, text):
         """
@@ -90,26 +274,33 @@ class ResumeAnalyzer:
         text = text.lower()
         
         # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.translate(PUNCTUATION_TABLE)
         
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self._tokenize(text)
         
         # Remove stopwords and lemmatize
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens if token not in self.stop_words]
+        lemmatize = self.lemma_cache.lemmatize
+        tokens = [lemmatize(token) for token in tokens if token not in self.stop_words]
         
         return tokens
     
-    def extract_sections(self, text):
+    def extract_sections(self, text, scan=None):
         """
         Extract different sections from the text.
         
         Args:
             text (str): The text to extract sections from
+            scan (ScanResult): Pattern scan of the text, computed if not provided
             
         Returns:
             dict: Dictionary containing extracted sections
         """
+        if scan is None:
+            scan = self.patterns.scan(text)
+        hits = scan.section_hits
+        hit_index = 0
+        
         sections = {}
         
         # Split text into lines
@@ -117,22 +308,30 @@ class ResumeAnalyzer:
         
         current_section = None
         section_content = []
+        line_end = 0
         
         for line in lines:
+            line_end += len(line) + 1
+            
+            # Find the highest-priority section keyword on this line
+            priority = None
+            while hit_index < len(hits) and hits[hit_index][0] < line_end:
+                if priority is None or hits[hit_index][1] < priority:
+                    priority = hits[hit_index][1]
+                hit_index += 1
+            
             line = line.strip()
             if not line:
                 continue
                 
             # Check if line is a section header
             is_header = False
-            for section, pattern in self.section_patterns.items():
-                if re.search(pattern, line) and len(line) < 50:  # Assume headers are relatively short
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content)
-                    current_section = section
-                    section_content = []
-                    is_header = True
-                    break
+            if priority is not None and len(line) < 50:  # Assume headers are relatively short
+                if current_section:
+                    sections[current_section] = '\n'.join(section_content)
+                current_section = self.patterns.section_names[priority]
+                section_content = []
+                is_header = True
             
             if not is_header and current_section:
                 section_content.append(line)
@@ -158,20 +357,7 @@ class ResumeAnalyzer:
         Returns:
             list: List of extracted keywords
         """
-        # Preprocess text
-        tokens = self.preprocess_text(text)
-        
-        # Count token frequencies
-        token_counts = Counter(tokens)
-        
-        # Filter out single character tokens and numbers
-        token_counts = {token: count for token, count in token_counts.items() 
-                      if len(token) > 1 and not token.isdigit()}
-        
-        # Get most common tokens
-        keywords = [token for token, _ in token_counts.most_common(n)]
-        
-        return keywords
+        return self.parse(text).keywords(n)
     
     def calculate_keyword_match(self, resume_keywords, job_keywords):
         """
@@ -184,47 +370,88 @@ class ResumeAnalyzer:
         Returns:
             tuple: (score, matched_keywords, missing_keywords)
         """
-        # Convert to sets for easier operations
-        resume_set = set(resume_keywords)
-        job_set = set(job_keywords)
+        # Drop duplicates, keeping the keywords in ranked order
+        resume_keywords = list(dict.fromkeys(resume_keywords))
+        job_keywords = list(dict.fromkeys(job_keywords))
         
-        # Find matched and missing keywords
-        matched_keywords = resume_set.intersection(job_set)
-        missing_keywords = job_set.difference(resume_set)
+        resume_ids, job_ids = self.vocabulary.consistent(
+            lambda: (self.vocabulary.encode(resume_keywords), self.vocabulary.encode(job_keywords)))
+        return self._keyword_match(job_keywords, resume_ids, job_ids)
+    
+    def _keyword_match(self, job_keywords, resume_ids, job_ids):
+        """
+        Score interned keyword ids; matched and missing keywords keep the job's ranking.
         
+        Args:
+            job_keywords (list): Unique keywords from job description
+            resume_ids (numpy.ndarray): Unique resume keyword ids
+            job_ids (numpy.ndarray): Ids of job_keywords
+            
+        Returns:
+            tuple: (score, matched_keywords, missing_keywords)
+        """
         # Calculate score
-        if not job_set:
-            return 100, list(matched_keywords), []
+        if not job_keywords:
+            return 100, [], []
+        
+        # Find matched and missing keywords
+        mask = match_ids(resume_ids, job_ids)
+        matched_keywords = [job_keywords[i] for i in np.flatnonzero(mask)]
+        missing_keywords = [job_keywords[i] for i in np.flatnonzero(~mask)]
+        
+        score = (len(matched_keywords) / len(job_keywords)) * 100
         
-        score = (len(matched_keywords) / len(job_set)) * 100
+        return round(score), matched_keywords, missing_keywords
+    
+    def _match_documents(self, resume, job, n, section=None):
+        """Match the top-n keywords of a section of two parsed documents."""
+        resume_ids, job_ids = self.vocabulary.consistent(
+            lambda: (resume.keyword_ids(n=n, section=section), job.keyword_ids(n=n, section=section)))
+        return self._keyword_match(job.keywords(n=n, section=section), resume_ids, job_ids)
+    
+    def keyword_match_matrix(self, resumes, jobs, n=100, section=None):
+        """
+        Compute keyword match scores for every resume and job pair at once.
         
-        return round(score), list(matched_keywords), list(missing_keywords)
+        Args:
+            resumes (list): Resume texts or parsed documents
+            jobs (list): Job description texts or parsed documents
+            n (int): Number of keywords per document
+            section (str): Section to take keywords from, or None for the full text
+            
+        Returns:
+            numpy.ndarray: Integer scores of shape (len(resumes), len(jobs))
+        """
+        resumes = [self.parse(resume) for resume in resumes]
+        jobs = [self._resolve_job(job) for job in jobs]
+        resume_ids, job_ids = self.vocabulary.consistent(lambda: (
+            [resume.keyword_ids(n=n, section=section) for resume in resumes],
+            [job.keyword_ids(n=n, section=section) for job in jobs]))
+        return match_matrix(resume_ids, job_ids)
     
     def analyze_skills(self, resume_text, job_text):
         """
         Analyze skills match between resume and job description.
         
         Args:
-            resume_text (str): Resume text
-            job_text (str): Job description text
+            resume_text (str or ParsedDocument): Resume text
+            job_text (str or ParsedDocument): Job description text
             
         Returns:
             tuple: (score, details)
         """
-        # Extract skills section if available
-        resume_sections = self.extract_sections(resume_text)
-        job_sections = self.extract_sections(job_text)
-        
-        # Use skills section if available, otherwise use full text
-        resume_skills_text = resume_sections.get('skills', resume_text)
-        job_skills_text = job_sections.get('skills', job_text)
-        
-        # Extract keywords
-        resume_skills = self.extract_keywords(resume_skills_text, n=50)
-        job_skills = self.extract_keywords(job_skills_text, n=50)
-        
-        # Calculate match
-        score, matched_skills, missing_skills = self.calculate_keyword_match(resume_skills, job_skills)
+        resume = self.parse(resume_text)
+        job = self.parse(job_text)
+        
+        if job.skills:
+            # Match the taxonomy skills the job asks for
+            resume_skills = set(resume.skills)
+            matched_skills = [skill for skill in job.skills if skill in resume_skills]
+            missing_skills = [skill for skill in job.skills if skill not in resume_skills]
+            score = round(len(matched_skills) / len(job.skills) * 100)
+        else:
+            # Match keywords from the skills section if available, otherwise the full text
+            score, matched_skills, missing_skills = self._match_documents(resume, job, n=50, section='skills')
         
         # Prepare details
         details = {
@@ -239,40 +466,23 @@ class ResumeAnalyzer:
         Analyze experience match between resume and job description.
         
         Args:
-            resume_text (str): Resume text
-            job_text (str): Job description text
+            resume_text (str or ParsedDocument): Resume text
+            job_text (str or ParsedDocument): Job description text
             
         Returns:
             tuple: (score, details)
         """
-        # Extract experience section if available
-        resume_sections = self.extract_sections(resume_text)
-        job_sections = self.extract_sections(job_text)
-        
-        # Use experience section if available, otherwise use full text
-        resume_exp_text = resume_sections.get('experience', resume_text)
-        job_exp_text = job_sections.get('experience', job_text)
-        
-        # Extract keywords
-        resume_exp_keywords = self.extract_keywords(resume_exp_text, n=50)
-        job_exp_keywords = self.extract_keywords(job_exp_text, n=50)
+        resume = self.parse(resume_text)
+        job = self.parse(job_text)
         
-        # Calculate match
-        score, matched_exp, _ = self.calculate_keyword_match(resume_exp_keywords, job_exp_keywords)
+        # Match keywords from the experience section if available, otherwise the full text
+        score, matched_exp, _ = self._match_documents(resume, job, n=50, section='experience')
         
         # Look for years of experience in job description
-        years_pattern = r'(\d+)[\+]?\s*(?:years|yrs|yr)(?:\s*of)?\s*(?:experience|exp)'
-        years_match = re.search(years_pattern, job_text, re.IGNORECASE)
-        
-        required_years = 0
-        if years_match:
-            required_years = int(years_match.group(1))
+        required_years = job.scan.years or 0
         
         # Look for years of experience in resume
-        resume_years_match = re.search(years_pattern, resume_text, re.IGNORECASE)
-        resume_years = 0
-        if resume_years_match:
-            resume_years = int(resume_years_match.group(1))
+        resume_years = resume.scan.years or 0
         
         # Adjust score based on years of experience
         years_score = 100
@@ -303,42 +513,25 @@ class ResumeAnalyzer:
         Analyze education match between resume and job description.
         
         Args:
-            resume_text (str): Resume text
-            job_text (str): Job description text
+            resume_text (str or ParsedDocument): Resume text
+            job_text (str or ParsedDocument): Job description text
             
         Returns:
             tuple: (score, details)
         """
-        # Extract education section if available
-        resume_sections = self.extract_sections(resume_text)
-        job_sections = self.extract_sections(job_text)
+        resume = self.parse(resume_text)
+        job = self.parse(job_text)
         
         # Use education section if available, otherwise use full text
-        resume_edu_text = resume_sections.get('education', resume_text)
-        job_edu_text = job_sections.get('education', job_text)
-        
-        # Common degree patterns
-        degree_patterns = {
-            'phd': r'(?i)(phd|ph\.d|doctor of philosophy|doctorate)',
-            'masters': r'(?i)(master|ms|m\.s|m\.a|mba|m\.b\.a)',
-            'bachelors': r'(?i)(bachelor|bs|b\.s|ba|b\.a|undergraduate)',
-            'associate': r'(?i)(associate|a\.a|a\.s)',
-            'highschool': r'(?i)(high school|diploma|ged)'
-        }
+        resume_edu_text = resume.section_text('education')
         
-        # Check for required degree in job description
-        required_degree = None
-        for degree, pattern in degree_patterns.items():
-            if re.search(pattern, job_edu_text) or re.search(pattern, job_text):
-                required_degree = degree
-                break
+        # Check for required degree in job description. Degree patterns never
+        # span lines, so a hit in the education section is also a hit in the
+        # full text and the full-text scan covers both.
+        required_degree = job.scan.degree
         
         # Check for degree in resume
-        resume_degree = None
-        for degree, pattern in degree_patterns.items():
-            if re.search(pattern, resume_edu_text) or re.search(pattern, resume_text):
-                resume_degree = degree
-                break
+        resume_degree = resume.scan.degree
         
         # Degree hierarchy for scoring
         degree_hierarchy = {
@@ -373,22 +566,13 @@ class ResumeAnalyzer:
                 details.append("No specific degree requirements found in job description or resume.")
         
         # Extract field of study from job description
-        field_patterns = [
-            r'(?i)degree in ([^,.]+)',
-            r'(?i)background in ([^,.]+)',
-            r'(?i)(computer science|engineering|business|marketing|finance|accounting|economics|mathematics|statistics)'
-        ]
-        
         required_field = None
-        for pattern in field_patterns:
-            field_match = re.search(pattern, job_text)
-            if field_match:
-                required_field = field_match.group(1).strip().lower()
-                break
+        if job.scan.field is not None:
+            required_field = job.scan.field.strip().lower()
         
         # Check if field is in resume
         field_in_resume = False
-        if required_field and (required_field in resume_text.lower() or required_field in resume_edu_text.lower()):
+        if required_field and (required_field in resume.lower or required_field in resume_edu_text.lower()):
             field_in_resume = True
             details.append(f"Your education matches the required field: {required_field}.")
         elif required_field:
@@ -403,13 +587,15 @@ class ResumeAnalyzer:
         Generate improvement suggestions based on analysis results.
         
         Args:
-            resume_text (str): Resume text
-            job_text (str): Job description text
+            resume_text (str or ParsedDocument): Resume text
+            job_text (str or ParsedDocument): Job description text
             analysis_results (dict): Results from previous analyses
             
         Returns:
             list: List of suggestions
         """
+        resume = self.parse(resume_text)
+        job = self.parse(job_text)
         suggestions = []
         
         # Skills suggestions
@@ -427,17 +613,10 @@ class ResumeAnalyzer:
             suggestions.append("Highlight more relevant experience that aligns with job requirements.")
             
             # Look for specific experience requirements
-            exp_patterns = [
-                r'(?i)experience (?:in|with) ([^,.]+)',
-                r'(?i)knowledge of ([^,.]+)',
-                r'(?i)familiarity with ([^,.]+)'
-            ]
-            
-            for pattern in exp_patterns:
-                matches = re.finditer(pattern, job_text)
+            for matches in job.scan.requirements:
                 for match in matches:
-                    req = match.group(1).strip()
-                    if req.lower() not in resume_text.lower():
+                    req = match.strip()
+                    if req.lower() not in resume.lower:
                         suggestions.append(f"Consider adding experience with {req} if you have it.")
                         break
         
@@ -448,34 +627,22 @@ class ResumeAnalyzer:
         
         # General suggestions
         # Check resume length by word count
-        resume_word_count = len(resume_text.split())
+        resume_word_count = resume.word_count
         if resume_word_count < 300:
             suggestions.append("Your resume seems short. Consider adding more details about your experience and skills.")
         elif resume_word_count > 1000:
             suggestions.append("Your resume is quite long. Consider focusing on the most relevant information.")
         
         # Check for contact information
-        contact_patterns = [
-            r'(?i)(?:\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)',  # Email
-            r'(?i)(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',    # Phone
-            r'(?i)linkedin\.com/in/[\w-]+'                                    # LinkedIn
-        ]
-        
-        has_contact = any(re.search(pattern, resume_text) for pattern in contact_patterns)
-        if not has_contact:
+        if not resume.scan.has_contact:
             suggestions.append("Add your contact information (email, phone) to your resume.")
         
         # Check for achievements and metrics
-        achievement_patterns = [
-            r'(?i)increased|improved|reduced|saved|achieved|won|delivered|managed|led'
-        ]
-        
-        has_achievements = any(re.search(pattern, resume_text) for pattern in achievement_patterns)
-        if not has_achievements:
+        if not resume.scan.has_achievement:
             suggestions.append("Add specific achievements with metrics to strengthen your experience section.")
         
         # Check for ATS-friendly formatting
-        if len(re.findall(r'[^\x00-\x7F]', resume_text)) > 5:  # Non-ASCII characters
+        if resume.scan.non_ascii > 5:  # Non-ASCII characters
             suggestions.append("Use standard characters and formatting for better ATS compatibility.")
         
         # Limit suggestions to avoid overwhelming
@@ -484,65 +651,170 @@ class ResumeAnalyzer:
         
         return suggestions[:7]  # Limit to top 7 suggestions
     
+    def _resolve_job(self, job_description):
+        """Use a parsed job description as is, otherwise compile it through the cache."""
+        if isinstance(job_description, ParsedDocument):
+            return job_description
+        return self.compile_job(job_description)
+    
+    def analyze_stages(self, resume_text, job_description, include_suggestions=True):
+        """
+        Analyze a resume stage by stage, yielding each result as soon as it is ready.
+        
+        Args:
+            resume_text (str or ParsedDocument): Resume text
+            job_description (str or ParsedDocument): Job description text or compiled JobProfile
+            include_suggestions (bool): Generate improvement suggestions
+            
+        Yields:
+            tuple: (stage, data) for the 'skills', 'experience', 'education' and
+                'keywords' stages (data holds 'score' and 'details'), then
+                'suggestions' (data holds 'suggestions') and finally 'summary',
+                whose data is the complete analysis result
+        """
+        # Parse both documents once; every dimension below reads from them.
+        # The job side is compiled and cached so repeat postings are free.
+        with metrics.stage('analyzer_job'):
+            job = self._resolve_job(job_description)
+        with metrics.stage('analyzer_sections'):
+            resume = self.parse(resume_text)
+            if metrics.enabled:
+                # Sections are parsed lazily; parse them here so they are timed on their own
+                resume.sections
+        
+        # Analyze skills
+        with metrics.stage('analyzer_skills'):
+            skills_score, skills_details = self.analyze_skills(resume, job)
+        yield 'skills', {'score': skills_score, 'details': skills_details}
+        
+        # Analyze experience
+        with metrics.stage('analyzer_experience'):
+            experience_score, experience_details = self.analyze_experience(resume, job)
+        yield 'experience', {'score': experience_score, 'details': experience_details}
+        
+        # Analyze education
+        with metrics.stage('analyzer_education'):
+            education_score, education_details = self.analyze_education(resume, job)
+        yield 'education', {'score': education_score, 'details': education_details}
+        
+        # Calculate keyword match for general matching
+        with metrics.stage('analyzer_keywords'):
+            keywords_score, matched_keywords, missing_keywords = self._match_documents(resume, job, n=100)
+        keywords_details = {
+            'matched': matched_keywords[:15],
+            'missing': missing_keywords[:15]
+        }
+        yield 'keywords', {'score': keywords_score, 'details': keywords_details}
+        
+        # Calculate overall score
+        # Weights: skills (35%), experience (35%), education (20%), keywords (10%)
+        overall_score = round(
+            (skills_score * 0.35) + 
+            (experience_score * 0.35) + 
+            (education_score * 0.20) + 
+            (keywords_score * 0.10)
+        )
+        
+        # Prepare results
+        results = {
+            'overall_score': overall_score,
+            'skills_score': skills_score,
+            'skills_details': skills_details,
+            'experience_score': experience_score,
+            'experience_details': experience_details,
+            'education_score': education_score,
+            'education_details': education_details,
+            'keywords_score': keywords_score,
+            'keywords_details': keywords_details
+        }
+        
+        # Generate suggestions
+        if include_suggestions:
+            with metrics.stage('analyzer_suggestions'):
+                results['suggestions'] = self.generate_suggestions(resume, job, results)
+            yield 'suggestions', {'suggestions': results['suggestions']}
+        
+        yield 'summary', results
+    
+    def score(self, resume_text, job_description):
+        """
+        Score a resume against a job description on every dimension, without suggestions.
+        
+        Args:
+            resume_text (str or ParsedDocument): Resume text
+            job_description (str or ParsedDocument): Job description text or compiled JobProfile
+            
+        Returns:
+            dict: Scores and details
+        """
+        for stage, data in self.analyze_stages(resume_text, job_description, include_suggestions=False):
+            if stage == 'summary':
+                return data
+    
     def analyze(self, resume_text, job_description):
         """
         Analyze resume against job description.
         
         Args:
-            resume_text (str): Resume text
-            job_description (str): Job description text
+            resume_text (str or ParsedDocument): Resume text
+            job_description (str or ParsedDocument): Job description text or compiled JobProfile
             
         Returns:
             dict: Analysis results
         """
         try:
-            # Analyze skills
-            skills_score, skills_details = self.analyze_skills(resume_text, job_description)
-            
-            # Analyze experience
-            experience_score, experience_details = self.analyze_experience(resume_text, job_description)
-            
-            # Analyze education
-            education_score, education_details = self.analyze_education(resume_text, job_description)
+            for stage, data in self.analyze_stages(resume_text, job_description):
+                if stage == 'summary':
+                    return data
             
-            # Extract keywords for general matching
-            resume_keywords = self.extract_keywords(resume_text, n=100)
-            job_keywords = self.extract_keywords(job_description, n=100)
-            
-            # Calculate keyword match
-            keywords_score, matched_keywords, missing_keywords = self.calculate_keyword_match(resume_keywords, job_keywords)
-            keywords_details = {
-                'matched': matched_keywords[:15],
-                'missing': missing_keywords[:15]
-            }
+        except Exception as e:
+            logger.error(f"Error during analysis: {str(e)}", exc_info=True)
+            raise
+    
+    def rank(self, job_description, resumes, k=10, include_details=False, include_suggestions=False):
+        """
+        Score many resumes against one job description and return the best matches.
+        
+        Args:
+            job_description (str or ParsedDocument): Job description text or compiled JobProfile
+            resumes (list): Resume texts, or (resume_id, text) pairs
+            k (int): Number of top resumes to return, or None for all
+            include_details (bool): Include per-dimension details
+            include_suggestions (bool): Include improvement suggestions
             
-            # Calculate overall score
-            # Weights: skills (35%), experience (35%), education (20%), keywords (10%)
-            overall_score = round(
-                (skills_score * 0.35) + 
-                (experience_score * 0.35) + 
-                (education_score * 0.20) + 
-                (keywords_score * 0.10)
-            )
+        Returns:
+            list: Ranked results, best match first
+        """
+        try:
+            # The job side is compiled once and shared by every resume
+            job = self._resolve_job(job_description)
             
-            # Prepare results
-            results = {
-                'overall_score': overall_score,
-                'skills_score': skills_score,
-                'skills_details': skills_details,
-                'experience_score': experience_score,
-                'experience_details': experience_details,
-                'education_score': education_score,
-                'education_details': education_details,
-                'keywords_score': keywords_score,
-                'keywords_details': keywords_details
-            }
+            # Keep only the current top k in a min-heap; earlier resumes win ties
+            heap = []
+            for index, resume_entry in enumerate(resumes):
+                resume_id, resume_text = resume_entry if isinstance(resume_entry, tuple) else (index, resume_entry)
+                resume = self.parse(resume_text)
+                results = self.score(resume, job)
+                entry = (results['overall_score'], -index, resume_id, results, resume)
+                if k is None or len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
             
-            # Generate suggestions
-            results['suggestions'] = self.generate_suggestions(resume_text, job_description, results)
+            ranked = []
+            for position, (_, _, resume_id, results, resume) in enumerate(sorted(heap, key=lambda e: e[:2], reverse=True), 1):
+                item = {'id': resume_id, 'rank': position}
+                for dimension in ('overall', 'skills', 'experience', 'education', 'keywords'):
+                    item[f'{dimension}_score'] = results[f'{dimension}_score']
+                if include_details:
+                    for dimension in ('skills', 'experience', 'education', 'keywords'):
+                        item[f'{dimension}_details'] = results[f'{dimension}_details']
+                if include_suggestions:
+                    item['suggestions'] = self.generate_suggestions(resume, job, results)
+                ranked.append(item)
             
-            return results
+            return ranked
             
         except Exception as e:
-            logger.error(f"Error during analysis: {str(e)}", exc_info=True)
+            logger.error(f"Error during ranking: {str(e)}", exc_info=True)
             raise
@@ -1,12 +1,27 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Request, Response, g, request, jsonify, render_template, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
 import logging
 import json
+import hashlib
+import math
+import time
+import itertools
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from analyzer import ResumeAnalyzer
-from gemini_analyzer import GeminiAnalyzer
+from analyzer import ResumeAnalyzer, ANALYZER_VERSION
+from gemini_analyzer import GeminiAnalyzer, fallback_results
+from extraction import allowed_file, extract_text, sniff_upload, SniffedUpload, UnsupportedFile
+from upload_store import UploadStore
+from resume_index import ResumeIndex
+from startup import Readiness, warm_up
+from analysis_pool import AnalysisPool, AnalysisUnavailable
+from document import ParsedDocument
+from metrics import metrics, server_timing
+from result_cache import ResultCache, normalize_text, result_key
+from job_queue import JobQueue
+from job_profile import JobStore
+from hedging import Hedger
 
 # Load environment variables
 load_dotenv()
@@ -16,21 +31,34 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class UploadRequest(Request):
+    """
+    Request that buffers uploaded files in memory (spilling to an anonymous
+    temporary file past UPLOAD_SPOOL_BYTES) and checks their type as they
+    arrive, so unsupported files are rejected before the whole body is read.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if not filename:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        return SniffedUpload(filename, max_size=UPLOAD_SPOOL_BYTES)
+
 # Initialize Flask app
 app = Flask(__name__, 
            static_folder='../frontend',
            template_folder='templates')
+app.request_class = UploadRequest
 
 # Configure upload settings
-UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 
-                            os.getenv('UPLOAD_FOLDER', 'uploads'))
-ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+UPLOAD_SPOOL_BYTES = int(os.getenv('UPLOAD_SPOOL_BYTES', 16777216))
 
-# Create upload folder if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Uploads are extracted in memory; keeping them is opt-in, in a content-addressed store
+upload_store = None
+if os.getenv('UPLOAD_STORE_ENABLED', 'False').lower() == 'true':
+    upload_store = UploadStore(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            os.getenv('UPLOAD_FOLDER', 'uploads')))
 
 # App configuration
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))  # 16MB default
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
@@ -39,8 +67,117 @@ app.config['DEBUG'] = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
 CORS(app)
 
 # Initialize analyzers
-resume_analyzer = ResumeAnalyzer()
-gemini_analyzer = GeminiAnalyzer()
+analyzer_options = dict(
+    lemma_cache_size=int(os.getenv('LEMMA_CACHE_SIZE', 50000)),
+    lemma_preload_path=os.getenv('LEMMA_PRELOAD_PATH'),
+    job_profile_cache_size=int(os.getenv('JOB_PROFILE_CACHE_SIZE', 1000)),
+    vocabulary_size=int(os.getenv('VOCABULARY_SIZE', 200000)),
+    tokenizer=os.getenv('TOKENIZER', 'fast'),
+    nltk_data_path=os.getenv('NLTK_DATA'),
+    nltk_download=os.getenv('NLTK_DOWNLOAD', 'True').lower() == 'true',
+    skills_taxonomy_path=os.getenv('SKILLS_TAXONOMY_PATH'),
+    shared_tables_path=os.getenv('SHARED_TABLES_PATH')
+)
+# Registered job descriptions, shared by every worker so job ids resolve in any of them
+job_store = JobStore(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('JOB_PROFILE_STORE_PATH', 'job_profiles.db')),
+    ttl=float(os.getenv('JOB_PROFILE_TTL', 30 * 86400))
+)
+resume_analyzer = ResumeAnalyzer(**analyzer_options, job_store=job_store)
+gemini_analyzer = GeminiAnalyzer(extract_sections=resume_analyzer.extract_sections)
+
+# Persistent pool of stored resumes for candidate retrieval
+RESUME_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 os.getenv('RESUME_INDEX_PATH', 'resume_index.db'))
+resume_index = ResumeIndex(RESUME_INDEX_PATH, resume_analyzer.preprocess_text)
+
+# Latency budget for Gemini analyses: past it, the rule-based result computed
+# alongside is returned instead. Zero waits for Gemini to succeed or fail, for
+# at most the maximum a request may ask for, if that is set.
+ANALYSIS_LATENCY_BUDGET_MS = float(os.getenv('ANALYSIS_LATENCY_BUDGET_MS', 15000))
+ANALYSIS_LATENCY_BUDGET_MAX_MS = float(os.getenv('ANALYSIS_LATENCY_BUDGET_MAX_MS', 60000))
+HEDGE_CACHE_LATE_RESULTS = os.getenv('HEDGE_CACHE_LATE_RESULTS', 'True').lower() == 'true'
+hedger = Hedger(max_workers=int(os.getenv('HEDGE_MAX_WORKERS', 16)))
+
+# Cache of analysis results, so repeat submissions skip the analysis or Gemini call;
+# the optional SQLite tier is shared by every worker on the host
+result_cache = None
+if os.getenv('RESULT_CACHE_ENABLED', 'True').lower() == 'true':
+    RESULT_CACHE_PATH = os.getenv('RESULT_CACHE_PATH')
+    result_cache = ResultCache(
+        memory_bytes=int(os.getenv('RESULT_CACHE_MEMORY_BYTES', 64 * 1024 * 1024)),
+        ttl=float(os.getenv('RESULT_CACHE_TTL', 86400)),
+        path=os.path.join(os.path.dirname(os.path.abspath(__file__)), RESULT_CACHE_PATH) if RESULT_CACHE_PATH else None,
+        disk_bytes=int(os.getenv('RESULT_CACHE_DISK_BYTES', 1024 * 1024 * 1024))
+    )
+
+# Warm up before this worker takes traffic so first requests are not slow
+readiness = Readiness()
+if os.getenv('WARMUP_ENABLED', 'True').lower() == 'true':
+    warm_up(resume_analyzer, readiness,
+            resume_path=os.getenv('WARMUP_RESUME_PATH'),
+            job_path=os.getenv('WARMUP_JOB_PATH'),
+            iterations=int(os.getenv('WARMUP_ITERATIONS', 1)))
+else:
+    readiness.set('ready', warmup_seconds=0)
+
+# Run CPU-bound analysis inline on the request thread, or in a pool of worker processes
+ANALYSIS_EXECUTION = os.getenv('ANALYSIS_EXECUTION', 'inline').lower()
+analysis_pool = None
+if ANALYSIS_EXECUTION == 'pool':
+    analysis_pool = AnalysisPool(
+        analyzer_options,
+        workers=int(os.getenv('ANALYSIS_WORKERS', 0)) or None,
+        max_pending=int(os.getenv('ANALYSIS_MAX_PENDING', 0)) or None,
+        timeout=float(os.getenv('ANALYSIS_TIMEOUT', 30)),
+        warmup=os.getenv('WARMUP_ENABLED', 'True').lower() == 'true'
+    )
+elif ANALYSIS_EXECUTION != 'inline':
+    raise ValueError(f"ANALYSIS_EXECUTION must be 'inline' or 'pool', not {ANALYSIS_EXECUTION!r}")
+
+# Per-stage timing histograms (/metrics) and Server-Timing headers; enabled after
+# warm-up so its analyses are not counted
+metrics.enable(os.getenv('METRICS_ENABLED', 'False').lower() == 'true')
+
+# Durable queue of analysis jobs (/api/jobs) shared by every worker on the host;
+# its executors start at the end of this module, once the job handler is defined
+job_queue = None
+if os.getenv('JOB_QUEUE_ENABLED', 'False').lower() == 'true':
+    job_queue = JobQueue(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), os.getenv('JOB_QUEUE_PATH', 'job_queue.db')),
+        lambda payload: _run_analysis_job(payload),
+        executors=int(os.getenv('JOB_EXECUTORS', 4)),
+        max_attempts=int(os.getenv('JOB_MAX_ATTEMPTS', 3)),
+        retry_delay=float(os.getenv('JOB_RETRY_DELAY', 5)),
+        lease_timeout=float(os.getenv('JOB_LEASE_TIMEOUT', 300)),
+        queue_timeout=float(os.getenv('JOB_QUEUE_TIMEOUT', 600)),
+        result_ttl=float(os.getenv('JOB_RESULT_TTL', 3600))
+    )
+
+@app.before_request
+def start_timing():
+    """Start collecting this request's stage timings."""
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+        metrics.start_request()
+
+@app.after_request
+def add_server_timing(response):
+    """Record the request duration and report its stage timings in a Server-Timing header."""
+    if metrics.enabled and 'request_start' in g:
+        elapsed = time.perf_counter() - g.request_start
+        timings = metrics.finish_request()
+        metrics.requests.observe(request.endpoint or 'unknown', elapsed)
+        response.headers['Server-Timing'] = server_timing(timings + [('total', elapsed)])
+    return response
+
+def _run_analysis(method, *args, **kwargs):
+    """Call a ResumeAnalyzer method inline or in the analysis pool."""
+    if analysis_pool is None:
+        return getattr(resume_analyzer, method)(*args, **kwargs)
+    # Workers keep their own job profile caches, so send compiled jobs as text
+    args = [arg.text if isinstance(arg, ParsedDocument) else arg for arg in args]
+    return analysis_pool.run(method, *args, **kwargs)
 
 @app.route('/')
 def index():
@@ -62,10 +199,6 @@ def results_page():
     """Serve the results page."""
     return send_from_directory('../frontend', 'results.html')
 
-def allowed_file(filename):
-    """Check if the file extension is allowed."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
 @app.route('/api/upload', methods=['POST'])
 def upload_file():
     """Handle file upload for resume."""
@@ -104,44 +237,19 @@ def upload_file():
             
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
             
-            # Extract text from file based on file type
+            # Trust the content, not the name, to pick the extractor
+            file_type = sniff_upload(file.stream)
+            
+            file_id = None
+            if upload_store is not None:
+                with metrics.stage('upload_save'):
+                    file_id = upload_store.put(file.stream, file_type)
+            
+            # Extract text straight from the buffered upload
             try:
-                file_ext = filename.rsplit('.', 1)[1].lower()
-                resume_text = ""
-                
-                if file_ext == 'txt':
-                    # Simple text file
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        resume_text = f.read()
-                elif file_ext in ['doc', 'docx']:
-                    # Try to extract text from Word documents
-                    try:
-                        import docx
-                        doc = docx.Document(filepath)
-                        resume_text = '\n'.join([para.text for para in doc.paragraphs])
-                    except ImportError:
-                        logger.warning("python-docx not installed, falling back to basic text extraction")
-                        with open(filepath, 'rb') as f:
-                            resume_text = str(f.read())
-                elif file_ext == 'pdf':
-                    # Try to extract text from PDF
-                    try:
-                        import PyPDF2
-                        with open(filepath, 'rb') as f:
-                            pdf_reader = PyPDF2.PdfReader(f)
-                            resume_text = '\n'.join([page.extract_text() for page in pdf_reader.pages])
-                    except ImportError:
-                        logger.warning("PyPDF2 not installed, falling back to basic text extraction")
-                        with open(filepath, 'rb') as f:
-                            resume_text = str(f.read())
-                else:
-                    # Default fallback
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        resume_text = f.read()
-                        
+                with metrics.stage('upload_extract'):
+                    resume_text = extract_text(file.stream, file_type)
                 logger.info(f"Extracted {len(resume_text)} characters from {filename}")
             except Exception as e:
                 logger.error(f"Error extracting text from file: {str(e)}")
@@ -150,24 +258,161 @@ def upload_file():
             # Get job description if provided
             job_description = request.form.get('job_description', '')
             
-            return jsonify({
+            result = {
                 'success': True,
                 'message': 'File uploaded successfully',
                 'filename': filename,
                 'resume_text': resume_text,
                 'job_description': job_description
-            })
+            }
+            if file_id is not None:
+                result['file_id'] = file_id
+            return jsonify(result)
         else:
             return jsonify({
                 'error': 'File type not allowed'
             }), 400
             
+    except UnsupportedFile as e:
+        logger.warning(f"Rejected upload: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
     except Exception as e:
         logger.error(f"Error during file upload: {str(e)}", exc_info=True)
         return jsonify({
             'error': f"An error occurred during file upload: {str(e)}"
         }), 500
 
+def _analysis_inputs(data):
+    """
+    Validate an analysis request body.
+    
+    Returns:
+        tuple: (resume_text, job_profile, job_description, error_response); job_profile is None
+            unless a registered job_id was given, error_response is None if the input is valid
+    """
+    # Validate input
+    if not data or 'resume_text' not in data or ('job_description' not in data and not data.get('job_id')):
+        return None, None, None, (jsonify({
+            'error': 'Missing required fields: resume_text and job_description (or job_id)'
+        }), 400)
+        
+    resume_text = data['resume_text']
+    
+    # Use a previously registered job profile if a job id was given
+    job_profile = None
+    if data.get('job_id'):
+        job_profile = resume_analyzer.get_job_profile(data['job_id'])
+        if job_profile is None:
+            return None, None, None, (jsonify({
+                'error': 'Unknown or expired job_id. Register the job description again.'
+            }), 404)
+        job_description = job_profile.text
+    else:
+        job_description = data['job_description']
+    
+    # Check if texts are not empty
+    if not resume_text.strip() or not job_description.strip():
+        return None, None, None, (jsonify({
+            'error': 'Resume text and job description cannot be empty'
+        }), 400)
+    
+    return resume_text, job_profile, job_description, None
+
+def _use_gemini(data):
+    """Whether to call Gemini: requested, and its circuit breaker is not open."""
+    if not data.get('use_gemini', False):
+        return False
+    if not gemini_analyzer.available():
+        # Fail fast to the rule-based path instead of waiting on an unhealthy API
+        logger.warning("Gemini API circuit is open, using rule-based analysis")
+        return False
+    return True
+
+def _result_key(resume_text, job_description, use_gemini):
+    """
+    Cache key of an analysis; Gemini results are keyed by model as well. The
+    texts are normalized only for the key, so submissions differing in
+    whitespace share an entry while the analysis itself sees the original text.
+    """
+    mode = f"gemini:{gemini_analyzer.api_url}" if use_gemini else 'rules'
+    return result_key(normalize_text(resume_text), normalize_text(job_description), mode, ANALYZER_VERSION)
+
+def _analyze(resume_text, job_profile, job_description, use_gemini, cache_key, budget=None):
+    """
+    Analyze with Gemini or the rules, falling back to the rules if Gemini fails,
+    and store the result in the result cache.
+    
+    Args:
+        resume_text (str): Resume text
+        job_profile (JobProfile): Registered job profile, or None
+        job_description (str): Job description text
+        use_gemini (bool): Whether to call Gemini
+        cache_key (str): Result cache key for use_gemini, or None to skip caching
+        budget (float): Seconds to wait for Gemini, with the rule-based analysis run
+            alongside as a fallback; None to wait for Gemini to succeed or fail
+        
+    Returns:
+        tuple: (analysis result, engine that produced it ('gemini' or 'rules'), whether it was cached)
+    """
+    rules = lambda: _run_analysis('analyze', resume_text, job_profile or job_description)
+    
+    if use_gemini and budget is not None:
+        logger.info(f"Using Gemini API for analysis within {budget:.2f}s")
+        on_late_result = None
+        if cache_key is not None and HEDGE_CACHE_LATE_RESULTS:
+            # A later identical request gets the Gemini result this one could not wait for
+            gemini_key = cache_key
+            on_late_result = lambda result: result_cache.put(gemini_key, result)
+        # Gemini runs on a hedger thread; its stages still count towards this request
+        analysis_result, from_gemini = hedger.run(
+            metrics.bind(lambda: gemini_analyzer.analyze(resume_text, job_description)),
+            rules,
+            budget,
+            acceptable=lambda result: result != fallback_results(),
+            on_late_result=on_late_result
+        )
+        engine = 'gemini' if from_gemini else 'rules'
+    elif use_gemini:
+        try:
+            logger.info("Using Gemini API for analysis")
+            analysis_result = gemini_analyzer.analyze(resume_text, job_description)
+            engine = 'gemini'
+            if analysis_result == fallback_results():
+                # Unparseable response; let the next request try again
+                cache_key = None
+        except Exception as e:
+            logger.error(f"Gemini API analysis failed: {str(e)}, falling back to rule-based analysis")
+            analysis_result = rules()
+            engine = 'rules'
+    else:
+        analysis_result = rules()
+        engine = 'rules'
+    
+    if use_gemini and engine == 'rules' and cache_key is not None:
+        cache_key = _result_key(resume_text, job_description, False)
+    if cache_key is not None:
+        result_cache.put(cache_key, analysis_result)
+    return analysis_result, engine, cache_key is not None
+
+def _latency_budget(data):
+    """
+    Seconds to wait for Gemini: the X-Latency-Budget-Ms header or latency_budget_ms
+    field in milliseconds, ANALYSIS_LATENCY_BUDGET_MS by default, and at most
+    ANALYSIS_LATENCY_BUDGET_MAX_MS. None if zero and no maximum is set.
+    
+    Raises:
+        ValueError: If the budget is not a finite, non-negative number
+    """
+    value = request.headers.get('X-Latency-Budget-Ms', data.get('latency_budget_ms', ANALYSIS_LATENCY_BUDGET_MS))
+    budget = float(value)
+    if not math.isfinite(budget) or budget < 0:
+        raise ValueError(f"Invalid latency budget: {value}")
+    if ANALYSIS_LATENCY_BUDGET_MAX_MS and (not budget or budget > ANALYSIS_LATENCY_BUDGET_MAX_MS):
+        budget = ANALYSIS_LATENCY_BUDGET_MAX_MS
+    return budget / 1000 if budget else None
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_resume():
     """Analyze resume against job description."""
@@ -175,45 +420,462 @@ def analyze_resume():
         # Get JSON data from request
         data = request.get_json()
         
+        resume_text, job_profile, job_description, error = _analysis_inputs(data)
+        if error:
+            return error
+        
+        # Log analysis request (without full text for privacy)
+        logger.info(f"Analyzing resume (length: {len(resume_text)}) against job description (length: {len(job_description)})")
+        
+        # Check if we should use Gemini API, and how long to wait for it
+        use_gemini = _use_gemini(data)
+        budget = None
+        if use_gemini:
+            try:
+                budget = _latency_budget(data)
+            except (TypeError, ValueError):
+                return jsonify({
+                    'error': 'Latency budget must be a finite, non-negative number of milliseconds'
+                }), 400
+        
+        # Serve repeat submissions from the result cache
+        cache_key = None
+        if result_cache is not None:
+            cache_key = _result_key(resume_text, job_description, use_gemini)
+            if 'no-cache' not in request.headers.get('Cache-Control', ''):
+                cached, tier = result_cache.get_json(cache_key)
+                if cached is not None:
+                    return Response(cached, mimetype='application/json', headers={
+                        'X-Cache': f'hit-{tier}',
+                        'X-Analysis-Engine': 'gemini' if use_gemini else 'rules'
+                    })
+        
+        # Perform analysis
+        analysis_result, engine, cached = _analyze(resume_text, job_profile, job_description,
+                                                   use_gemini, cache_key, budget)
+        
+        # Return results
+        response = jsonify(analysis_result)
+        response.headers['X-Analysis-Engine'] = engine
+        if cached:
+            response.headers['X-Cache'] = 'miss'
+        return response
+        
+    except AnalysisUnavailable as e:
+        logger.warning(f"Analysis unavailable: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
+    except Exception as e:
+        logger.error(f"Error during analysis: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred during analysis: {str(e)}"
+        }), 500
+
+def _sse(event, data):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _gemini_stages(fields):
+    """
+    Turn streamed Gemini fields into the same events as the rule-based stages:
+    overall as soon as the overall score arrives, each dimension once its score
+    and details have both arrived, suggestions, then a summary with the
+    complete result.
+    """
+    result = {}
+    for field, value in fields:
+        result[field] = value
+        if field == 'overall_score':
+            yield 'overall', {'score': value}
+        elif field == 'suggestions':
+            yield 'suggestions', {'suggestions': value}
+        else:
+            dimension = field.rsplit('_', 1)[0]
+            if dimension in ('skills', 'experience', 'education', 'keywords') \
+                    and f'{dimension}_score' in result and f'{dimension}_details' in result:
+                yield dimension, {
+                    'score': result[f'{dimension}_score'],
+                    'details': result[f'{dimension}_details']
+                }
+    yield 'summary', result
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_resume_stream():
+    """
+    Analyze resume against job description, streaming Server-Sent Events:
+    skills, experience, education, keywords and suggestions as each stage
+    finishes, then a summary with the complete result. With Gemini, results
+    are forwarded while the model is still writing them, led by an overall
+    event.
+    """
+    try:
+        data = request.get_json()
+        
+        resume_text, job_profile, job_description, error = _analysis_inputs(data)
+        if error:
+            return error
+        
+        logger.info(f"Streaming analysis of resume (length: {len(resume_text)}) against job description (length: {len(job_description)})")
+        use_gemini = _use_gemini(data)
+        
+    except Exception as e:
+        logger.error(f"Error during analysis: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred during analysis: {str(e)}"
+        }), 500
+    
+    def generate():
+        try:
+            stages = None
+            if use_gemini:
+                try:
+                    logger.info("Using Gemini API for analysis")
+                    gemini_stages = _gemini_stages(gemini_analyzer.analyze_stream(resume_text, job_description))
+                    # The call fails, if at all, before its first field arrives
+                    stages = itertools.chain([next(gemini_stages)], gemini_stages)
+                except Exception as e:
+                    logger.error(f"Gemini API analysis failed: {str(e)}, falling back to rule-based analysis")
+            if stages is None:
+                stages = resume_analyzer.analyze_stages(resume_text, job_profile or job_description)
+            
+            for stage, stage_data in stages:
+                yield _sse(stage, stage_data)
+                
+        except Exception as e:
+            # Headers are already sent, so report the failure in the stream
+            logger.error(f"Error during streaming analysis: {str(e)}", exc_info=True)
+            yield _sse('error', {'error': f"An error occurred during analysis: {str(e)}"})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Stop reverse proxies from buffering the stream
+    })
+
+def _run_analysis_job(payload):
+    """Run a queued analysis, with the same caching and Gemini fallback as /api/analyze."""
+    resume_text = payload['resume_text']
+    job_description = payload['job_description']
+    use_gemini = _use_gemini(payload)
+    
+    cache_key = None
+    if result_cache is not None:
+        cache_key = _result_key(resume_text, job_description, use_gemini)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    analysis_result, _, _ = _analyze(resume_text, None, job_description, use_gemini, cache_key)
+    return analysis_result
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_analysis_job():
+    """
+    Queue an analysis of a resume against a job description. Returns a job id
+    at once; poll GET /api/jobs/<id> for the status and result.
+    """
+    try:
+        if job_queue is None:
+            return jsonify({
+                'error': 'The job queue is disabled. Set JOB_QUEUE_ENABLED=True to enable it.'
+            }), 404
+        
+        data = request.get_json()
+        
+        resume_text, _, job_description, error = _analysis_inputs(data)
+        if error:
+            return error
+        
+        # Executors may run in another worker, so registered job profiles are sent as text
+        job_id = job_queue.submit({
+            'resume_text': resume_text,
+            'job_description': job_description,
+            'use_gemini': bool(data.get('use_gemini', False))
+        })
+        logger.info(f"Queued analysis job {job_id}")
+        
+        response = jsonify({
+            'success': True,
+            'id': job_id,
+            'status': 'queued'
+        })
+        response.status_code = 202
+        response.headers['Location'] = f'/api/jobs/{job_id}'
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error queueing analysis job: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred while queueing the analysis: {str(e)}"
+        }), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """Status of a queued analysis, with its result once done or its error if it failed."""
+    if job_queue is None:
+        return jsonify({
+            'error': 'The job queue is disabled. Set JOB_QUEUE_ENABLED=True to enable it.'
+        }), 404
+    
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': 'Unknown or expired job id'
+        }), 404
+    
+    response = jsonify(job)
+    if job['status'] in ('queued', 'running'):
+        response.headers['Retry-After'] = '1'
+    return response
+
+def _is_true(value):
+    """Interpret a JSON or form field as a boolean flag."""
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes')
+    return bool(value)
+
+@app.route('/api/rank', methods=['POST'])
+def rank_resumes():
+    """Rank a batch of resumes against one job description and return the top k."""
+    try:
+        resumes = []
+        if request.files:
+            # Multipart upload: one or more files under the 'resumes' field
+            data = request.form
+            for file in request.files.getlist('resumes'):
+                if not file.filename or not allowed_file(file.filename):
+                    return jsonify({
+                        'error': f"File type not allowed: {file.filename}"
+                    }), 400
+                filename = secure_filename(file.filename)
+                file_type = sniff_upload(file.stream)
+                try:
+                    resume_text = extract_text(file.stream, file_type)
+                except Exception as e:
+                    logger.error(f"Error extracting text from {filename}: {str(e)}")
+                    resume_text = ""
+                resumes.append((filename, resume_text))
+        else:
+            # JSON body: resumes as plain strings or {"id": ..., "text": ...} objects
+            data = request.get_json() or {}
+            for index, entry in enumerate(data.get('resumes') or []):
+                if isinstance(entry, dict):
+                    resumes.append((entry.get('id', index), entry.get('text')))
+                else:
+                    resumes.append((index, entry))
+        
+        # Validate input
+        if not resumes:
+            return jsonify({
+                'error': 'Missing required field: resumes'
+            }), 400
+        if any(not isinstance(resume_text, str) for _, resume_text in resumes):
+            return jsonify({
+                'error': 'Each resume must be a string or an object with a text field'
+            }), 400
+        
+        if data.get('job_id'):
+            job = resume_analyzer.get_job_profile(data['job_id'])
+            if job is None:
+                return jsonify({
+                    'error': 'Unknown or expired job_id. Register the job description again.'
+                }), 404
+        elif (data.get('job_description') or '').strip():
+            job = data['job_description']
+        else:
+            return jsonify({
+                'error': 'Missing required field: job_description (or job_id)'
+            }), 400
+        
+        try:
+            k = int(data.get('k', 10))
+        except (TypeError, ValueError):
+            k = 0
+        if k <= 0:
+            return jsonify({
+                'error': 'k must be a positive integer'
+            }), 400
+        
+        logger.info(f"Ranking {len(resumes)} resumes (top {k})")
+        
+        ranked = _run_analysis(
+            'rank', job, resumes, k=k,
+            include_details=_is_true(data.get('include_details', False)),
+            include_suggestions=_is_true(data.get('include_suggestions', False))
+        )
+        
+        return jsonify({
+            'total': len(resumes),
+            'results': ranked
+        })
+        
+    except AnalysisUnavailable as e:
+        logger.warning(f"Analysis unavailable: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
+    except UnsupportedFile as e:
+        logger.warning(f"Rejected upload: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
+    except Exception as e:
+        logger.error(f"Error during ranking: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred during ranking: {str(e)}"
+        }), 500
+
+@app.route('/api/job-profiles', methods=['POST'])
+def register_job_profile():
+    """Compile a job description once so it can be reused by id in /api/analyze."""
+    try:
+        data = request.get_json()
+        
         # Validate input
-        if not data or 'resume_text' not in data or 'job_description' not in data:
+        if not data or not data.get('job_description', '').strip():
             return jsonify({
-                'error': 'Missing required fields: resume_text and job_description'
+                'error': 'Missing required field: job_description'
             }), 400
-            
-        resume_text = data['resume_text']
-        job_description = data['job_description']
         
-        # Check if texts are not empty
-        if not resume_text.strip() or not job_description.strip():
+        job_profile = resume_analyzer.register_job(data['job_description'])
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_profile.job_id
+        })
+        
+    except Exception as e:
+        logger.error(f"Error registering job profile: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred while registering the job description: {str(e)}"
+        }), 500
+
+@app.route('/api/resumes', methods=['POST'])
+def add_resume():
+    """Store a resume in the candidate pool and index it for retrieval."""
+    try:
+        if 'file' in request.files:
+            file = request.files['file']
+            if not file.filename or not allowed_file(file.filename):
+                return jsonify({
+                    'error': 'File type not allowed'
+                }), 400
+            filename = secure_filename(file.filename)
+            data = request.form
+            resume_text = extract_text(file.stream, sniff_upload(file.stream))
+            metadata = {'filename': filename}
+        else:
+            data = request.get_json() or {}
+            resume_text = data.get('text')
+            metadata = data.get('metadata')
+        
+        # Validate input
+        if not isinstance(resume_text, str) or not resume_text.strip():
             return jsonify({
-                'error': 'Resume text and job description cannot be empty'
+                'error': 'Missing required field: text (or file)'
             }), 400
         
-        # Log analysis request (without full text for privacy)
-        logger.info(f"Analyzing resume (length: {len(resume_text)}) against job description (length: {len(job_description)})")
+        # Default to a content hash so re-uploading the same resume replaces it
+        resume_id = str(data.get('id') or hashlib.sha256(resume_text.encode('utf-8')).hexdigest()[:24])
+        resume_index.add(resume_id, resume_text, metadata)
+        logger.info(f"Indexed resume {resume_id} (length: {len(resume_text)})")
         
-        # Check if we should use Gemini API
-        use_gemini = data.get('use_gemini', False)
+        return jsonify({
+            'success': True,
+            'id': resume_id,
+            'pool_size': len(resume_index)
+        })
         
-        # Perform analysis
-        if use_gemini:
-            try:
-                logger.info("Using Gemini API for analysis")
-                analysis_result = gemini_analyzer.analyze(resume_text, job_description)
-            except Exception as e:
-                logger.error(f"Gemini API analysis failed: {str(e)}, falling back to rule-based analysis")
-                analysis_result = resume_analyzer.analyze(resume_text, job_description)
+    except UnsupportedFile as e:
+        logger.warning(f"Rejected upload: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
+    except Exception as e:
+        logger.error(f"Error indexing resume: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred while storing the resume: {str(e)}"
+        }), 500
+
+@app.route('/api/resumes/<resume_id>', methods=['DELETE'])
+def delete_resume(resume_id):
+    """Remove a resume from the candidate pool."""
+    try:
+        if not resume_index.delete(resume_id):
+            return jsonify({
+                'error': 'Unknown resume id'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'id': resume_id,
+            'pool_size': len(resume_index)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error deleting resume: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': f"An error occurred while deleting the resume: {str(e)}"
+        }), 500
+
+@app.route('/api/resumes/search', methods=['POST'])
+def search_resumes():
+    """Retrieve candidates from the resume pool with BM25, then rank them with the full analysis."""
+    try:
+        data = request.get_json() or {}
+        
+        if data.get('job_id'):
+            job = resume_analyzer.get_job_profile(data['job_id'])
+            if job is None:
+                return jsonify({
+                    'error': 'Unknown or expired job_id. Register the job description again.'
+                }), 404
+            job_description = job.text
+        elif (data.get('job_description') or '').strip():
+            job = job_description = data['job_description']
         else:
-            analysis_result = resume_analyzer.analyze(resume_text, job_description)
+            return jsonify({
+                'error': 'Missing required field: job_description (or job_id)'
+            }), 400
         
-        # Return results
-        return jsonify(analysis_result)
+        try:
+            k = int(data.get('k', 10))
+            candidates = int(data.get('candidates', 200))
+        except (TypeError, ValueError):
+            k = candidates = 0
+        if k <= 0 or candidates <= 0:
+            return jsonify({
+                'error': 'k and candidates must be positive integers'
+            }), 400
+        
+        retrieved = resume_index.search(job_description, k=max(candidates, k))
+        retrieval_scores = dict(retrieved)
+        resumes = resume_index.get_many([resume_id for resume_id, _ in retrieved])
+        logger.info(f"Retrieved {len(resumes)} candidates from a pool of {len(resume_index)}; ranking top {k}")
+        
+        ranked = _run_analysis(
+            'rank', job, resumes, k=k,
+            include_details=_is_true(data.get('include_details', False)),
+            include_suggestions=_is_true(data.get('include_suggestions', False))
+        )
+        for item in ranked:
+            item['retrieval_score'] = round(retrieval_scores[item['id']], 4)
         
+        return jsonify({
+            'pool_size': len(resume_index),
+            'retrieved': len(resumes),
+            'results': ranked
+        })
+        
+    except AnalysisUnavailable as e:
+        logger.warning(f"Analysis unavailable: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), e.status_code
     except Exception as e:
-        logger.error(f"Error during analysis: {str(e)}", exc_info=True)
+        logger.error(f"Error searching resumes: {str(e)}", exc_info=True)
         return jsonify({
-            'error': f"An error occurred during analysis: {str(e)}"
+            'error': f"An error occurred while searching resumes: {str(e)}"
         }), 500
 
 @app.route('/api/health', methods=['GET'])
@@ -224,6 +886,33 @@ def health_check():
         'service': 'ai-resume-analyzer'
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Stage and request duration histograms in the Prometheus text format."""
+    if not metrics.enabled:
+        return jsonify({
+            'error': 'Metrics are disabled. Set METRICS_ENABLED=True to enable them.'
+        }), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Result cache hit ratio and space usage."""
+    if result_cache is None:
+        return jsonify({
+            'error': 'The result cache is disabled. Set RESULT_CACHE_ENABLED=True to enable it.'
+        }), 404
+    return jsonify(result_cache.stats())
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 200 once warm-up has finished, 503 before or if it failed."""
+    return jsonify(readiness.status()), 200 if readiness.ready else 503
+
+# Start the job executors now that the job handler is defined
+if job_queue is not None:
+    job_queue.start()
+
 if __name__ == '__main__':
     # Get port from environment variable or use default
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for the analyzer.
+
+Run from the backend directory:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+"""
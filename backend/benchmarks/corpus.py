@@ -0,0 +1,217 @@
+import io
+import random
+from skill_matcher import load_taxonomy, DEFAULT_TAXONOMY_PATH
+
+# Target document sizes in characters
+SIZES = {
+    '1page': 3000,
+    '2page': 6000,
+    '10page': 30000,
+    '1mb': 1 << 20,
+    '16mb': 16 << 20
+}
+
+FIRST_NAMES = ['Alex', 'Priya', 'Wei', 'Maria', 'James', 'Fatima', 'Noah', 'Aiko', 'Carlos', 'Olivia']
+LAST_NAMES = ['Smith', 'Patel', 'Chen', 'Garcia', 'Johnson', 'Khan', 'Kim', 'Rossi', 'Nguyen', 'Brown']
+TITLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'DevOps Engineer',
+          'Product Manager', 'Machine Learning Engineer', 'Frontend Developer', 'Data Analyst']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Enterprises',
+             'Hooli', 'Vandelay Industries', 'Soylent Systems', 'Tyrell Analytics']
+VERBS = ['Led', 'Built', 'Designed', 'Implemented', 'Improved', 'Managed', 'Developed', 'Reduced',
+         'Automated', 'Migrated', 'Delivered', 'Optimized', 'Mentored', 'Launched']
+OBJECTS = ['REST APIs', 'data pipelines', 'a recommendation engine', 'the CI/CD workflow',
+           'customer-facing dashboards', 'microservices', 'the billing platform', 'ETL jobs',
+           'a search service', 'internal tooling', 'the mobile app backend', 'monitoring and alerting']
+OUTCOMES = ['improving response time by {n}%', 'serving {n} million requests per day',
+            'cutting infrastructure costs by {n}%', 'for a team of {n} engineers',
+            'increasing revenue by ${n}k', 'reducing deployment time from hours to minutes']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'B.S. in Electrical Engineering', 'M.S. in Statistics', 'Ph.D. in Physics',
+           'MBA', 'Bachelor of Arts in Economics', 'Associate Degree in Information Technology']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+SOFT_SKILLS = ['communication', 'teamwork', 'leadership', 'problem solving', 'stakeholder management']
+
+
+def _skills():
+    """All canonical skill names in the bundled taxonomy."""
+    return [skill for entries in load_taxonomy(DEFAULT_TAXONOMY_PATH).values() for skill, _ in entries]
+
+
+_SKILLS = _skills()
+
+
+def _bullet(rng):
+    """One experience bullet point."""
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 60))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}, {outcome}"
+
+
+def _job_entry(rng, year):
+    """One position in the experience section."""
+    years = rng.randint(1, 6)
+    lines = [f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({year - years} - {year})"]
+    lines.extend(_bullet(rng) for _ in range(rng.randint(3, 6)))
+    return '\n'.join(lines), year - years
+
+
+def generate_resume(seed, size='1page'):
+    """
+    Generate a realistic plain-text resume.
+
+    Args:
+        seed (int): Random seed; the same seed and size give the same text
+        size (str or int): A key of SIZES or a target length in characters
+
+    Returns:
+        str: Resume text with contact details, summary, skills, experience,
+            education and certifications sections
+    """
+    rng = random.Random(seed)
+    target = SIZES.get(size, size)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    title = rng.choice(TITLES)
+    skills = rng.sample(_SKILLS, rng.randint(8, 20))
+
+    head = [
+        name,
+        title,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)} "
+        f"| linkedin.com/in/{name.lower().replace(' ', '-')}",
+        '',
+        'SUMMARY',
+        f"{title} with {rng.randint(2, 15)}+ years of experience in {skills[0]} and {skills[1]}. "
+        f"Strong {rng.choice(SOFT_SKILLS)} and {rng.choice(SOFT_SKILLS)} skills.",
+        '',
+        'SKILLS',
+        ', '.join(skills + rng.sample(SOFT_SKILLS, 2)),
+        '',
+        'PROFESSIONAL EXPERIENCE'
+    ]
+    tail = [
+        '',
+        'EDUCATION',
+        f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)} ({rng.randint(1995, 2020)})",
+        '',
+        'CERTIFICATIONS',
+        f"AWS Certified Solutions Architect ({rng.randint(2015, 2024)})"
+    ]
+
+    # Add positions, most recent first, until the document reaches its size
+    length = sum(len(line) + 1 for line in head + tail)
+    entries = []
+    year = 2024
+    while length < target or not entries:
+        entry, year = _job_entry(rng, year)
+        if year < 1980:
+            year = 2024
+        entries.append(entry)
+        length += len(entry) + 2
+    return '\n'.join(head + ['\n\n'.join(entries)] + tail)
+
+
+def generate_job(seed, size=1500):
+    """
+    Generate a realistic job description.
+
+    Args:
+        seed (int): Random seed
+        size (str or int): A key of SIZES or a target length in characters
+
+    Returns:
+        str: Job description with responsibilities, requirements and skills
+    """
+    rng = random.Random(seed + 1000003)
+    target = SIZES.get(size, size)
+    title = rng.choice(TITLES)
+    skills = rng.sample(_SKILLS, rng.randint(5, 12))
+
+    lines = [
+        title,
+        f"{rng.choice(COMPANIES)} is hiring a {title} to join our growing team.",
+        '',
+        'Responsibilities'
+    ]
+    lines.extend(_bullet(rng) for _ in range(4))
+    lines.extend([
+        '',
+        'Requirements',
+        f"- {rng.randint(2, 8)}+ years of experience with {skills[0]} and {skills[1]}",
+        f"- {rng.choice(['Bachelor', 'Master'])}'s degree in Computer Science or a related field",
+        f"- Experience with {', '.join(skills[2:])}",
+        f"- Excellent {rng.choice(SOFT_SKILLS)} and {rng.choice(SOFT_SKILLS)}",
+        '',
+        f"Skills: {', '.join(skills)}"
+    ])
+    length = sum(len(line) + 1 for line in lines)
+    while length < target:
+        line = _bullet(rng)
+        lines.insert(4, line)
+        length += len(line) + 1
+    return '\n'.join(lines)
+
+
+def to_docx(text):
+    """
+    Render text as a .docx file, one paragraph per line.
+
+    Args:
+        text (str): Document text
+
+    Returns:
+        bytes: The file contents
+    """
+    import docx
+    document = docx.Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line):
+    """Escape a line for a PDF string literal, keeping Latin-1 characters only."""
+    line = line.encode('latin-1', 'replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def to_pdf(text, lines_per_page=60):
+    """
+    Render text as a minimal PDF with one text line per row, so extraction can
+    be benchmarked without a PDF-writing dependency.
+
+    Args:
+        text (str): Document text
+        lines_per_page (int): Lines on each page
+
+    Returns:
+        bytes: The file contents
+    """
+    lines = text.split('\n')
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = [None, None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page in pages:
+        rows = ''.join(f"({_pdf_escape(line)}) Tj T* " for line in page)
+        stream = f"BT /F1 10 Tf 12 TL 40 760 Td {rows}ET".encode('latin-1')
+        page_id = len(objects) + 1
+        kids.append(f"{page_id} 0 R")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode())
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    out.writelines(b'%010d 00000 n \n' % offset for offset in offsets)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
@@ -0,0 +1,244 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import itertools
+import platform
+import tempfile
+import subprocess
+import numpy as np
+from analyzer import ResumeAnalyzer
+from extraction import extract_text
+from benchmarks.corpus import SIZES, generate_resume, generate_job, to_docx, to_pdf
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = ['1page', '2page', '10page']
+
+# Distinct resumes cycled through by the end-to-end benchmark; megabyte-sized
+# documents use fewer to keep memory in check
+END_TO_END_RESUMES = 20
+END_TO_END_LARGE_RESUMES = 2
+
+
+def measure(fn, repeat=30, min_time=1.0, max_time=30.0):
+    """
+    Time repeated calls of a function after one warm-up call.
+
+    Args:
+        fn (callable): Function to call without arguments
+        repeat (int): Minimum number of timed calls
+        min_time (float): Minimum total seconds to keep timing
+        max_time (float): Stop after this many seconds even if repeat is not reached
+
+    Returns:
+        list: Seconds taken by each call
+    """
+    fn()
+    samples = []
+    start = time.perf_counter()
+    while True:
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        if elapsed >= max_time or (len(samples) >= repeat and elapsed >= min_time):
+            return samples
+
+
+def summarize(samples):
+    """
+    Reduce timings to summary statistics in milliseconds.
+
+    Args:
+        samples (list): Seconds per call
+
+    Returns:
+        dict: Call count and mean, min, p50, p90, p99 and max in milliseconds
+    """
+    ms = np.array(samples) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        'n': len(samples),
+        'mean_ms': round(float(ms.mean()), 4),
+        'min_ms': round(float(ms.min()), 4),
+        'p50_ms': round(float(p50), 4),
+        'p90_ms': round(float(p90), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(ms.max()), 4)
+    }
+
+
+def _extraction_benchmarks(resume_text, directory, size):
+    """Write the resume in every upload format and time extract_text on each, as upload_file does."""
+    benchmarks = {}
+    for ext, render in (('txt', lambda text: text.encode('utf-8')), ('docx', to_docx), ('pdf', to_pdf)):
+        try:
+            content = render(resume_text)
+        except ImportError:
+            logger.warning(f"Skipping {ext} extraction: its library is not installed")
+            continue
+        path = os.path.join(directory, f"resume_{size}.{ext}")
+        with open(path, 'wb') as f:
+            f.write(content)
+        benchmarks[f'extract_text.{ext}'] = lambda path=path, ext=ext: extract_text(path, ext)
+    return benchmarks
+
+
+def run_benchmarks(sizes=None, only=None, repeat=30, min_time=1.0, max_time=30.0, seed=0, analyzer=None):
+    """
+    Run every benchmark at every document size.
+
+    Args:
+        sizes (list): Keys of SIZES, DEFAULT_SIZES by default
+        only (list): Benchmark names to run, all by default
+        repeat (int): Minimum timed calls per benchmark
+        min_time (float): Minimum seconds per benchmark
+        max_time (float): Maximum seconds per benchmark
+        seed (int): Corpus seed
+        analyzer (ResumeAnalyzer): Analyzer to benchmark, a default one if None
+
+    Returns:
+        dict: Summary statistics keyed by 'benchmark/size'
+    """
+    analyzer = analyzer or ResumeAnalyzer()
+    results = {}
+    job = generate_job(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes or DEFAULT_SIZES:
+            resume = generate_resume(seed, size)
+            distinct = END_TO_END_RESUMES if SIZES[size] < 1 << 20 else END_TO_END_LARGE_RESUMES
+            resumes = itertools.cycle([resume] + [generate_resume(seed + i, size) for i in range(1, distinct)])
+            scores = analyzer.score(resume, job)
+            benchmarks = {
+                'preprocess_text': lambda: analyzer.preprocess_text(resume),
+                'extract_sections': lambda: analyzer.extract_sections(resume),
+                'extract_keywords': lambda: analyzer.extract_keywords(resume),
+                'analyze_skills': lambda: analyzer.analyze_skills(resume, job),
+                'analyze_experience': lambda: analyzer.analyze_experience(resume, job),
+                'analyze_education': lambda: analyzer.analyze_education(resume, job),
+                'generate_suggestions': lambda: analyzer.generate_suggestions(resume, job, scores),
+                'analyze': lambda: analyzer.analyze(next(resumes), job)
+            }
+            benchmarks.update(_extraction_benchmarks(resume, directory, size))
+
+            for name, fn in benchmarks.items():
+                if only and name not in only and name.split('.')[0] not in only:
+                    continue
+                key = f"{name}/{size}"
+                results[key] = summarize(measure(fn, repeat, min_time, max_time))
+                logger.info(f"{key}: p50 {results[key]['p50_ms']:.3f} ms, p99 {results[key]['p99_ms']:.3f} ms "
+                            f"({results[key]['n']} calls)")
+    return results
+
+
+def _git_commit():
+    """The current git commit, if the code is in a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment(seed, sizes, analyzer_kwargs):
+    """
+    Describe the machine and configuration a run used.
+
+    Returns:
+        dict: Versions, CPU count, git commit and benchmark settings
+    """
+    import nltk
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'nltk': nltk.__version__,
+        'seed': seed,
+        'sizes': {size: SIZES[size] for size in sizes},
+        'analyzer': analyzer_kwargs
+    }
+
+
+def compare(baseline, current, threshold=1.2):
+    """
+    Compare two result files benchmark by benchmark on p50 latency.
+
+    Args:
+        baseline (dict): Earlier results
+        current (dict): New results
+        threshold (float): p50 ratio above which a benchmark counts as a regression
+
+    Returns:
+        tuple: (key, baseline p50, current p50, ratio) rows for the benchmarks in
+            both, and the keys that regressed
+    """
+    rows = []
+    regressions = []
+    for key in sorted(set(baseline['results']) & set(current['results'])):
+        before = baseline['results'][key]['p50_ms']
+        after = current['results'][key]['p50_ms']
+        ratio = after / before if before else float('inf')
+        rows.append((key, before, after, ratio))
+        if ratio > threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the resume analyzer.')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=DEFAULT_SIZES,
+                        help=f"Resume sizes (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument('--only', nargs='+', help='Benchmark names to run, e.g. analyze extract_text')
+    parser.add_argument('--repeat', type=int, default=30, help='Minimum timed calls per benchmark')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Minimum seconds per benchmark')
+    parser.add_argument('--max-time', type=float, default=30.0, help='Maximum seconds per benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--tokenizer', default='fast', choices=['fast', 'nltk'])
+    parser.add_argument('--shared-tables', help='Shared tables file to load')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='p50 slowdown ratio reported as a regression (default: 1.2)')
+    args = parser.parse_args(argv)
+
+    analyzer_kwargs = {'tokenizer': args.tokenizer, 'shared_tables_path': args.shared_tables}
+    analyzer = ResumeAnalyzer(**analyzer_kwargs)
+    report = {
+        'environment': environment(args.seed, args.sizes, analyzer_kwargs),
+        'results': run_benchmarks(args.sizes, args.only, args.repeat, args.min_time, args.max_time,
+                                  args.seed, analyzer)
+    }
+
+    if args.output:
+        # Sorted keys and one value per line keep runs easy to diff
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        logger.info(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(baseline, report, args.threshold)
+        print(f"{'benchmark':<40} {'before':>10} {'after':>10} {'ratio':>7}")
+        for key, before, after, ratio in rows:
+            flag = '  REGRESSION' if key in regressions else ''
+            print(f"{key:<40} {before:>10.3f} {after:>10.3f} {ratio:>7.2f}{flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    # Usage: python -m benchmarks.run [--output results.json] [--compare baseline.json]
+    sys.exit(main())
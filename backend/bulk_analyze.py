@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from dotenv import load_dotenv
+from extraction import allowed_file, extract_text
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# The analyzer and compiled job descriptions owned by each worker process
+_analyzer = None
+_jobs = None
+_method = None
+
+
+def collect_inputs(sources):
+    """
+    Expand directories and manifests into a list of document paths.
+
+    A directory is searched recursively for resume files (pdf, doc, docx, txt).
+    A file with one of those extensions is taken as is; any other file, e.g.
+    'resumes.list', is a manifest with one path per line, relative to the
+    manifest's directory, where lines starting with '#' are comments.
+
+    Args:
+        sources (list): Directory, document and manifest paths
+
+    Returns:
+        list: Unique document paths
+    """
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files) if allowed_file(name))
+        elif allowed_file(source):
+            paths.append(source)
+        else:
+            base = os.path.dirname(source)
+            with open(source, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        paths.append(os.path.join(base, line))
+
+    seen = set()
+    return [path for path in paths if not (path in seen or seen.add(path))]
+
+
+def read_document(path):
+    """Extract a document's text the same way /api/upload does."""
+    return extract_text(path, path.rsplit('.', 1)[-1].lower())
+
+
+def load_checkpoint(output_path):
+    """
+    Read the pairs already written to an output file, so an interrupted run
+    can continue where it stopped. A partially written last line is removed.
+
+    Args:
+        output_path (str): JSONL output path
+
+    Returns:
+        set: (resume, job) pairs already in the file
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'rb+') as f:
+        complete = 0
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            done.add((record['resume'], record['job']))
+            complete += len(line)
+        # Drop anything after the last complete record
+        f.truncate(complete)
+    return done
+
+
+def _init_worker(analyzer_kwargs, jobs, include_suggestions):
+    """Build this worker's analyzer and compile every job description once."""
+    global _analyzer, _jobs, _method
+    from analyzer import ResumeAnalyzer
+
+    _analyzer = ResumeAnalyzer(**analyzer_kwargs)
+    _jobs = [(job_path, _analyzer.compile_job(text)) for job_path, text in jobs]
+    _method = _analyzer.analyze if include_suggestions else _analyzer.score
+
+
+def _analyze_resume(task):
+    """
+    Analyze one resume against its pending job descriptions.
+
+    Args:
+        task (tuple): Resume path and the indices of the jobs still to do
+
+    Returns:
+        tuple: One JSON line per job, and the number of failed pairs
+    """
+    resume_path, job_indices = task
+    try:
+        resume = _analyzer.parse(read_document(resume_path))
+    except Exception as e:
+        error = f"Could not read resume: {str(e)}"
+        lines = [json.dumps({'resume': resume_path, 'job': _jobs[i][0], 'error': error}) for i in job_indices]
+        return lines, len(lines)
+
+    lines = []
+    errors = 0
+    for i in job_indices:
+        job_path, job = _jobs[i]
+        try:
+            record = {'resume': resume_path, 'job': job_path, 'result': _method(resume, job)}
+        except Exception as e:
+            record = {'resume': resume_path, 'job': job_path, 'error': str(e)}
+            errors += 1
+        lines.append(json.dumps(record))
+    return lines, errors
+
+
+def run(resume_paths, job_paths, output_path, analyzer_kwargs=None, workers=None,
+        include_suggestions=True, restart=False, progress_interval=10):
+    """
+    Analyze every resume against every job description across all cores,
+    appending one JSON line per pair to the output as results arrive.
+
+    The output file doubles as the checkpoint: re-running the same command
+    skips the pairs it already holds.
+
+    Args:
+        resume_paths (list): Resume file paths
+        job_paths (list): Job description file paths
+        output_path (str): JSONL output path
+        analyzer_kwargs (dict): Keyword arguments for each worker's ResumeAnalyzer
+        workers (int): Number of worker processes, the CPU count by default
+        include_suggestions (bool): Run analyze() with suggestions, or the faster score()
+        restart (bool): Discard any existing output instead of continuing from it
+        progress_interval (float): Seconds between progress reports
+
+    Returns:
+        dict: Pairs written, errors and elapsed seconds
+    """
+    if restart and os.path.exists(output_path):
+        os.remove(output_path)
+    done = load_checkpoint(output_path)
+
+    jobs = [(path, read_document(path)) for path in job_paths]
+    tasks = []
+    all_jobs = list(range(len(job_paths)))
+    for resume_path in resume_paths:
+        pending = all_jobs
+        if done:
+            pending = [i for i, job_path in enumerate(job_paths) if (resume_path, job_path) not in done]
+        if pending:
+            tasks.append((resume_path, pending))
+
+    total = sum(len(pending) for _, pending in tasks)
+    logger.info(f"{len(resume_paths)} resumes x {len(job_paths)} jobs: "
+                f"{len(done)} pairs already done, {total} to go")
+    if not total:
+        return {'pairs': 0, 'errors': 0, 'seconds': 0.0}
+
+    workers = workers or os.cpu_count() or 1
+    # Small chunks keep every worker busy to the end; larger ones cut IPC overhead
+    chunksize = max(1, min(16, len(tasks) // (workers * 8)))
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+
+    written = errors = 0
+    start = last_report = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out, \
+            context.Pool(workers, _init_worker, (analyzer_kwargs or {}, jobs, include_suggestions)) as pool:
+        for lines, failed in pool.imap_unordered(_analyze_resume, tasks, chunksize):
+            out.write(''.join(line + '\n' for line in lines))
+            out.flush()
+            written += len(lines)
+            errors += failed
+
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                last_report = now
+                rate = written / (now - start)
+                eta = (total - written) / rate if rate else 0
+                logger.info(f"{written}/{total} pairs ({written * 100 / total:.1f}%), "
+                            f"{rate:.1f} pairs/s, {rate * 3600:.0f} pairs/h, ETA {eta / 60:.1f} min")
+                os.fsync(out.fileno())
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Wrote {written} pairs ({errors} errors) in {elapsed:.1f}s, "
+                f"{written / elapsed * 3600:.0f} pairs/h")
+    return {'pairs': written, 'errors': errors, 'seconds': elapsed}
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(
+        description='Analyze every resume against every job description and write JSONL results.')
+    parser.add_argument('--resumes', nargs='+', required=True,
+                        help='Resume files, directories or manifests')
+    parser.add_argument('--jobs', nargs='+', required=True,
+                        help='Job description files, directories or manifests')
+    parser.add_argument('--output', required=True, help='JSONL output file, also used as the checkpoint')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-suggestions', action='store_true', help='Skip improvement suggestions')
+    parser.add_argument('--restart', action='store_true', help='Start over instead of continuing')
+    parser.add_argument('--progress-interval', type=float, default=10, help='Seconds between progress reports')
+    args = parser.parse_args(argv)
+
+    # Same analyzer configuration as the server
+    analyzer_kwargs = dict(
+        lemma_cache_size=int(os.getenv('LEMMA_CACHE_SIZE', 50000)),
+        lemma_preload_path=os.getenv('LEMMA_PRELOAD_PATH'),
+        tokenizer=os.getenv('TOKENIZER', 'fast'),
+        nltk_data_path=os.getenv('NLTK_DATA'),
+        nltk_download=os.getenv('NLTK_DOWNLOAD', 'True').lower() == 'true',
+        skills_taxonomy_path=os.getenv('SKILLS_TAXONOMY_PATH'),
+        shared_tables_path=os.getenv('SHARED_TABLES_PATH')
+    )
+
+    resume_paths = collect_inputs(args.resumes)
+    job_paths = collect_inputs(args.jobs)
+    if not resume_paths or not job_paths:
+        parser.error('no resumes or job descriptions found')
+
+    result = run(resume_paths, job_paths, args.output, analyzer_kwargs,
+                 workers=args.workers,
+                 include_suggestions=not args.no_suggestions,
+                 restart=args.restart,
+                 progress_interval=args.progress_interval)
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    # Usage: python bulk_analyze.py --resumes DIR --jobs DIR --output results.jsonl
+    sys.exit(main())
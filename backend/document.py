@@ -0,0 +1,152 @@
+from collections import Counter
+
+
+class ParsedDocument:
+    """
+    A resume or job description parsed once and shared by every analysis step.
+    Sections, tokens, term counts and keywords are computed lazily on first
+    use and cached, so repeated lookups during one analysis cost nothing.
+    """
+
+    def __init__(self, text, analyzer):
+        """
+        Initialize the ParsedDocument.
+
+        Args:
+            text (str): The raw document text
+            analyzer (ResumeAnalyzer): Analyzer providing section extraction and preprocessing
+        """
+        self.text = text
+        self._analyzer = analyzer
+        self._scan = None
+        self._sections = None
+        self._lower = None
+        self._word_count = None
+        self._skills = None
+        self._tokens = {}
+        self._term_counts = {}
+        self._keywords = {}
+        self._keyword_ids = {}
+
+    @property
+    def scan(self):
+        """ScanResult: Section, degree, experience and contact hits from one pattern pass."""
+        if self._scan is None:
+            self._scan = self._analyzer.patterns.scan(self.text, lowered=self.lower)
+        return self._scan
+
+    @property
+    def sections(self):
+        """dict: Sections extracted from the text."""
+        if self._sections is None:
+            self._sections = self._analyzer.extract_sections(self.text, scan=self.scan)
+        return self._sections
+
+    @property
+    def lower(self):
+        """str: Lowercased text."""
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def word_count(self):
+        """int: Number of whitespace-separated words."""
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    @property
+    def skills(self):
+        """list: Taxonomy skills mentioned anywhere in the text, in order of first mention."""
+        if self._skills is None:
+            self._skills = self._analyzer.skill_matcher.find(self.text)
+        return self._skills
+
+    def _resolve(self, section):
+        """Map a section name to the key its text is cached under (None for full text)."""
+        if section is not None and section in self.sections:
+            return section
+        return None
+
+    def section_text(self, section=None):
+        """
+        Get the text of a section, falling back to the full text.
+
+        Args:
+            section (str): Section name, or None for the full text
+
+        Returns:
+            str: Section text
+        """
+        key = self._resolve(section)
+        return self.text if key is None else self.sections[key]
+
+    def tokens(self, section=None):
+        """
+        Get the preprocessed tokens of a section.
+
+        Args:
+            section (str): Section name, or None for the full text
+
+        Returns:
+            list: List of preprocessed tokens
+        """
+        key = self._resolve(section)
+        if key not in self._tokens:
+            self._tokens[key] = self._analyzer.preprocess_text(self.section_text(key))
+        return self._tokens[key]
+
+    def term_counts(self, section=None):
+        """
+        Get keyword candidate counts of a section, excluding single characters and numbers.
+
+        Args:
+            section (str): Section name, or None for the full text
+
+        Returns:
+            Counter: Token frequencies
+        """
+        key = self._resolve(section)
+        if key not in self._term_counts:
+            token_counts = Counter(self.tokens(key))
+            self._term_counts[key] = Counter({token: count for token, count in token_counts.items()
+                                              if len(token) > 1 and not token.isdigit()})
+        return self._term_counts[key]
+
+    def keywords(self, n=30, section=None):
+        """
+        Get the most common keywords of a section.
+
+        Args:
+            n (int): Number of keywords to extract
+            section (str): Section name, or None for the full text
+
+        Returns:
+            list: List of extracted keywords
+        """
+        key = (self._resolve(section), n)
+        if key not in self._keywords:
+            self._keywords[key] = [token for token, _ in self.term_counts(key[0]).most_common(n)]
+        return self._keywords[key]
+
+    def keyword_ids(self, n=30, section=None):
+        """
+        Get the vocabulary ids of the most common keywords of a section.
+
+        Args:
+            n (int): Number of keywords to extract
+            section (str): Section name, or None for the full text
+
+        Returns:
+            numpy.ndarray: Keyword ids in ranked order, in the vocabulary's current generation
+        """
+        key = (self._resolve(section), n)
+        vocabulary = self._analyzer.vocabulary
+        entry = self._keyword_ids.get(key)
+        # Ids from an earlier vocabulary generation are stale
+        if entry is None or entry[0] != vocabulary.generation:
+            generation = vocabulary.generation
+            entry = (generation, vocabulary.encode(self.keywords(n=n, section=key[0])))
+            self._keyword_ids[key] = entry
+        return entry[1]
@@ -0,0 +1,200 @@
+import contextlib
+import io
+import logging
+import tempfile
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'txt'}
+
+# Bytes inspected to tell a file's real type
+SNIFF_BYTES = 512
+
+# Leading bytes of the binary formats we recognize
+_PDF_MAGIC = b'%PDF-'
+_ZIP_MAGIC = b'PK\x03\x04'                            # .docx is a zip archive
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'        # Legacy Word .doc
+
+
+class UnsupportedFile(Exception):
+    """
+    Raised for an upload whose content is not a supported document;
+    status_code is the HTTP status to report. Not a ValueError, so Werkzeug's
+    form parser does not swallow it when raised while the upload is arriving.
+    """
+    status_code = 415
+
+
+class FileTypeNotAllowed(UnsupportedFile):
+    """Raised for an upload whose file extension is not allowed."""
+    status_code = 400
+
+
+def allowed_file(filename):
+    """Check if the file extension is allowed."""
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+
+def detect_type(head):
+    """
+    Tell a document's type from its first bytes, whatever its name says.
+
+    Args:
+        head (bytes): Up to SNIFF_BYTES leading bytes of the file
+
+    Returns:
+        str: 'pdf', 'docx', 'doc' or 'txt', or None for other binary data
+    """
+    if head.startswith(_ZIP_MAGIC):
+        return 'docx'
+    if head.startswith(_OLE_MAGIC):
+        return 'doc'
+    # Some PDF writers put junk before the header
+    if _PDF_MAGIC in head[:SNIFF_BYTES]:
+        return 'pdf'
+    if b'\x00' not in head:
+        return 'txt'
+    return None
+
+
+def check_type(head):
+    """
+    Tell a document's type from its first bytes, rejecting unsupported content.
+
+    Args:
+        head (bytes): Up to SNIFF_BYTES leading bytes of the file
+
+    Returns:
+        str: 'pdf', 'docx' or 'txt'
+
+    Raises:
+        UnsupportedFile: If the file is empty, a legacy .doc file or other binary data
+    """
+    if not head:
+        raise UnsupportedFile("The file is empty")
+    file_type = detect_type(head)
+    if file_type == 'doc':
+        raise UnsupportedFile("Legacy Word .doc files are not supported; save the resume as .docx or PDF")
+    if file_type is None:
+        raise UnsupportedFile("The file is not a PDF, Word or text document")
+    return file_type
+
+
+def sniff_upload(stream):
+    """
+    Tell the type of an uploaded file from its content, leaving the stream rewound.
+
+    Args:
+        stream (file): Seekable binary stream
+
+    Returns:
+        str: 'pdf', 'docx' or 'txt', to pass to extract_text()
+
+    Raises:
+        UnsupportedFile: If the content is not a supported document
+    """
+    stream.seek(0)
+    head = stream.read(SNIFF_BYTES)
+    stream.seek(0)
+    return check_type(head)
+
+
+class SniffedUpload(tempfile.SpooledTemporaryFile):
+    """
+    Buffer for an arriving upload, kept in memory up to max_size bytes and
+    spilled to an anonymous temporary file beyond. Its first bytes are
+    checked as soon as they arrive, so an unsupported file is rejected
+    before the rest of the request body is read.
+    """
+
+    def __init__(self, filename, max_size=0):
+        """
+        Initialize the SniffedUpload.
+
+        Args:
+            filename (str): Name the client gave the file
+            max_size (int): Bytes kept in memory, 0 for no limit
+
+        Raises:
+            FileTypeNotAllowed: If the file extension is not allowed
+        """
+        super().__init__(max_size=max_size, mode='w+b')
+        if not allowed_file(filename):
+            self.close()
+            raise FileTypeNotAllowed(f"File type not allowed: {filename}")
+        self._head = b''
+        self._checked = False
+
+    def write(self, data):
+        if not self._checked:
+            self._head += bytes(data[:SNIFF_BYTES - len(self._head)])
+            if len(self._head) >= SNIFF_BYTES:
+                self._checked = True
+                check_type(self._head)
+        return super().write(data)
+
+
+def _open_binary(source):
+    """Open a path for binary reading, or rewind a caller-owned binary stream without closing it."""
+    if isinstance(source, str):
+        return open(source, 'rb')
+    source.seek(0)
+    return contextlib.nullcontext(source)
+
+
+def _read_text(source):
+    """Read a text file as UTF-8, ignoring undecodable bytes and normalizing newlines."""
+    with _open_binary(source) as f:
+        wrapper = io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+        try:
+            return wrapper.read()
+        finally:
+            # Leave the underlying stream open for its owner
+            wrapper.detach()
+
+
+def extract_text(source, file_ext):
+    """
+    Extract text from a resume file based on its type.
+
+    Args:
+        source (str or file): Path to the file, or a seekable binary stream
+        file_ext (str): Lowercase file extension without the dot, or the type
+            from sniff_upload()
+
+    Returns:
+        str: Extracted text
+    """
+    if file_ext == 'txt':
+        # Simple text file
+        return _read_text(source)
+
+    if file_ext in ['doc', 'docx']:
+        # Try to extract text from Word documents
+        try:
+            import docx
+            with _open_binary(source) as f:
+                doc = docx.Document(f)
+            return '\n'.join([para.text for para in doc.paragraphs])
+        except ImportError:
+            logger.warning("python-docx not installed, falling back to basic text extraction")
+            with _open_binary(source) as f:
+                return str(f.read())
+
+    if file_ext == 'pdf':
+        # Try to extract text from PDF
+        try:
+            import PyPDF2
+            with _open_binary(source) as f:
+                pdf_reader = PyPDF2.PdfReader(f)
+                return '\n'.join([page.extract_text() for page in pdf_reader.pages])
+        except ImportError:
+            logger.warning("PyPDF2 not installed, falling back to basic text extraction")
+            with _open_binary(source) as f:
+                return str(f.read())
+
+    # Default fallback
+    return _read_text(source)
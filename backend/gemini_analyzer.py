@@ -1,21 +1,62 @@
-import requests
 import json
+import copy
+import hashlib
 import logging
 import os
+import tempfile
+import time
 from dotenv import load_dotenv
+from metrics import metrics
+from gemini_client import GeminiClient, CircuitBreaker, GeminiError
+from incremental_json import IncrementalObjectParser
+from single_flight import SingleFlight, HostSingleFlight
+from prompt_builder import PromptBuilder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def fallback_results():
+    """Results returned when a Gemini response cannot be parsed."""
+    return {
+        "overall_score": 0,
+        "skills_score": 0,
+        "skills_details": {"matched": [], "missing": []},
+        "experience_score": 0,
+        "experience_details": ["Error analyzing experience"],
+        "education_score": 0,
+        "education_details": ["Error analyzing education"],
+        "keywords_score": 0,
+        "keywords_details": {"matched": [], "missing": []},
+        "suggestions": ["Error generating suggestions"]
+    }
+
+# Fields every result has, filled with a default when the model leaves one out
+REQUIRED_FIELDS = [
+    "overall_score", "skills_score", "skills_details",
+    "experience_score", "experience_details", "education_score",
+    "education_details", "keywords_score", "keywords_details", "suggestions"
+]
+
+def default_value(field):
+    """Value of a required field the model left out."""
+    return 0 if "score" in field else [] if field == "suggestions" or "details" in field else {}
+
 class GeminiAnalyzer:
     """
     A class to analyze resumes against job descriptions using the Gemini API.
     """
     
-    def __init__(self, api_key=None):
-        """Initialize the GeminiAnalyzer with API key."""
+    def __init__(self, api_key=None, extract_sections=None):
+        """
+        Initialize the GeminiAnalyzer with API key.
+        
+        Args:
+            api_key (str): Gemini API key, GEMINI_API_KEY by default
+            extract_sections (callable): Section splitter used to decide what to keep
+                of documents over the prompt budget, e.g. ResumeAnalyzer.extract_sections
+        """
         # Load environment variables
         load_dotenv()
         
@@ -27,6 +68,48 @@ class GeminiAnalyzer:
             raise ValueError("GEMINI_API_KEY is required. Please check your .env file.")
         
         self.api_url = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent")
+        self.stream_url = os.getenv(
+            "GEMINI_STREAM_API_URL",
+            self.api_url.replace(':generateContent', ':streamGenerateContent') + '?alt=sse'
+        )
+        
+        # Pooled keep-alive connections, timeouts, retries and circuit breaking
+        self.client = GeminiClient(
+            self.api_url,
+            self.api_key,
+            connect_timeout=float(os.getenv("GEMINI_CONNECT_TIMEOUT", 3.05)),
+            read_timeout=float(os.getenv("GEMINI_READ_TIMEOUT", 60)),
+            max_retries=int(os.getenv("GEMINI_MAX_RETRIES", 3)),
+            backoff_max=float(os.getenv("GEMINI_BACKOFF_MAX", 8)),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("GEMINI_BREAKER_THRESHOLD", 5)),
+                reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", 30))
+            )
+        )
+        
+        # Identical concurrent requests share one upstream call: 'process' coalesces
+        # threads of this worker, 'host' also coordinates workers through lock files
+        single_flight = os.getenv("GEMINI_SINGLE_FLIGHT", "process").lower()
+        self.single_flight = SingleFlight() if single_flight in ('process', 'host') else None
+        self.host_single_flight = None
+        if single_flight == 'host':
+            self.host_single_flight = HostSingleFlight(
+                os.getenv("GEMINI_SINGLE_FLIGHT_DIR", os.path.join(tempfile.gettempdir(), 'resumepro-single-flight'))
+            )
+        
+        self.prompt_builder = PromptBuilder(
+            extract_sections,
+            token_budget=int(os.getenv("GEMINI_PROMPT_TOKEN_BUDGET", 4000))
+        )
+    
+    def available(self):
+        """
+        Check whether the Gemini API is worth calling right now.
+        
+        Returns:
+            bool: False while the circuit breaker is open after repeated failures
+        """
+        return self.client.available()
     
     def analyze(self, resume_text, job_description):
         """
@@ -44,20 +127,92 @@ class GeminiAnalyzer:
                 raise ValueError("Gemini API key not provided")
             
             # Prepare prompt for Gemini
-            prompt = self._prepare_prompt(resume_text, job_description)
+            with metrics.stage('gemini_prompt'):
+                prompt = self._prepare_prompt(resume_text, job_description)
             
-            # Call Gemini API
-            response = self._call_gemini_api(prompt)
+            # Call Gemini API, sharing the call with identical requests in flight
+            if self.single_flight is None:
+                return self._request(prompt)
             
-            # Parse and format response
-            results = self._parse_response(response)
+            key = hashlib.sha256(f"{self.api_url}\n{prompt}".encode('utf-8')).hexdigest()
+            request = lambda: self._request(prompt)
+            if self.host_single_flight is not None:
+                request = lambda: self.host_single_flight.do(key, lambda: self._request(prompt))
             
-            return results
+            # Every caller gets its own copy of a shared result
+            return copy.deepcopy(self.single_flight.do(key, request))
             
         except Exception as e:
             logger.error(f"Error during Gemini analysis: {str(e)}", exc_info=True)
             raise
     
+    def analyze_stream(self, resume_text, job_description):
+        """
+        Analyze resume against job description using the streaming Gemini API,
+        yielding each top-level result field as soon as the model has written
+        it. Output cut off by a broken stream or the token limit keeps the
+        fields completed so far; missing fields follow with defaults at the end.
+        Streamed calls are not shared with identical requests in flight.
+        
+        Args:
+            resume_text (str): Resume text
+            job_description (str): Job description text
+            
+        Yields:
+            tuple: (field, value)
+            
+        Raises:
+            GeminiError: If the call fails before any field arrives
+        """
+        with metrics.stage('gemini_prompt'):
+            prompt = self._prepare_prompt(resume_text, job_description)
+        
+        parser = IncrementalObjectParser()
+        start = time.perf_counter()
+        try:
+            for event in self.client.stream(self._payload(prompt), self.stream_url):
+                for candidate in event.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        for field in parser.feed(part.get("text", "")):
+                            if metrics.enabled and len(parser.fields) == 1:
+                                metrics.observe('gemini_first_field', time.perf_counter() - start)
+                            yield field
+                    if candidate.get("finishReason") not in (None, "STOP"):
+                        logger.warning(f"Gemini response ended early: {candidate['finishReason']}")
+        except GeminiError as e:
+            if not parser.fields:
+                raise
+            logger.warning(f"Keeping {len(parser.fields)} fields of an interrupted Gemini stream: {str(e)}")
+        
+        for field in parser.finish():
+            logger.warning(f"Recovered truncated field from Gemini response: {field[0]}")
+            yield field
+        if metrics.enabled:
+            metrics.observe('gemini_http', time.perf_counter() - start)
+        
+        if not parser.fields:
+            raise GeminiError("No JSON found in Gemini response")
+        for field in REQUIRED_FIELDS:
+            if field not in parser.fields:
+                yield field, default_value(field)
+    
+    def _request(self, prompt):
+        """
+        Call the Gemini API and parse its response.
+        
+        Args:
+            prompt (str): Prepared prompt
+            
+        Returns:
+            dict: Analysis results
+        """
+        with metrics.stage('gemini_http'):
+            response = self._call_gemini_api(prompt)
+        
+        # Parse and format response
+        with metrics.stage('gemini_parse'):
+            return self._parse_response(response)
+    
     def _prepare_prompt(self, resume_text, job_description):
         """
         Prepare prompt for Gemini API.
@@ -69,52 +224,8 @@ class GeminiAnalyzer:
         Returns:
             str: Formatted prompt
         """
-        # Limit text length to avoid token limits
-        max_length = 10000
-        resume_text = resume_text[:max_length] if len(resume_text) > max_length else resume_text
-        job_description = job_description[:max_length] if len(job_description) > max_length else job_description
-        
-        prompt = f"""
-        You are an AI Resume Analyzer. Analyze the resume against the job description provided below.
-        
-        Resume:
-        {resume_text}
-        
-        Job Description:
-        {job_description}
-        
-        Provide a detailed analysis with the following:
-        1. Overall match score (percentage)
-        2. Skills match (percentage and details)
-        3. Experience match (percentage and details)
-        4. Education match (percentage and details)
-        5. Keywords match (percentage, matched keywords, and missing keywords)
-        6. Improvement suggestions
-        
-        Format your response as a JSON object with the following structure:
-        {{
-            "overall_score": <percentage>,
-            "skills_score": <percentage>,
-            "skills_details": {{
-                "matched": [<list of matched skills>],
-                "missing": [<list of missing skills>]
-            }},
-            "experience_score": <percentage>,
-            "experience_details": [<list of experience match details>],
-            "education_score": <percentage>,
-            "education_details": [<list of education match details>],
-            "keywords_score": <percentage>,
-            "keywords_details": {{
-                "matched": [<list of matched keywords>],
-                "missing": [<list of missing keywords>]
-            }},
-            "suggestions": [<list of improvement suggestions>]
-        }}
-        
-        Ensure all scores are integers between 0 and 100.
-        """
-        
-        return prompt
+        # Keep the most relevant content within the token budget
+        return self.prompt_builder.build(resume_text, job_description)
     
     def _call_gemini_api(self, prompt):
         """
@@ -126,11 +237,10 @@ class GeminiAnalyzer:
         Returns:
             dict: API response
         """
-        headers = {
-            'Content-Type': 'application/json',
-            'X-goog-api-key': self.api_key
-        }
-        
+        return self.client.generate(self._payload(prompt))
+    
+    def _payload(self, prompt):
+        """Serialize the request body for a prompt."""
         data = {
             "contents": [
                 {
@@ -143,16 +253,7 @@ class GeminiAnalyzer:
             ]
         }
         
-        response = requests.post(
-            self.api_url,
-            headers=headers,
-            data=json.dumps(data)
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Gemini API error: {response.status_code} - {response.text}")
-        
-        return response.json()
+        return json.dumps(data)
     
     def _parse_response(self, response):
         """
@@ -181,15 +282,9 @@ class GeminiAnalyzer:
             results = json.loads(json_str)
             
             # Ensure all required fields are present
-            required_fields = [
-                "overall_score", "skills_score", "skills_details",
-                "experience_score", "experience_details", "education_score",
-                "education_details", "keywords_score", "keywords_details", "suggestions"
-            ]
-            
-            for field in required_fields:
+            for field in REQUIRED_FIELDS:
                 if field not in results:
-                    results[field] = 0 if "score" in field else [] if field == "suggestions" or "details" in field else {}
+                    results[field] = default_value(field)
             
             return results
             
@@ -197,15 +292,4 @@ class GeminiAnalyzer:
             logger.error(f"Error parsing Gemini response: {str(e)}", exc_info=True)
             
             # Return fallback results
-            return {
-                "overall_score": 0,
-                "skills_score": 0,
-                "skills_details": {"matched": [], "missing": []},
-                "experience_score": 0,
-                "experience_details": ["Error analyzing experience"],
-                "education_score": 0,
-                "education_details": ["Error analyzing education"],
-                "keywords_score": 0,
-                "keywords_details": {"matched": [], "missing": []},
-                "suggestions": ["Error generating suggestions"]
-            }
+            return fallback_results()
@@ -0,0 +1,315 @@
+import json
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    """Raised when the Gemini API does not return a usable response."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpen(GeminiError):
+    """Raised without calling the API while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling an unhealthy upstream. After failure_threshold consecutive
+    failures the circuit opens and calls fail immediately; after reset_timeout
+    seconds one trial call is let through (half-open), and its outcome closes
+    or reopens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Initialize the CircuitBreaker, closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds to stay open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        """str: 'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def available(self):
+        """
+        Check whether a call would be let through, without claiming it.
+
+        Returns:
+            bool: False while open, or while half-open with a trial call running
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            return state == 'closed' or (state == 'half_open' and not self._trial_running)
+
+    def allow(self):
+        """
+        Claim permission for one call.
+
+        Returns:
+            bool: Whether the call is the half-open trial call, which must end
+                with record_success(), record_failure() or release()
+
+        Raises:
+            CircuitOpen: If the circuit is open
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == 'closed':
+                return False
+            if state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+        raise CircuitOpen("Gemini API circuit is open after repeated failures")
+
+    def record_success(self):
+        """Close the circuit."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Gemini API recovered; closing circuit")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or if a trial call failed."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    logger.warning(f"Opening Gemini API circuit for {self.reset_timeout}s "
+                                   f"after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+    def release(self):
+        """End a call that neither succeeded nor failed, e.g. a client error."""
+        with self._lock:
+            self._trial_running = False
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (str): Delay in seconds, or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class GeminiClient:
+    """
+    HTTP client for the Gemini API. It keeps connections alive in a pooled
+    session, applies connect and read timeouts, retries rate limiting and
+    transient errors with exponential backoff and full jitter (waiting at
+    least as long as Retry-After asks), and fails fast through a circuit
+    breaker while the API is unhealthy.
+    """
+
+    def __init__(self, api_url, api_key, connect_timeout=3.05, read_timeout=60, max_retries=3,
+                 backoff_base=0.5, backoff_max=8, max_elapsed=90, pool_size=10, breaker=None):
+        """
+        Initialize the GeminiClient.
+
+        Args:
+            api_url (str): generateContent endpoint
+            api_key (str): API key
+            connect_timeout (float): Seconds to wait for a connection
+            read_timeout (float): Seconds to wait for response data
+            max_retries (int): Retries after the first attempt
+            backoff_base (float): Backoff ceiling before the first retry, doubled for each retry
+            backoff_max (float): Maximum backoff ceiling; a longer Retry-After is not waited for
+            max_elapsed (float): Do not start a retry that would end more than this many
+                seconds after the first attempt
+            pool_size (int): Keep-alive connections kept open
+            breaker (CircuitBreaker): Circuit breaker, a default one if None
+        """
+        self.api_url = api_url
+        self.api_key = api_key
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_elapsed = max_elapsed
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Content-Type': 'application/json',
+            'X-goog-api-key': api_key
+        })
+
+    def available(self):
+        """
+        Check whether the circuit breaker would let a call through.
+
+        Returns:
+            bool: Whether calling now is worthwhile
+        """
+        return self.breaker.available()
+
+    def _backoff(self, attempt, retry_after):
+        """Seconds to wait before a retry: full jitter, but never less than Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def post(self, payload, url=None, **kwargs):
+        """
+        POST a JSON payload with timeouts, retries and circuit breaking.
+
+        Args:
+            payload (str): Serialized JSON request body
+            url (str): Endpoint, api_url by default
+            **kwargs: Extra arguments for requests, e.g. stream=True
+
+        Returns:
+            requests.Response: A 200 response
+
+        Raises:
+            CircuitOpen: If the circuit is open; no request is made
+            GeminiError: If the API fails or keeps failing after all retries
+        """
+        url = url or self.api_url
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            trial = self.breaker.allow()
+            settled = False
+            retry_after = None
+            try:
+                try:
+                    response = self.session.post(url, data=payload, timeout=self.timeout, **kwargs)
+                except requests.RequestException as e:
+                    self.breaker.record_failure()
+                    settled = True
+                    error = GeminiError(f"Gemini API request failed: {str(e)}")
+                else:
+                    if response.status_code == 200:
+                        self.breaker.record_success()
+                        settled = True
+                        return response
+                    error = GeminiError(f"Gemini API error: {response.status_code} - {response.text}",
+                                        status_code=response.status_code)
+                    if response.status_code not in RETRYABLE_STATUS:
+                        # A bad request says nothing about the API's health
+                        raise error
+                    self.breaker.record_failure()
+                    settled = True
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    response.close()
+            finally:
+                # A trial call that ended any other way must not keep the circuit open for good
+                if trial and not settled:
+                    self.breaker.release()
+
+            if attempt >= self.max_retries:
+                raise error
+            if retry_after is not None and retry_after > self.backoff_max:
+                logger.warning(f"Gemini API asked to retry after {retry_after:.0f}s; not retrying")
+                raise error
+            delay = self._backoff(attempt, retry_after)
+            if time.monotonic() - start + delay > self.max_elapsed:
+                raise error
+            attempt += 1
+            logger.warning(f"{str(error)[:200]}; retry {attempt}/{self.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def generate(self, payload):
+        """
+        Call generateContent.
+
+        Args:
+            payload (str): Serialized JSON request body
+
+        Returns:
+            dict: Decoded API response
+
+        Raises:
+            GeminiError: If the request fails or the response is not JSON
+        """
+        response = self.post(payload)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise GeminiError(f"Gemini API returned invalid JSON: {str(e)}")
+
+    def stream(self, payload, url):
+        """
+        Call a streaming endpoint that answers with Server-Sent Events
+        (streamGenerateContent with alt=sse). Retries only happen before the
+        first event; the read timeout applies between chunks.
+
+        Args:
+            payload (str): Serialized JSON request body
+            url (str): Streaming endpoint
+
+        Yields:
+            dict: Decoded data of each event
+
+        Raises:
+            GeminiError: If the request fails or the stream breaks off
+        """
+        response = self.post(payload, url=url, stream=True)
+        try:
+            for line in response.iter_lines():
+                if line.startswith(b'data:'):
+                    yield json.loads(line[5:].decode('utf-8'))
+        except (requests.RequestException, ValueError) as e:
+            raise GeminiError(f"Gemini API stream failed: {str(e)}")
+        finally:
+            response.close()
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
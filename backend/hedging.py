@@ -0,0 +1,93 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class Hedger:
+    """
+    Bounds the latency of a slow, preferred call by hedging it with a fast
+    fallback. The preferred call runs on a background thread while the
+    fallback runs on the caller's thread; the preferred result is used if it
+    is ready and acceptable by the deadline, the fallback otherwise. A call
+    that finishes after its deadline can still hand its result to a callback,
+    e.g. to cache it for the next identical request.
+    """
+
+    def __init__(self, max_workers=16):
+        """
+        Initialize the Hedger.
+
+        Args:
+            max_workers (int): Preferred calls running at once; more wait for a thread
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hedge')
+
+    def run(self, preferred, fallback, budget, acceptable=None, on_late_result=None):
+        """
+        Run both calls and return within the budget, plus however long the fallback takes.
+
+        Args:
+            preferred (callable): Slow call whose result is preferred
+            fallback (callable): Fast call used if the preferred one is late, fails or
+                returns an unacceptable result
+            budget (float): Seconds to wait for the preferred call
+            acceptable (callable): Predicate a preferred result must pass, any result if None
+            on_late_result (callable): Called with an acceptable preferred result that
+                arrives after the deadline
+
+        Returns:
+            tuple: (result, whether it came from the preferred call)
+
+        Raises:
+            Exception: The fallback's exception, if it failed and the preferred call did not succeed
+        """
+        deadline = time.monotonic() + budget
+        future = self.executor.submit(preferred)
+
+        fallback_error = None
+        try:
+            fallback_result = fallback()
+        except Exception as e:
+            fallback_result, fallback_error = None, e
+
+        try:
+            result = future.result(timeout=max(deadline - time.monotonic(), 0))
+            if acceptable is None or acceptable(result):
+                return result, True
+            logger.warning("Preferred call returned an unacceptable result, using the fallback")
+        except FutureTimeout:
+            # Do not start a call nobody is waiting for any more
+            if not future.cancel():
+                logger.warning(f"Preferred call missed its {budget:.2f}s deadline, using the fallback")
+                if on_late_result is not None:
+                    future.add_done_callback(lambda late: self._late(late, acceptable, on_late_result))
+            else:
+                logger.warning(f"Preferred call did not start within its {budget:.2f}s deadline")
+        except Exception as e:
+            logger.error(f"Preferred call failed: {str(e)}, using the fallback")
+
+        if fallback_error is not None:
+            raise fallback_error
+        return fallback_result, False
+
+    @staticmethod
+    def _late(future, acceptable, on_late_result):
+        """Hand an acceptable late result to its callback."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if acceptable is not None and not acceptable(result):
+            return
+        try:
+            on_late_result(result)
+        except Exception as e:
+            logger.error(f"Error handling a late result: {str(e)}", exc_info=True)
+
+    def shutdown(self):
+        """Stop the background threads after the calls in progress."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
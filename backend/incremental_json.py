@@ -0,0 +1,154 @@
+import json
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class IncrementalObjectParser:
+    """
+    Parses a JSON object that arrives in chunks, such as a streamed model
+    response, and reports each top-level member as soon as its value is
+    complete. Text before the opening brace (e.g. a ```json fence) and after
+    the closing one is ignored. If the stream ends early, finish() salvages
+    what it can of the member that was cut off.
+    """
+
+    def __init__(self):
+        """Initialize the IncrementalObjectParser."""
+        self.fields = {}
+        self.done = False
+        self._started = False
+        self._member = []      # Characters of the current top-level member
+        self._stack = []       # Open brackets inside the current member
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """
+        Parse the next chunk of text.
+
+        Args:
+            chunk (str): Next part of the response
+
+        Returns:
+            list: (key, value) pairs of the top-level members completed by this chunk
+        """
+        completed = []
+        member = self._member
+        stack = self._stack
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._started:
+                self._started = ch == '{'
+                continue
+
+            if self._in_string:
+                member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                stack.append(ch)
+            elif stack and ch == _CLOSERS[stack[-1]]:
+                stack.pop()
+            elif not stack and ch in ',}':
+                # End of a top-level member
+                self._complete(''.join(member), completed)
+                member.clear()
+                self.done = ch == '}'
+                continue
+            member.append(ch)
+        return completed
+
+    def _complete(self, text, completed):
+        """Decode one 'key: value' member and record it."""
+        if not text.strip():
+            return
+        try:
+            pair = json.loads('{' + text + '}')
+        except ValueError:
+            return
+        for key, value in pair.items():
+            self.fields[key] = value
+            completed.append((key, value))
+
+    def finish(self):
+        """
+        Signal the end of the input, salvaging a list or object member cut off
+        by truncation: its unfinished last item is dropped and whatever is
+        still open is closed, so a partial list keeps its complete items.
+
+        Returns:
+            list: (key, value) pairs recovered from the truncated tail
+        """
+        completed = []
+        text = ''.join(self._member)
+        stack = list(self._stack)
+        in_string = self._in_string
+        self._member.clear()
+        self._stack.clear()
+        self._in_string = False
+        if self.done or not stack:
+            # A cut-off scalar, such as a score, cannot be told from a complete one
+            self.done = True
+            return completed
+        self.done = True
+
+        if in_string:
+            # Drop the cut-off string, opening quote included
+            text = text[:text.rfind('"')]
+        elif text.rstrip()[-1:] not in '"]},[{':
+            # Likewise a cut-off number or literal at the end of a list
+            text = text[:max(text.rfind(','), text.rfind('['), text.rfind('{')) + 1]
+            stack = self._open_brackets(text)
+
+        # Drop a trailing partial item or dangling separator, then close what is open
+        while text:
+            candidate = text.rstrip().rstrip(',:').rstrip()
+            closed = candidate + ''.join(_CLOSERS[opener] for opener in reversed(stack))
+            try:
+                pair = json.loads('{' + closed + '}')
+            except ValueError:
+                cut = max(candidate.rfind(','), candidate.rfind('['), candidate.rfind('{'))
+                if cut < 0:
+                    break
+                # Keep an opening bracket, drop everything after the last complete item
+                if candidate[cut] in '[{' and cut + 1 < len(candidate):
+                    text = candidate[:cut + 1]
+                else:
+                    text = candidate[:cut]
+                stack = self._open_brackets(text)
+                continue
+            for key, value in pair.items():
+                self.fields[key] = value
+                completed.append((key, value))
+            break
+        return completed
+
+    @staticmethod
+    def _open_brackets(text):
+        """Brackets left open at the end of a member's text."""
+        stack = []
+        in_string = escape = False
+        for ch in text:
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == '\\':
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in _CLOSERS:
+                stack.append(ch)
+            elif stack and ch == _CLOSERS[stack[-1]]:
+                stack.pop()
+        return stack
@@ -0,0 +1,206 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from document import ParsedDocument
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_descriptions (
+    job_id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_descriptions_expires ON job_descriptions (expires_at);
+"""
+
+# Lookups extend a registration at most this often, so reads rarely write
+_TOUCH_INTERVAL = 3600
+
+
+def job_id_for(text):
+    """
+    Compute the content-hash id of a job description.
+
+    Args:
+        text (str): Job description text
+
+    Returns:
+        str: Job id
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:24]
+
+
+class JobProfile(ParsedDocument):
+    """
+    A job description compiled once so it can be scored against many resumes.
+    """
+
+    def __init__(self, text, analyzer):
+        """
+        Initialize the JobProfile.
+
+        Args:
+            text (str): Job description text
+            analyzer (ResumeAnalyzer): Analyzer providing section extraction and preprocessing
+        """
+        super().__init__(text, analyzer)
+        self.job_id = job_id_for(text)
+
+    def compile(self):
+        """
+        Precompute everything the analysis reads from the job side.
+
+        Returns:
+            JobProfile: This profile
+        """
+        for section, n in (('skills', 50), ('experience', 50), (None, 100)):
+            self.keyword_ids(n=n, section=section)
+
+        # Skill and pattern results are cached on first access
+        getattr(self, 'skills')
+        for attribute in ('degree', 'years', 'field', 'requirements'):
+            getattr(self.scan, attribute)
+        return self
+
+    @property
+    def required_degree(self):
+        """str: Highest degree mentioned in the job description, or None."""
+        return self.scan.degree
+
+    @property
+    def required_years(self):
+        """int: Required years of experience, or 0."""
+        return self.scan.years or 0
+
+    @property
+    def required_field(self):
+        """str: Required field of study, or None."""
+        field = self.scan.field
+        return field.strip().lower() if field is not None else None
+
+
+class JobProfileCache:
+    """
+    A bounded, thread-safe LRU cache of compiled job profiles keyed by job id.
+    """
+
+    def __init__(self, maxsize=1000):
+        """
+        Initialize the JobProfileCache.
+
+        Args:
+            maxsize (int): Maximum number of cached profiles
+        """
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        """
+        Look up a profile.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            JobProfile: The cached profile, or None
+        """
+        with self._lock:
+            profile = self._profiles.get(job_id)
+            if profile is not None:
+                self._profiles.move_to_end(job_id)
+            return profile
+
+    def put(self, profile):
+        """
+        Store a profile, evicting the least recently used one if full.
+
+        Args:
+            profile (JobProfile): The profile to store
+
+        Returns:
+            JobProfile: The cached profile for this job id
+        """
+        with self._lock:
+            existing = self._profiles.get(profile.job_id)
+            if existing is not None and existing.text == profile.text:
+                self._profiles.move_to_end(profile.job_id)
+                return existing
+            self._profiles[profile.job_id] = profile
+            if len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+            return profile
+
+    def __len__(self):
+        return len(self._profiles)
+
+
+class JobStore:
+    """
+    Registered job descriptions in SQLite, keyed by content-hash job id and
+    shared by every worker on the host. Only the text is stored: any worker
+    compiles the profile from it on first use, so a job id stays valid across
+    workers, cache evictions and restarts until it goes unused for the TTL.
+    """
+
+    def __init__(self, path, ttl=30 * 86400):
+        """
+        Initialize the JobStore.
+
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float): Seconds a registration stays valid after its last use
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def put(self, job_id, text):
+        """
+        Register a job description, or extend an existing registration.
+
+        Args:
+            job_id (str): Job id from job_id_for()
+            text (str): Job description text
+        """
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute('INSERT INTO job_descriptions (job_id, text, expires_at) VALUES (?, ?, ?) '
+                         'ON CONFLICT (job_id) DO UPDATE SET text = excluded.text, expires_at = excluded.expires_at',
+                         (job_id, text, now + self.ttl))
+            conn.execute('DELETE FROM job_descriptions WHERE expires_at <= ?', (now,))
+
+    def get(self, job_id):
+        """
+        Look up a registered job description.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            str: Job description text, or None if unknown or expired
+        """
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute('SELECT text, expires_at FROM job_descriptions WHERE job_id = ?', (job_id,)).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        text, expires_at = row
+        if now + self.ttl - expires_at > _TOUCH_INTERVAL:
+            with conn:
+                conn.execute('UPDATE job_descriptions SET expires_at = ? WHERE job_id = ?', (now + self.ttl, job_id))
+        return text
@@ -0,0 +1,293 @@
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    run_after REAL NOT NULL,
+    lease_expires REAL,
+    deadline REAL NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires_at);
+"""
+
+# Job states; queued and running jobs are pending, done and failed are final
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+# Fail overdue jobs and delete expired ones at most this often
+_PRUNE_INTERVAL = 60
+
+
+class JobQueue:
+    """
+    A durable job queue in SQLite, run by background executor threads. Every
+    worker process on the host may open the same database: jobs are claimed
+    atomically, and a claim is a lease, so a job whose executor died with its
+    process is run again by any worker once the lease runs out. Failed runs
+    are retried with exponential backoff; jobs not finished by their deadline
+    fail as expired, and finished jobs are deleted after the result TTL. Both
+    happen in a periodic cleanup, so an idle executor's poll is a single read.
+    """
+
+    def __init__(self, path, handler, executors=4, max_attempts=3, retry_delay=5,
+                 lease_timeout=300, queue_timeout=600, result_ttl=3600, poll_interval=0.5):
+        """
+        Initialize the JobQueue.
+
+        Args:
+            path (str): Path of the SQLite database file
+            handler (callable): Function running one job, mapping its payload to a
+                JSON-serializable result
+            executors (int): Executor threads started by start()
+            max_attempts (int): Runs of a job before it fails
+            retry_delay (float): Seconds before the first retry, doubled for each retry
+            lease_timeout (float): Seconds a run may take before the job is given to
+                another executor
+            queue_timeout (float): Seconds after submission a job must be finished by
+            result_ttl (float): Seconds a finished job stays available
+            poll_interval (float): Seconds between checks for jobs submitted by other processes
+        """
+        self.path = path
+        self.handler = handler
+        self.executors = executors
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_timeout = lease_timeout
+        self.queue_timeout = queue_timeout
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._pruned_at = 0
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode, so claims can take the write lock with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def submit(self, payload):
+        """
+        Queue a job.
+
+        Args:
+            payload (dict): JSON-serializable input for the handler
+
+        Returns:
+            str: Job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        deadline = now + self.queue_timeout
+        self._connection().execute(
+            'INSERT INTO jobs (id, status, payload, created_at, updated_at, run_after, deadline, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job_id, QUEUED, json.dumps(payload), now, now, now, deadline, deadline + self.result_ttl))
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id):
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): Job id from submit()
+
+        Returns:
+            dict: id, status, attempts, created_at and updated_at, plus the result
+                when done or the error when failed; None if unknown or expired
+        """
+        row = self._connection().execute(
+            'SELECT status, result, error, attempts, created_at, updated_at, expires_at FROM jobs WHERE id = ?',
+            (job_id,)).fetchone()
+        if row is None or row[6] <= time.time():
+            return None
+        status, result, error, attempts, created_at, updated_at, _ = row
+        job = {
+            'id': job_id,
+            'status': status,
+            'attempts': attempts,
+            'created_at': created_at,
+            'updated_at': updated_at
+        }
+        if status == DONE:
+            job['result'] = json.loads(result)
+        elif status == FAILED:
+            job['error'] = error
+        return job
+
+    def _claim(self):
+        """
+        Take the oldest runnable job: a queued one that is due, or a running one
+        whose lease ran out, in both cases with attempts and time left. Jobs past
+        their deadline or out of attempts are left for _prune() to fail.
+
+        Returns:
+            tuple: (job id, payload, attempt), or None if there is nothing to run
+        """
+        conn = self._connection()
+        now = time.time()
+        runnable = ('FROM jobs WHERE deadline > ? AND ((status = ? AND run_after <= ?) '
+                    'OR (status = ? AND lease_expires <= ? AND attempts < ?))')
+        params = (now, QUEUED, now, RUNNING, now, self.max_attempts)
+        # Idle executors poll often; only take the write lock when there is work
+        if conn.execute(f'SELECT 1 {runnable} LIMIT 1', params).fetchone() is None:
+            return None
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(f'SELECT id, payload, attempts {runnable} ORDER BY created_at LIMIT 1',
+                               params).fetchone()
+            if row is not None:
+                conn.execute('UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ?, '
+                             'lease_expires = ? WHERE id = ?', (RUNNING, now, now + self.lease_timeout, row[0]))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if row is None:
+            return None
+        job_id, payload, attempts = row
+        if attempts:
+            logger.info(f"Running job {job_id}, attempt {attempts + 1}/{self.max_attempts}")
+        return job_id, json.loads(payload), attempts + 1
+
+    def _finish(self, job_id, attempt, result=None, error=None):
+        """
+        Record the outcome of a run, queueing a retry if attempts remain. A run
+        that outlived its lease, so that the job was claimed again, records nothing.
+        """
+        now = time.time()
+        conn = self._connection()
+        if error is None:
+            conn.execute('UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ?, '
+                         'lease_expires = NULL, expires_at = ? WHERE id = ? AND attempts = ?',
+                         (DONE, json.dumps(result), now, now + self.result_ttl, job_id, attempt))
+        elif attempt < self.max_attempts:
+            delay = self.retry_delay * (2 ** (attempt - 1))
+            logger.warning(f"Job {job_id} failed (attempt {attempt}/{self.max_attempts}), "
+                           f"retrying in {delay:.0f}s: {error}")
+            conn.execute('UPDATE jobs SET status = ?, error = ?, updated_at = ?, run_after = ?, '
+                         'lease_expires = NULL WHERE id = ? AND attempts = ?',
+                         (QUEUED, error, now, now + delay, job_id, attempt))
+        else:
+            logger.error(f"Job {job_id} failed after {attempt} attempts: {error}")
+            conn.execute('UPDATE jobs SET status = ?, error = ?, updated_at = ?, lease_expires = NULL, '
+                         'expires_at = ? WHERE id = ? AND attempts = ?',
+                         (FAILED, error, now, now + self.result_ttl, job_id, attempt))
+
+    def _prune(self):
+        """Fail jobs past their deadline or out of attempts, and delete jobs whose results have expired."""
+        now = time.time()
+        if now - self._pruned_at < _PRUNE_INTERVAL:
+            return
+        self._pruned_at = now
+        conn = self._connection()
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = 'Job expired before it could finish', "
+            "updated_at = ?, expires_at = ? WHERE status IN (?, ?) AND deadline <= ? "
+            "AND (status = ? OR lease_expires <= ?)",
+            (FAILED, now, now + self.result_ttl, QUEUED, RUNNING, now, QUEUED, now))
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = 'Executor stopped while running the job', "
+            "updated_at = ?, expires_at = ? WHERE status = ? AND lease_expires <= ? AND attempts >= ?",
+            (FAILED, now, now + self.result_ttl, RUNNING, now, self.max_attempts))
+        deleted = conn.execute(
+            'DELETE FROM jobs WHERE expires_at <= ? AND status IN (?, ?)', (now, DONE, FAILED)).rowcount
+        if deleted:
+            logger.info(f"Deleted {deleted} expired jobs")
+
+    def run_once(self):
+        """
+        Claim and run one job.
+
+        Returns:
+            bool: Whether a job was run
+        """
+        claimed = self._claim()
+        if claimed is None:
+            return False
+        job_id, payload, attempt = claimed
+        try:
+            result = self.handler(payload)
+        except Exception as e:
+            logger.error(f"Error running job {job_id}: {str(e)}", exc_info=True)
+            self._finish(job_id, attempt, error=str(e) or type(e).__name__)
+        else:
+            self._finish(job_id, attempt, result=result)
+        return True
+
+    def _executor(self):
+        """Run jobs until stopped."""
+        while not self._stopping.is_set():
+            try:
+                if self.run_once():
+                    continue
+                self._prune()
+            except sqlite3.Error as e:
+                logger.warning(f"Job queue database error: {str(e)}")
+            with self._wakeup:
+                self._wakeup.wait(self.poll_interval)
+
+    def start(self):
+        """Start the executor threads."""
+        for index in range(self.executors):
+            thread = threading.Thread(target=self._executor, name=f'job-executor-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job queue started with {self.executors} executors")
+
+    def stop(self, timeout=None):
+        """
+        Stop the executor threads after their current jobs. Unfinished jobs stay
+        in the database and are picked up after a restart.
+
+        Args:
+            timeout (float): Seconds to wait for each thread, or None to wait indefinitely
+        """
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self):
+        """
+        Count jobs by status.
+
+        Returns:
+            dict: Number of jobs in each status
+        """
+        counts = dict.fromkeys((QUEUED, RUNNING, DONE, FAILED), 0)
+        for status, count in self._connection().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[status] = count
+        return counts
@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict
+
+
+class LemmaCache:
+    """
+    A bounded, thread-safe memoizing cache in front of a lemmatizer.
+    Least recently used entries are evicted once the cache is full.
+    """
+
+    def __init__(self, lemmatize, maxsize=50000):
+        """
+        Initialize the LemmaCache.
+
+        Args:
+            lemmatize (callable): Function mapping a token to its lemma
+            maxsize (int): Maximum number of cached tokens
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self._lemmatize = lemmatize
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lemmatize(self, token):
+        """
+        Get the lemma of a token, computing it on a cache miss.
+
+        Args:
+            token (str): The token to lemmatize
+
+        Returns:
+            str: The lemma
+        """
+        with self._lock:
+            lemma = self._cache.get(token)
+            if lemma is not None:
+                self._cache.move_to_end(token)
+                self.hits += 1
+                return lemma
+            self.misses += 1
+
+        # Compute outside the lock so a slow lookup does not block other threads
+        lemma = self._lemmatize(token)
+        self._store(token, lemma)
+        return lemma
+
+    def _store(self, token, lemma):
+        """Insert an entry, evicting the least recently used one if full."""
+        with self._lock:
+            self._cache[token] = lemma
+            self._cache.move_to_end(token)
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def preload(self, words):
+        """
+        Warm the cache from a frequency list, most frequent word first.
+        Only the first maxsize words are loaded; preloading does not count
+        towards hit and miss statistics.
+
+        Args:
+            words (iterable): Words, or a path to a file with one word per line
+                (any columns after the first, such as counts, are ignored)
+
+        Returns:
+            int: Number of words loaded
+        """
+        if isinstance(words, str):
+            with open(words, 'r', encoding='utf-8') as f:
+                words = [line.split()[0] for line in f if line.strip()]
+
+        # Tokens are lowercased before lemmatization, so cache the lowercase form
+        words = [word.lower() for word in words]
+        loaded = 0
+        # Insert least frequent first so the most frequent words are the last to be evicted
+        for word in reversed(words[:self.maxsize]):
+            self._store(word, self._lemmatize(word))
+            loaded += 1
+        return loaded
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hits, misses, hit ratio, current size and maximum size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._cache),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self):
+        return len(self._cache)
@@ -0,0 +1,11 @@
+"""
+Load tests of the upload→analyze flow against a local stand-in for the
+Gemini API, so capacity can be planned without spending quota.
+
+Run from the backend directory:
+
+    python -m loadtest.run --configs sync:4 gthread:4:8 --output load.json
+    python -m loadtest.run --configs gthread:2:8 --stub-latency lognormal:1500:0.8 --stub-rate-limit-rate 0.05
+    python -m loadtest.gemini_stub --port 8090
+    python -m loadtest.run --url http://127.0.0.1:5000
+"""
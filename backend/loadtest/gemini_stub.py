@@ -0,0 +1,253 @@
+import sys
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'machine learning',
+          'communication', 'leadership', 'go', 'terraform']
+
+
+def parse_latency(spec):
+    """
+    Parse a latency distribution.
+
+    Args:
+        spec (str): 'fixed:MS', 'uniform:LOW_MS:HIGH_MS', 'normal:MEAN_MS:STDDEV_MS' or
+            'lognormal:MEDIAN_MS:SIGMA'
+
+    Returns:
+        callable: Function taking a random.Random and returning a delay in seconds
+    """
+    kind, _, args = spec.partition(':')
+    try:
+        values = [float(value) for value in args.split(':')] if args else []
+        if kind == 'fixed' and len(values) == 1:
+            return lambda rng: values[0] / 1000
+        if kind == 'uniform' and len(values) == 2:
+            return lambda rng: rng.uniform(values[0], values[1]) / 1000
+        if kind == 'normal' and len(values) == 2:
+            return lambda rng: max(rng.gauss(values[0], values[1]), 0) / 1000
+        if kind == 'lognormal' and len(values) == 2:
+            return lambda rng: values[0] * rng.lognormvariate(0, values[1]) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+def analysis_result(prompt):
+    """
+    Build a plausible analysis result, the same for the same prompt.
+
+    Args:
+        prompt (str): Prompt text
+
+    Returns:
+        dict: Result in the structure GeminiAnalyzer asks for
+    """
+    rng = random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+    scores = {dimension: rng.randint(20, 95) for dimension in ('skills', 'experience', 'education', 'keywords')}
+    skills = rng.sample(SKILLS, 6)
+    return {
+        'overall_score': round(sum(scores.values()) / len(scores)),
+        'skills_score': scores['skills'],
+        'skills_details': {'matched': skills[:4], 'missing': skills[4:]},
+        'experience_score': scores['experience'],
+        'experience_details': ['Relevant experience with the listed technologies'],
+        'education_score': scores['education'],
+        'education_details': ['Degree matches the requirements'],
+        'keywords_score': scores['keywords'],
+        'keywords_details': {'matched': skills[:3], 'missing': skills[3:5]},
+        'suggestions': ['Quantify achievements', 'Add missing skills to the skills section']
+    }
+
+
+class StubConfig:
+    """Behaviour of the stand-in server; attributes may be changed while it runs."""
+
+    def __init__(self, latency='lognormal:800:0.5', rate_limit_rate=0.0, server_error_rate=0.0,
+                 malformed_rate=0.0, retry_after=None, chunk_size=40, seed=None):
+        """
+        Initialize the StubConfig.
+
+        Args:
+            latency (str): Latency distribution, see parse_latency()
+            rate_limit_rate (float): Share of requests answered with 429
+            server_error_rate (float): Share of requests answered with 500 or 503
+            malformed_rate (float): Share of requests answered with a malformed result
+            retry_after (float): Retry-After seconds sent with 429 and 503, or None
+            chunk_size (int): Characters per event of streamed responses
+            seed (int): Random seed, None for a random one
+        """
+        self.latency = parse_latency(latency)
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after = retry_after
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'server_error': 0, 'malformed': 0}
+
+    def draw(self):
+        """Pick the outcome and delay of one request."""
+        with self.lock:
+            delay = self.latency(self.rng)
+            roll = self.rng.random()
+            self.counts['requests'] += 1
+            for outcome, rate in (('rate_limited', self.rate_limit_rate),
+                                  ('server_error', self.server_error_rate),
+                                  ('malformed', self.malformed_rate)):
+                if roll < rate:
+                    break
+                roll -= rate
+            else:
+                outcome = 'ok'
+            self.counts[outcome] += 1
+            status = self.rng.choice([500, 503]) if outcome == 'server_error' else None
+        return outcome, delay, status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers generateContent and streamGenerateContent like the Gemini API."""
+
+    protocol_version = 'HTTP/1.1'
+    config = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            with self.config.lock:
+                self._send(200, json.dumps(self.config.counts))
+        else:
+            self._send(404, json.dumps({'error': {'code': 404, 'message': 'Not found'}}))
+
+    def do_POST(self):
+        config = self.config
+        streaming = ':streamGenerateContent' in self.path
+        if ':generateContent' not in self.path and not streaming:
+            self._send(404, json.dumps({'error': {'code': 404, 'message': 'Not found'}}))
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            prompt = body['contents'][0]['parts'][0]['text']
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send(400, json.dumps({'error': {'code': 400, 'message': 'Invalid request body'}}))
+            return
+
+        outcome, delay, status = config.draw()
+        headers = {'Retry-After': f"{config.retry_after:g}"} if config.retry_after is not None else {}
+        if outcome == 'rate_limited':
+            time.sleep(min(delay, 0.05))
+            self._send(429, json.dumps({'error': {'code': 429, 'message': 'Resource has been exhausted',
+                                                  'status': 'RESOURCE_EXHAUSTED'}}), headers=headers)
+            return
+        if outcome == 'server_error':
+            time.sleep(delay)
+            self._send(status, json.dumps({'error': {'code': status, 'message': 'Internal error'}}),
+                       headers=headers if status == 503 else None)
+            return
+
+        text = json.dumps(analysis_result(prompt), indent=2)
+        if outcome == 'malformed':
+            # Cut off mid-object, as a model hitting its token limit does
+            text = text[:len(text) // 2]
+        text = f"```json\n{text}\n```"
+
+        if not streaming:
+            time.sleep(delay)
+            self._send(200, json.dumps({
+                'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP'}]
+            }))
+            return
+
+        # Spread the latency over the streamed chunks
+        chunks = [text[i:i + config.chunk_size] for i in range(0, len(text), config.chunk_size)]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for index, chunk in enumerate(chunks):
+            time.sleep(delay / len(chunks))
+            candidate = {'content': {'parts': [{'text': chunk}], 'role': 'model'}}
+            if index == len(chunks) - 1:
+                candidate['finishReason'] = 'STOP'
+            self.wfile.write(f"data: {json.dumps({'candidates': [candidate]})}\r\n\r\n".encode('utf-8'))
+            self.wfile.flush()
+        self.close_connection = True
+
+
+def start_stub(config=None, host='127.0.0.1', port=0):
+    """
+    Start the stand-in server on a background thread.
+
+    Args:
+        config (StubConfig): Server behaviour, the defaults if None
+        host (str): Interface to listen on
+        port (int): Port, 0 for any free one
+
+    Returns:
+        tuple: (server, generateContent URL to use as GEMINI_API_URL)
+    """
+    handler = type('Handler', (_Handler,), {'config': config or StubConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='gemini-stub', daemon=True).start()
+    url = f"http://{host}:{server.server_port}/v1beta/models/stub:generateContent"
+    return server, url
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for the Gemini generateContent API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--latency', default='lognormal:800:0.5',
+                        help='fixed:MS, uniform:LOW:HIGH, normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA '
+                             '(milliseconds; default: lognormal:800:0.5)')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered with 429')
+    parser.add_argument('--server-error-rate', type=float, default=0.0,
+                        help='Share of requests answered with 500 or 503')
+    parser.add_argument('--malformed-rate', type=float, default=0.0,
+                        help='Share of requests answered with truncated JSON')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds sent with 429 and 503')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency, args.rate_limit_rate, args.server_error_rate, args.malformed_rate,
+                        args.retry_after, seed=args.seed)
+    server, url = start_stub(config, args.host, args.port)
+    logger.info(f"Gemini stand-in listening; set GEMINI_API_URL={url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        logger.info(f"Served {json.dumps(config.counts)}")
+    return 0
+
+
+if __name__ == '__main__':
+    # Usage: python -m loadtest.gemini_stub [--port 8090] [--latency lognormal:800:0.5] [--rate-limit-rate 0.05]
+    sys.exit(main())
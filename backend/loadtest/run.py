@@ -0,0 +1,305 @@
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from benchmarks.corpus import generate_resume, generate_job, to_docx, to_pdf
+from benchmarks.run import summarize
+from loadtest.gemini_stub import StubConfig, start_stub
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Distinct job descriptions cycled through alongside the resumes
+JOBS = 10
+
+
+def build_corpus(distinct, size='1page', file_format='txt', seed=0):
+    """
+    Build the documents the load is made of.
+
+    Args:
+        distinct (int): Distinct resumes; requests cycle through them, so fewer means more cache hits
+        size (str): Resume size, a key of benchmarks.corpus.SIZES
+        file_format (str): Upload format: txt, docx or pdf
+        seed (int): Corpus seed
+
+    Returns:
+        list: (filename, file bytes, job description) tuples
+    """
+    encode = {'txt': lambda text: text.encode('utf-8'), 'docx': to_docx, 'pdf': to_pdf}[file_format]
+    jobs = [generate_job(seed + index) for index in range(JOBS)]
+    return [(f"resume_{index}.{file_format}", encode(generate_resume(seed + index, size)), jobs[index % JOBS])
+            for index in range(distinct)]
+
+
+def upload_and_analyze(session, base_url, document, use_gemini, timeout=120):
+    """
+    Run one upload→analyze flow, as the frontend does.
+
+    Args:
+        session (requests.Session): HTTP session of this client
+        base_url (str): Base URL of the app
+        document (tuple): (filename, file bytes, job description)
+        use_gemini (bool): Whether to ask for a Gemini analysis
+
+    Returns:
+        dict: Seconds per step and in total, final status, analysis engine and cache outcome
+    """
+    filename, data, job_description = document
+    sample = {'status': None, 'engine': None, 'cache': None}
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url}/api/upload", files={'file': (filename, data)},
+                                 data={'job_description': job_description}, timeout=timeout)
+        sample['upload'] = time.perf_counter() - start
+        sample['status'] = response.status_code
+        if response.status_code != 200:
+            return sample
+        uploaded = response.json()
+
+        analyze_start = time.perf_counter()
+        response = session.post(f"{base_url}/api/analyze", json={
+            'resume_text': uploaded['resume_text'],
+            'job_description': uploaded['job_description'],
+            'use_gemini': use_gemini
+        }, timeout=timeout)
+        sample['analyze'] = time.perf_counter() - analyze_start
+        sample['status'] = response.status_code
+        sample['engine'] = response.headers.get('X-Analysis-Engine')
+        sample['cache'] = response.headers.get('X-Cache')
+    except requests.RequestException as e:
+        sample['status'] = type(e).__name__
+    finally:
+        sample['total'] = time.perf_counter() - start
+    return sample
+
+
+def run_load(base_url, corpus, concurrency=8, duration=30.0, max_requests=None, use_gemini=True, first=0):
+    """
+    Drive upload→analyze flows from concurrent clients.
+
+    Args:
+        base_url (str): Base URL of the app
+        corpus (list): Documents from build_corpus(), cycled through
+        concurrency (int): Clients sending flows back to back
+        duration (float): Seconds to run for
+        max_requests (int): Stop after this many flows, if set
+        use_gemini (bool): Whether to ask for Gemini analyses
+        first (int): Corpus index to start at
+
+    Returns:
+        dict: Throughput, latency percentiles per step, status counts, and fallback and cache hit rates
+    """
+    lock = threading.Lock()
+    samples = []
+    counter = iter(range(first, first + (max_requests or sys.maxsize)))
+    deadline = time.monotonic() + duration
+
+    def client():
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            sample = upload_and_analyze(session, base_url, corpus[index % len(corpus)], use_gemini)
+            with lock:
+                samples.append(sample)
+        session.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    ok = [sample for sample in samples if sample['status'] == 200 and 'analyze' in sample]
+    report = {
+        'flows': len(samples),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(ok) / elapsed, 3) if elapsed else 0.0,
+        'error_rate': round(1 - len(ok) / len(samples), 4) if samples else 0.0,
+        'status': dict(Counter(str(sample['status']) for sample in samples)),
+        'engines': dict(Counter(sample['engine'] for sample in ok if sample['engine'])),
+        'cache_hit_rate': round(sum(1 for sample in ok if (sample['cache'] or '').startswith('hit'))
+                                / len(ok), 4) if ok else 0.0
+    }
+    if use_gemini and ok:
+        # Gemini was asked for, but the rule-based analyzer answered
+        report['fallback_rate'] = round(sum(1 for sample in ok if sample['engine'] == 'rules') / len(ok), 4)
+    for step in ('total', 'upload', 'analyze'):
+        timings = [sample[step] for sample in ok]
+        if timings:
+            report[step] = summarize(timings)
+    return report
+
+
+def parse_worker_config(spec):
+    """
+    Parse a gunicorn worker configuration.
+
+    Args:
+        spec (str): 'CLASS:WORKERS' or 'CLASS:WORKERS:THREADS', e.g. sync:4 or gthread:2:8
+
+    Returns:
+        dict: worker_class, workers and threads
+    """
+    parts = spec.split(':')
+    if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts[1:]):
+        raise ValueError(f"Invalid worker configuration: {spec!r}")
+    return {
+        'worker_class': parts[0],
+        'workers': int(parts[1]),
+        'threads': int(parts[2]) if len(parts) == 3 else 1
+    }
+
+
+def _free_port():
+    """Pick a free local port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app(config, env, ready_timeout=180):
+    """
+    Start the app under gunicorn and wait until it is ready.
+
+    Args:
+        config (dict): Worker configuration from parse_worker_config()
+        env (dict): Environment of the app
+        ready_timeout (float): Seconds to wait for /api/ready
+
+    Returns:
+        tuple: (process, base URL)
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+         '--worker-class', config['worker_class'], '--workers', str(config['workers']),
+         '--threads', str(config['threads']), '--timeout', '120', 'app:app'],
+        cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + ready_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/api/ready", timeout=2).status_code == 200:
+                return process, base_url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    stop_app(process)
+    raise RuntimeError(f"App not ready after {ready_timeout}s")
+
+
+def stop_app(process):
+    """Stop gunicorn gracefully, then forcibly."""
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Load-test the upload→analyze flow.')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help='Base URL of a running app, e.g. http://127.0.0.1:5000')
+    target.add_argument('--configs', nargs='+',
+                        help='Gunicorn worker configurations to start and test in turn, e.g. sync:4 gthread:2:8')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds per run')
+    parser.add_argument('--requests', type=int, help='Flows per run, instead of running for the duration')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Seconds of untimed load before each run')
+    parser.add_argument('--distinct', type=int, default=1000,
+                        help='Distinct resumes; fewer means more result cache hits')
+    parser.add_argument('--size', default='1page', help='Resume size, e.g. 1page or 2page')
+    parser.add_argument('--format', default='txt', choices=['txt', 'docx', 'pdf'], help='Upload file format')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--rules-only', action='store_true', help='Ask for rule-based analyses only')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='Environment variable for the started app, repeatable')
+    parser.add_argument('--stub-latency', default='lognormal:800:0.5',
+                        help='Latency of the Gemini stand-in (see loadtest.gemini_stub)')
+    parser.add_argument('--stub-rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--stub-server-error-rate', type=float, default=0.0)
+    parser.add_argument('--stub-malformed-rate', type=float, default=0.0)
+    parser.add_argument('--stub-retry-after', type=float)
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(args.distinct, args.size, args.format, args.seed)
+    use_gemini = not args.rules_only
+    report = {'settings': {key: value for key, value in vars(args).items() if key != 'output'}, 'runs': []}
+
+    def measure(base_url, label):
+        # Warm-up flows use their own documents, so they do not turn measured ones into cache hits
+        first = 0
+        if args.warmup:
+            first = run_load(base_url, corpus, args.concurrency, args.warmup, use_gemini=use_gemini)['flows']
+        logger.info(f"Running {label}: {args.concurrency} clients")
+        duration = float('inf') if args.requests else args.duration
+        result = run_load(base_url, corpus, args.concurrency, duration, args.requests, use_gemini, first)
+        result['config'] = label
+        report['runs'].append(result)
+
+    if args.url:
+        measure(args.url.rstrip('/'), args.url)
+    else:
+        stub_config = StubConfig(args.stub_latency, args.stub_rate_limit_rate, args.stub_server_error_rate,
+                                 args.stub_malformed_rate, args.stub_retry_after, seed=args.seed)
+        stub, stub_url = start_stub(stub_config)
+        with tempfile.TemporaryDirectory(prefix='resumepro-loadtest-') as directory:
+            env = dict(os.environ, GEMINI_API_URL=stub_url,
+                       GEMINI_API_KEY=os.getenv('GEMINI_API_KEY') or 'loadtest',
+                       RESUME_INDEX_PATH=os.path.join(directory, 'resume_index.db'),
+                       JOB_QUEUE_PATH=os.path.join(directory, 'job_queue.db'),
+                       UPLOAD_FOLDER=os.path.join(directory, 'uploads'))
+            env.update(item.split('=', 1) for item in args.env)
+            for spec in args.configs:
+                config = parse_worker_config(spec)
+                process, base_url = start_app(config, env)
+                try:
+                    measure(base_url, spec)
+                finally:
+                    stop_app(process)
+        with stub_config.lock:
+            report['stub'] = dict(stub_config.counts)
+        stub.shutdown()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        logger.info(f"Results written to {args.output}")
+
+    print(f"{'config':<20} {'flows':>6} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7} {'fallback':>9}")
+    for run in report['runs']:
+        total = run.get('total', {})
+        print(f"{run['config']:<20} {run['flows']:>6} {run['throughput_rps']:>8.2f} "
+              f"{total.get('p50_ms', 0):>9.1f} {total.get('p90_ms', 0):>9.1f} {total.get('p99_ms', 0):>9.1f} "
+              f"{run['error_rate']:>7.2%} {run.get('fallback_rate', 0):>9.2%}")
+    return 0
+
+
+if __name__ == '__main__':
+    # Usage: python -m loadtest.run --configs sync:4 gthread:4:8 [--duration 60] [--output load.json]
+    sys.exit(main())
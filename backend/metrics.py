@@ -0,0 +1,241 @@
+import time
+import bisect
+import threading
+import contextlib
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond parsing steps
+# up to slow Gemini round trips
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Returned by stage() while metrics are disabled, so timing costs one attribute check
+_NOOP = contextlib.nullcontext()
+
+
+class Histogram:
+    """
+    A Prometheus-style cumulative histogram with one label.
+    """
+
+    def __init__(self, name, documentation, label, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the Histogram.
+
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            label (str): Name of the label that tells series apart
+            buckets (tuple): Sorted bucket upper bounds in seconds
+        """
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}   # Label value -> [count per bucket..., +Inf count, sum]
+
+    def observe(self, value, seconds):
+        """
+        Record one observation.
+
+        Args:
+            value (str): Label value
+            seconds (float): Observed duration
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(value)
+            if series is None:
+                series = self._series[value] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self):
+        """
+        Format the histogram in the Prometheus text exposition format.
+
+        Returns:
+            list: Lines of text
+        """
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {value: list(series) for value, series in self._series.items()}
+        for value in sorted(snapshot):
+            series = snapshot[value]
+            label = f'{self.label}="{_escape(value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += series[-2]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {series[-1]}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return lines
+
+
+def _escape(value):
+    """Escape a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _StageTimer:
+    """Context manager that times one stage and records it on exit."""
+
+    __slots__ = ('_metrics', '_stage', '_start')
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+class Metrics:
+    """
+    Per-stage timing for analysis and uploads. Every stage duration goes into
+    a histogram exposed in the Prometheus text format, and into the timings
+    of the request being served on the current thread, which become its
+    Server-Timing header. While disabled, stage() returns a shared no-op
+    context manager and nothing is recorded.
+    """
+
+    def __init__(self, prefix='resumepro', buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the Metrics, disabled.
+
+        Args:
+            prefix (str): Prefix for metric names
+            buckets (tuple): Histogram bucket upper bounds in seconds
+        """
+        self.enabled = False
+        self.stages = Histogram(f'{prefix}_stage_duration_seconds',
+                                'Time spent in each analysis and upload stage.', 'stage', buckets)
+        self.requests = Histogram(f'{prefix}_request_duration_seconds',
+                                  'Time spent serving each endpoint.', 'endpoint', buckets)
+        self._local = threading.local()
+
+    def enable(self, enabled=True):
+        """
+        Turn recording on or off.
+
+        Args:
+            enabled (bool): Whether to record
+        """
+        self.enabled = enabled
+
+    def stage(self, name):
+        """
+        Time a block of code as a named stage.
+
+        Args:
+            name (str): Stage name, e.g. 'analyzer_skills'
+
+        Returns:
+            A context manager
+        """
+        if not self.enabled:
+            return _NOOP
+        return _StageTimer(self, name)
+
+    def observe(self, name, seconds):
+        """
+        Record a stage duration measured elsewhere, e.g. in a worker process.
+
+        Args:
+            name (str): Stage name
+            seconds (float): Duration
+        """
+        self.stages.observe(name, seconds)
+        timings = getattr(self._local, 'timings', None)
+        if timings is not None:
+            timings.append((name, seconds))
+
+    @contextlib.contextmanager
+    def collect(self):
+        """
+        Collect the stage timings recorded on this thread, e.g. during one request.
+
+        Yields:
+            list: (stage, seconds) tuples, filled in as stages finish
+        """
+        previous = getattr(self._local, 'timings', None)
+        self._local.timings = timings = []
+        try:
+            yield timings
+        finally:
+            self._local.timings = previous
+
+    def bind(self, fn):
+        """
+        Wrap a function to run on another thread, such as an executor's, so the
+        stages it times are added to the timings collected on this thread.
+
+        Args:
+            fn (callable): Function to wrap
+
+        Returns:
+            callable: fn itself if nothing is being collected on this thread
+        """
+        timings = getattr(self._local, 'timings', None)
+        if timings is None:
+            return fn
+
+        def bound(*args, **kwargs):
+            previous = getattr(self._local, 'timings', None)
+            self._local.timings = timings
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.timings = previous
+        return bound
+
+    def start_request(self):
+        """Start collecting the timings of the request served on this thread."""
+        self._local.timings = []
+
+    def finish_request(self):
+        """
+        Stop collecting for the current request.
+
+        Returns:
+            list: The (stage, seconds) tuples recorded since start_request
+        """
+        timings = getattr(self._local, 'timings', None) or []
+        self._local.timings = None
+        return timings
+
+    def render(self):
+        """
+        Format every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page
+        """
+        return '\n'.join(self.stages.render() + self.requests.render()) + '\n'
+
+
+def server_timing(timings):
+    """
+    Format stage timings as a Server-Timing header value. Repeated stages, e.g.
+    one per resume when ranking, are summed.
+
+    Args:
+        timings (list): (stage, seconds) tuples
+
+    Returns:
+        str: Header value, e.g. 'analyzer_skills;dur=2.31, gemini_http;dur=812.4'
+    """
+    totals = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
+
+
+# The process-wide instance used by the analyzers and the app
+metrics = Metrics()
@@ -0,0 +1,262 @@
+import re
+
+# Characters that case-insensitive matching treats as equal to an ASCII letter
+# but that str.lower() leaves unchanged (dotless i and long s)
+_CASEFOLD_EXCEPTIONS = ('ı', 'ſ')
+
+# A regex alternative made only of plain characters and escaped punctuation
+_LITERAL_RE = re.compile(r'(?:[^\\\[\](){}?*+|^$.]|\\[^A-Za-z0-9])+')
+
+
+def _strip_inline_flags(pattern):
+    """Remove a leading (?i) so the pattern can be embedded in a larger one."""
+    return pattern[4:] if pattern.startswith('(?i)') else pattern
+
+
+def _literal_alternatives(pattern):
+    """
+    Split a pattern that is a plain alternation of literals into its words.
+
+    Args:
+        pattern (str): Regex pattern without inline flags
+
+    Returns:
+        list: Lowercased literal words, or None if the pattern uses other syntax
+    """
+    if pattern.startswith('(') and pattern.endswith(')') and pattern.count('(') == 1:
+        pattern = pattern[1:-1]
+    alternatives = pattern.split('|')
+    if not all(_LITERAL_RE.fullmatch(alt) for alt in alternatives):
+        return None
+    return [re.sub(r'\\(.)', r'\1', alt).lower() for alt in alternatives]
+
+
+def _trie_pattern(words):
+    """
+    Build a regex matching any of the given words, with shared prefixes merged
+    so that the matcher rejects a position after looking at a single character.
+
+    Args:
+        words (list): Literal words
+
+    Returns:
+        str: Regex pattern
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?' if len(branches) == 1 else body + '?'
+        return body
+
+    return emit(trie)
+
+
+def _fast_pattern(pattern, presence_only):
+    """
+    Rewrite a pattern for case-sensitive matching against lowercased text.
+
+    Args:
+        pattern (str): Regex pattern without inline flags
+        presence_only (bool): Whether only the fact that it matched is used
+
+    Returns:
+        str: Regex pattern
+    """
+    # A trie can change which alternative is captured, so only rewrite presence rules
+    words = _literal_alternatives(pattern) if presence_only else None
+    if words is not None:
+        return _trie_pattern(words)
+    if pattern != pattern.lower():
+        return '(?i:%s)' % pattern
+    return '(?:%s)' % pattern
+
+
+class _Scanner:
+    """A rule set compiled for lowercased text and, as a fallback, for the original text."""
+
+    def __init__(self, patterns, presence_only=False, ranked=False):
+        """
+        Compile one or more patterns into a single scanner.
+
+        Args:
+            patterns (list): Regex patterns, highest priority first
+            presence_only (bool): Whether only the fact that a pattern matched is used
+            ranked (bool): Report which pattern starts at each position instead of consuming text
+        """
+        patterns = [_strip_inline_flags(p) for p in patterns]
+        if ranked:
+            # A lookahead alternation reports, at every position, the highest
+            # priority pattern starting there without hiding overlapping hits
+            fast = '(?=%s)' % '|'.join('(?P<r%d>%s)' % (i, _fast_pattern(p, presence_only))
+                                      for i, p in enumerate(patterns))
+            exact = '(?=%s)' % '|'.join('(?P<r%d>%s)' % (i, p) for i, p in enumerate(patterns))
+        else:
+            fast = '|'.join(_fast_pattern(p, presence_only) for p in patterns)
+            exact = '|'.join('(?:%s)' % p for p in patterns) if len(patterns) > 1 else patterns[0]
+        self.fast = re.compile(fast)
+        self.exact = re.compile(exact, re.IGNORECASE)
+
+
+class ScanResult:
+    """
+    Pattern hits for one document. Each rule set is scanned with its merged
+    scanner the first time its result is needed, so a document is read once
+    per rule set rather than once per pattern, line or section.
+    """
+
+    def __init__(self, registry, text, lowered=None):
+        """
+        Initialize the ScanResult.
+
+        Args:
+            registry (PatternRegistry): Registry holding the compiled scanners
+            text (str): The document text
+            lowered (str): The lowercased text, if already computed
+        """
+        self._registry = registry
+        self.text = text
+
+        # Case-sensitive scans of the lowercased text are equivalent to
+        # case-insensitive scans of the original whenever lowercasing keeps
+        # every character at the same offset
+        if lowered is None:
+            lowered = text.lower()
+        self._fast = len(lowered) == len(text) and not any(c in text for c in _CASEFOLD_EXCEPTIONS)
+        self._target = lowered if self._fast else text
+        self._cache = {}
+
+    def _scanner(self, scanner):
+        """Pick the compiled variant matching the scan target."""
+        return scanner.fast if self._fast else scanner.exact
+
+    def _cached(self, name, compute):
+        """Compute a result once and remember it."""
+        if name not in self._cache:
+            self._cache[name] = compute()
+        return self._cache[name]
+
+    def _ranked_hits(self, scanner):
+        """Yield (position, priority) for every position where a ranked pattern starts."""
+        for match in self._scanner(scanner).finditer(self._target):
+            yield match.start(), int(match.lastgroup[1:])
+
+    @property
+    def section_hits(self):
+        """list: (position, section priority) for every position where a section keyword starts."""
+        return self._cached('section_hits', lambda: list(self._ranked_hits(self._registry.sections)))
+
+    @property
+    def degree(self):
+        """str: The highest degree mentioned anywhere, or None."""
+        def compute():
+            best = None
+            for _, rank in self._ranked_hits(self._registry.degrees):
+                if best is None or rank < best:
+                    best = rank
+                    if best == 0:
+                        break
+            return None if best is None else self._registry.degree_names[best]
+        return self._cached('degree', compute)
+
+    @property
+    def years(self):
+        """int: Years from the first years-of-experience phrase, or None."""
+        def compute():
+            match = self._scanner(self._registry.years).search(self._target)
+            return int(match.group(1)) if match else None
+        return self._cached('years', compute)
+
+    @property
+    def field(self):
+        """str: Captured field of study from the first matching field pattern, or None."""
+        def compute():
+            for scanner in self._registry.fields:
+                match = self._scanner(scanner).search(self._target)
+                if match:
+                    return self.text[match.start(1):match.end(1)]
+            return None
+        return self._cached('field', compute)
+
+    @property
+    def requirements(self):
+        """list: Captured requirement phrases for each requirement pattern, in document order."""
+        return self._cached('requirements', lambda: [
+            [self.text[match.start(1):match.end(1)]
+             for match in self._scanner(scanner).finditer(self._target)]
+            for scanner in self._registry.requirements
+        ])
+
+    @property
+    def has_contact(self):
+        """bool: Whether any contact pattern matches."""
+        return self._cached('has_contact',
+                            lambda: self._scanner(self._registry.contact).search(self._target) is not None)
+
+    @property
+    def has_achievement(self):
+        """bool: Whether any achievement pattern matches."""
+        return self._cached('has_achievement',
+                            lambda: self._scanner(self._registry.achievement).search(self._target) is not None)
+
+    @property
+    def non_ascii(self):
+        """int: Number of non-ASCII characters."""
+        return len(self.text) - len(self.text.encode('ascii', 'ignore'))
+
+
+class PatternRegistry:
+    """
+    Compiles the analyzer's rule sets once when the analyzer is built. Every
+    rule set is merged into a single scanner (literal alternatives become a
+    prefix trie), so detecting section headers, degrees, years of experience,
+    fields of study, requirements and contact details costs one linear pass
+    per rule set instead of one per pattern, per line or per section.
+    """
+
+    def __init__(self, section_patterns, degree_patterns, years_pattern, field_patterns,
+                 requirement_patterns, contact_patterns, achievement_patterns):
+        """
+        Initialize the PatternRegistry.
+
+        Args:
+            section_patterns (dict): Section name to header pattern, in priority order
+            degree_patterns (dict): Degree name to pattern, highest degree first
+            years_pattern (str): Years-of-experience pattern capturing the number
+            field_patterns (list): Field-of-study patterns capturing the field, in priority order
+            requirement_patterns (list): Requirement phrase patterns capturing the requirement
+            contact_patterns (list): Contact information patterns
+            achievement_patterns (list): Achievement verb patterns
+        """
+        self.section_names = list(section_patterns)
+        self.degree_names = list(degree_patterns)
+
+        self.sections = _Scanner(list(section_patterns.values()), presence_only=True, ranked=True)
+        self.degrees = _Scanner(list(degree_patterns.values()), presence_only=True, ranked=True)
+        self.years = _Scanner([years_pattern])
+        self.fields = [_Scanner([p]) for p in field_patterns]
+        self.requirements = [_Scanner([p]) for p in requirement_patterns]
+        self.contact = _Scanner(contact_patterns, presence_only=True)
+        self.achievement = _Scanner(achievement_patterns, presence_only=True)
+
+    def scan(self, text, lowered=None):
+        """
+        Prepare a document for scanning.
+
+        Args:
+            text (str): The document text
+            lowered (str): The lowercased text, if already computed
+
+        Returns:
+            ScanResult: Lazily evaluated pattern hits
+        """
+        return ScanResult(self, text, lowered)
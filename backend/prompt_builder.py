@@ -0,0 +1,243 @@
+import re
+
+# Gemini models average about four characters per token on English text
+CHARS_PER_TOKEN = 4
+
+INSTRUCTIONS = """You are an AI Resume Analyzer. Analyze the resume against the job description below.
+
+Resume:
+{resume}
+
+Job Description:
+{job}
+
+Respond with only a JSON object in this structure, all scores integers from 0 to 100:
+{{"overall_score": <score>,
+"skills_score": <score>, "skills_details": {{"matched": [<skills>], "missing": [<skills>]}},
+"experience_score": <score>, "experience_details": [<experience match details>],
+"education_score": <score>, "education_details": [<education match details>],
+"keywords_score": <score>, "keywords_details": {{"matched": [<keywords>], "missing": [<keywords>]}},
+"suggestions": [<improvement suggestions>]}}"""
+
+# Share of a document's budget each section is guaranteed, in priority order;
+# whatever a section does not use goes to the next ones. 'other' is every line
+# outside the skills, experience and education sections (summary, projects,
+# and for job descriptions usually the responsibilities and requirements).
+RESUME_SHARES = (('skills', 0.25), ('experience', 0.40), ('education', 0.15), ('other', 0.20))
+JOB_SHARES = (('skills', 0.25), ('other', 0.40), ('experience', 0.20), ('education', 0.15))
+
+SECTION_LABELS = {'skills': 'Skills', 'experience': 'Experience', 'education': 'Education', 'other': 'Other'}
+
+_EMAIL = re.compile(r'\S+@\S+\.\w+')
+# Bare domains only count with a path, so names such as ASP.NET or Vue.io are not URLs
+_URL = re.compile(r'(?:https?://|www\.)\S+|\b[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}/\S*', re.IGNORECASE)
+_PHONE = re.compile(r'\+?\(?\d[\d\s().-]{7,}\d')
+# Fewer digits than this are years, date ranges or scores rather than a phone number
+_PHONE_DIGITS = 9
+_PAGE_MARKER = re.compile(r'(?:page\s*)?\d+\s*(?:(?:of|/)\s*\d+)?', re.IGNORECASE)
+_BOILERPLATE = ('available upon request', 'available on request', 'curriculum vitae')
+
+
+def estimate_tokens(text):
+    """
+    Estimate how many tokens a text costs, without calling the API.
+
+    Args:
+        text (str): Text
+
+    Returns:
+        int: Estimated token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _strip_phone(match):
+    """Remove a phone number, leaving shorter digit runs such as date ranges alone."""
+    return '' if sum(ch.isdigit() for ch in match.group()) >= _PHONE_DIGITS else match.group()
+
+
+def _is_contact_line(line):
+    """Whether a line holds nothing but contact details: e-mail addresses, URLs and phone numbers."""
+    lowered = line.lower()
+    # Only lines with an address, a URL scheme or a phone number qualify
+    if '@' not in line and 'http' not in lowered and 'www.' not in lowered:
+        if sum(ch.isdigit() for ch in line) < _PHONE_DIGITS:
+            return False
+        if not any(not _strip_phone(match) for match in _PHONE.finditer(line)):
+            return False
+    rest = _PHONE.sub(_strip_phone, _URL.sub('', _EMAIL.sub('', line)))
+    # Lines that were only contact details leave little but separators behind
+    return sum(ch.isalpha() for ch in rest) < 3
+
+
+def _is_low_value(line):
+    """Whether a line carries nothing the analysis uses: contact details, page markers, boilerplate."""
+    lowered = line.lower()
+    if lowered == 'resume' or any(phrase in lowered for phrase in _BOILERPLATE):
+        return True
+    if len(line) < 16 and _PAGE_MARKER.fullmatch(line):
+        return True
+    return _is_contact_line(line)
+
+
+def split_lines(text):
+    """
+    Split a document into lines, with whitespace collapsed and blank lines dropped.
+
+    Args:
+        text (str): Document text
+
+    Returns:
+        list: Lines in document order
+    """
+    return [line for line in (' '.join(raw.split()) for raw in text.split('\n')) if line]
+
+
+def clean_lines(lines):
+    """
+    Drop the lines of a document that are not worth their tokens: low-value
+    lines, and repeated lines (such as page headers and footers) after the
+    first. Short lines such as one-per-line skills are kept.
+
+    Args:
+        lines (list): Lines from split_lines()
+
+    Returns:
+        list: Lines in document order
+    """
+    cleaned = []
+    seen = set()
+    for line in lines:
+        if _is_low_value(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        cleaned.append(line)
+    return cleaned
+
+
+def _take(lines, budget):
+    """Take lines in order while they fit in a token budget, cutting the first line that does not at a word."""
+    taken = []
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if cost <= budget:
+            taken.append(line)
+            budget -= cost
+            continue
+        if budget >= 16:
+            cut = line[:(budget - 1) * CHARS_PER_TOKEN].rsplit(' ', 1)[0]
+            taken.append(cut)
+        break
+    return taken
+
+
+class PromptBuilder:
+    """
+    Builds Gemini prompts within a token budget. Documents that fit are sent
+    whole; longer ones first lose contact details, page markers and repeated
+    boilerplate, and are then cut section by section if still too long, so
+    the skills, experience and education sections each keep a guaranteed
+    share instead of whatever the first N characters happen to hold.
+    """
+
+    def __init__(self, extract_sections=None, token_budget=4000, job_share=0.35):
+        """
+        Initialize the PromptBuilder.
+
+        Args:
+            extract_sections (callable): Function mapping text to a dict of section name
+                to section text, such as ResumeAnalyzer.extract_sections; without it
+                documents are cut line by line
+            token_budget (int): Maximum estimated tokens for the whole prompt
+            job_share (float): Share of the document budget the job description may
+                use when the resume needs the rest
+        """
+        self.extract_sections = extract_sections
+        self.token_budget = token_budget
+        self.job_share = job_share
+        self.instruction_tokens = estimate_tokens(INSTRUCTIONS.format(resume='', job=''))
+
+    def _sections(self, lines):
+        """Group lines by section, with every line outside the known sections under 'other'."""
+        if self.extract_sections is None:
+            return {'other': lines}
+        found = self.extract_sections('\n'.join(lines))
+        sections = {}
+        assigned = set()
+        for name in ('skills', 'experience', 'education'):
+            if name in found:
+                sections[name] = found[name].split('\n')
+                assigned.update(sections[name])
+        sections['other'] = [line for line in lines if line not in assigned]
+        return sections
+
+    def compact(self, text, budget, shares=RESUME_SHARES):
+        """
+        Fit a document into a token budget.
+
+        Args:
+            text (str): Document text
+            budget (int): Maximum estimated tokens
+            shares (tuple): (section, share of budget) pairs in priority order
+
+        Returns:
+            str: The compacted document
+        """
+        return self._compact(split_lines(text), budget, shares)
+
+    def _compact(self, lines, budget, shares):
+        """Fit lines from split_lines() into a token budget."""
+        compacted = '\n'.join(lines)
+        if estimate_tokens(compacted) <= budget:
+            return compacted
+
+        # Spend the budget on content before cutting any section
+        lines = clean_lines(lines)
+        compacted = '\n'.join(lines)
+        if estimate_tokens(compacted) <= budget:
+            return compacted
+
+        sections = self._sections(lines)
+        present = [(name, share) for name, share in shares if sections.get(name)]
+        # Section labels cost tokens too
+        budget -= sum(estimate_tokens(SECTION_LABELS[name]) + 2 for name, _ in present)
+        costs = {name: sum(estimate_tokens(line) + 1 for line in sections[name]) for name, _ in present}
+
+        # Guarantee each section its share, then hand out what is left in priority order
+        allocation = {name: min(costs[name], int(budget * share)) for name, share in present}
+        spare = budget - sum(allocation.values())
+        for name, _ in present:
+            extra = min(spare, costs[name] - allocation[name])
+            allocation[name] += extra
+            spare -= extra
+
+        parts = []
+        for name, _ in present:
+            taken = _take(sections[name], allocation[name])
+            if taken:
+                parts.append(f"{SECTION_LABELS[name]}:\n" + '\n'.join(taken))
+        return '\n\n'.join(parts)
+
+    def build(self, resume_text, job_description):
+        """
+        Build the analysis prompt.
+
+        Args:
+            resume_text (str): Resume text
+            job_description (str): Job description text
+
+        Returns:
+            str: The prompt
+        """
+        available = max(self.token_budget - self.instruction_tokens, 0)
+        resume_lines = split_lines(resume_text)
+        resume_tokens = estimate_tokens('\n'.join(resume_lines))
+
+        # The job description gets its share, or more if the resume leaves room
+        job = self.compact(job_description, max(int(available * self.job_share), available - resume_tokens),
+                           JOB_SHARES)
+        resume = self._compact(resume_lines, available - estimate_tokens(job), RESUME_SHARES)
+        return INSTRUCTIONS.format(resume=resume, job=job)
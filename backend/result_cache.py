@@ -0,0 +1,284 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at);
+"""
+
+# Disk entries record a hit at most this often, so reads rarely write
+_TOUCH_INTERVAL = 60
+
+# Recount the disk tier's size after this many writes, to pick up other workers' writes
+_PRUNE_INTERVAL = 100
+
+
+def normalize_text(text):
+    """
+    Normalize whitespace so retries and resubmissions that differ only in
+    spacing, line endings or blank edges share a cache entry.
+
+    Args:
+        text (str): Resume or job description text
+
+    Returns:
+        str: Text with Unix line endings, single spaces and no leading or
+            trailing whitespace on any line
+    """
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    # Line breaks are kept because section detection works line by line
+    return '\n'.join(' '.join(line.split()) for line in text.split('\n')).strip()
+
+
+def result_key(resume_text, job_text, mode, version):
+    """
+    Compute the cache key of an analysis.
+
+    Args:
+        resume_text (str): Normalized resume text
+        job_text (str): Normalized job description text
+        mode (str): Analysis mode, e.g. 'rules' or the Gemini model
+        version (str): Version of the code producing the result
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in (version, mode, resume_text, job_text):
+        data = part.encode('utf-8')
+        # Length prefixes keep different splits of the same bytes apart
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    A two-tier cache of serialized analysis results. The in-memory tier is an
+    LRU bounded by bytes; the optional SQLite tier is shared by every worker
+    on the host and bounded by bytes too, evicting the least recently read
+    entries. Every entry expires after the TTL.
+    """
+
+    def __init__(self, memory_bytes=64 * 1024 * 1024, ttl=86400, path=None, disk_bytes=1024 * 1024 * 1024):
+        """
+        Initialize the ResultCache.
+
+        Args:
+            memory_bytes (int): Maximum bytes of serialized results held in memory
+            ttl (float): Seconds an entry stays valid
+            path (str): Path of the SQLite database file, or None for memory only
+            disk_bytes (int): Maximum bytes of serialized results on disk
+        """
+        self.memory_bytes = memory_bytes
+        self.ttl = ttl
+        self.path = path
+        self.disk_bytes = disk_bytes
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self._disk_size = 0   # Estimated bytes on disk, recounted on every prune
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path:
+            with self._connection() as conn:
+                conn.executescript(SCHEMA)
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, value, expires_at):
+        """Store an entry in memory, evicting least recently used entries to stay within budget."""
+        # json.dumps escapes non-ASCII characters, so the length is the size in bytes
+        size = len(value)
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (expires_at, value)
+            self._size += size
+            while self._size > self.memory_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get_json(self, key):
+        """
+        Look up a serialized result.
+
+        Args:
+            key (str): Cache key from result_key()
+
+        Returns:
+            tuple: (JSON text, tier) where tier is 'memory' or 'disk', or (None, None) on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1], 'memory'
+                del self._entries[key]
+                self._size -= len(entry[1])
+
+        if self.path:
+            try:
+                conn = self._connection()
+                row = conn.execute('SELECT value, expires_at, accessed_at FROM results WHERE key = ?',
+                                   (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    value, expires_at, accessed_at = row
+                    if now - accessed_at > _TOUCH_INTERVAL:
+                        with conn:
+                            conn.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (now, key))
+                    self._remember(key, value, expires_at)
+                    with self._lock:
+                        self.disk_hits += 1
+                    return value, 'disk'
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache read failed: {str(e)}")
+
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def get(self, key):
+        """
+        Look up a result.
+
+        Args:
+            key (str): Cache key from result_key()
+
+        Returns:
+            The cached result, or None on a miss
+        """
+        value, _ = self.get_json(key)
+        return json.loads(value) if value is not None else None
+
+    def put(self, key, result):
+        """
+        Store a result in every tier.
+
+        Args:
+            key (str): Cache key from result_key()
+            result: JSON-serializable analysis result
+
+        Returns:
+            str: The serialized result
+        """
+        value = json.dumps(result)
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, value, expires_at)
+
+        if self.path:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute('INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at) '
+                                 'VALUES (?, ?, ?, ?, ?)', (key, value, len(value), expires_at, now))
+                with self._lock:
+                    self._writes += 1
+                    self._disk_size += len(value)
+                    prune = self._writes % _PRUNE_INTERVAL == 1 or self._disk_size > self.disk_bytes
+                if prune:
+                    self._prune(conn, now)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {str(e)}")
+        return value
+
+    def _prune(self, conn, now):
+        """Delete expired disk entries, then the least recently read ones until within budget."""
+        with conn:
+            conn.execute('DELETE FROM results WHERE expires_at <= ?', (now,))
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total <= self.disk_bytes:
+                with self._lock:
+                    self._disk_size = total
+                return
+            # Free a tenth of the budget at once so the next writes do not prune again
+            target = total - self.disk_bytes * 0.9
+            freed = 0
+            doomed = []
+            for key, size in conn.execute('SELECT key, size FROM results ORDER BY accessed_at'):
+                doomed.append((key,))
+                freed += size
+                if freed >= target:
+                    break
+            conn.executemany('DELETE FROM results WHERE key = ?', doomed)
+        with self._lock:
+            self._disk_size = total - freed
+            self.evictions += len(doomed)
+        logger.info(f"Result cache pruned {len(doomed)} entries ({freed} bytes) from disk")
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.path:
+            with self._connection() as conn:
+                conn.execute('DELETE FROM results')
+            with self._lock:
+                self._disk_size = 0
+
+    def stats(self):
+        """
+        Report hit ratio and space usage.
+
+        Returns:
+            dict: Hits per tier, misses, hit ratio, evictions, and entries and bytes per tier
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            stats = {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._entries),
+                'memory_bytes': self._size,
+                'memory_max_bytes': self.memory_bytes
+            }
+        if self.path:
+            entries, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results').fetchone()
+            stats.update(disk_entries=entries, disk_bytes=size, disk_max_bytes=self.disk_bytes)
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,220 @@
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    length INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    metadata TEXT,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id TEXT NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    doc_count INTEGER NOT NULL,
+    total_length INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (id, doc_count, total_length) VALUES (0, 0, 0);
+"""
+
+
+class ResumeIndex:
+    """
+    A persistent inverted index over stored resumes, backed by SQLite.
+    Resumes are indexed by the lemmatized tokens the analyzer produces and
+    retrieved with BM25, so only the best candidates for a job description
+    need a full analysis.
+    """
+
+    def __init__(self, path, tokenize, k1=1.2, b=0.75, max_query_terms=64):
+        """
+        Initialize the ResumeIndex.
+
+        Args:
+            path (str): Path of the SQLite database file
+            tokenize (callable): Function mapping text to preprocessed tokens
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 length normalization
+            max_query_terms (int): Maximum number of distinct query terms, rarest first
+        """
+        self.path = path
+        self.tokenize = tokenize
+        self.k1 = k1
+        self.b = b
+        self.max_query_terms = max_query_terms
+        self._local = threading.local()
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _terms(self, text):
+        """Count the indexable terms of a text, skipping single characters and numbers."""
+        return Counter(token for token in self.tokenize(text) if len(token) > 1 and not token.isdigit())
+
+    def add(self, doc_id, text, metadata=None):
+        """
+        Add a resume to the index, replacing any resume with the same id.
+
+        Args:
+            doc_id (str): Resume id
+            text (str): Resume text
+            metadata (dict): Optional data stored with the resume
+        """
+        terms = self._terms(text)
+        length = sum(terms.values())
+        with self._connection() as conn:
+            self._delete(conn, doc_id)
+            conn.execute(
+                'INSERT INTO documents (doc_id, length, text, metadata, added_at) VALUES (?, ?, ?, ?, ?)',
+                (doc_id, length, text, json.dumps(metadata) if metadata is not None else None, time.time())
+            )
+            conn.executemany('INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)',
+                             [(term, doc_id, tf) for term, tf in terms.items()])
+            conn.executemany('INSERT INTO terms (term, df) VALUES (?, 1) '
+                             'ON CONFLICT (term) DO UPDATE SET df = df + 1',
+                             [(term,) for term in terms])
+            conn.execute('UPDATE stats SET doc_count = doc_count + 1, total_length = total_length + ? WHERE id = 0',
+                         (length,))
+
+    def delete(self, doc_id):
+        """
+        Remove a resume from the index.
+
+        Args:
+            doc_id (str): Resume id
+
+        Returns:
+            bool: Whether the resume was indexed
+        """
+        with self._connection() as conn:
+            return self._delete(conn, doc_id)
+
+    def _delete(self, conn, doc_id):
+        """Remove a resume inside an open transaction."""
+        row = conn.execute('SELECT length FROM documents WHERE doc_id = ?', (doc_id,)).fetchone()
+        if row is None:
+            return False
+        terms = [(term,) for (term,) in conn.execute('SELECT term FROM postings WHERE doc_id = ?', (doc_id,))]
+        conn.executemany('UPDATE terms SET df = df - 1 WHERE term = ?', terms)
+        conn.execute('DELETE FROM terms WHERE df <= 0')
+        conn.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+        conn.execute('DELETE FROM documents WHERE doc_id = ?', (doc_id,))
+        conn.execute('UPDATE stats SET doc_count = doc_count - 1, total_length = total_length - ? WHERE id = 0',
+                     (row[0],))
+        return True
+
+    def get(self, doc_id):
+        """
+        Get a stored resume.
+
+        Args:
+            doc_id (str): Resume id
+
+        Returns:
+            dict: Resume id, text and metadata, or None if not indexed
+        """
+        row = self._connection().execute(
+            'SELECT text, metadata FROM documents WHERE doc_id = ?', (doc_id,)).fetchone()
+        if row is None:
+            return None
+        return {'id': doc_id, 'text': row[0], 'metadata': json.loads(row[1]) if row[1] else None}
+
+    def get_many(self, doc_ids):
+        """
+        Get stored resume texts in the given order, skipping unknown ids.
+
+        Args:
+            doc_ids (list): Resume ids
+
+        Returns:
+            list: (resume_id, text) pairs
+        """
+        texts = {}
+        conn = self._connection()
+        # Stay well under SQLite's bound parameter limit
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            texts.update(conn.execute(
+                f'SELECT doc_id, text FROM documents WHERE doc_id IN ({placeholders})', chunk))
+        return [(doc_id, texts[doc_id]) for doc_id in doc_ids if doc_id in texts]
+
+    def search(self, query, k=200):
+        """
+        Retrieve the resumes that best match a job description with BM25.
+
+        Args:
+            query (str): Job description text
+            k (int): Maximum number of resumes to return
+
+        Returns:
+            list: (resume_id, score) pairs, best match first
+        """
+        conn = self._connection()
+        doc_count, total_length = conn.execute(
+            'SELECT doc_count, total_length FROM stats WHERE id = 0').fetchone()
+        query_terms = list(self._terms(query))
+        if not doc_count or not query_terms:
+            return []
+
+        # Look up document frequencies and keep the rarest, most selective terms
+        document_frequency = {}
+        for start in range(0, len(query_terms), 500):
+            chunk = query_terms[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            document_frequency.update(conn.execute(
+                f'SELECT term, df FROM terms WHERE term IN ({placeholders})', chunk))
+        if not document_frequency:
+            return []
+        selected = sorted(document_frequency, key=document_frequency.get)[:self.max_query_terms]
+
+        weights = []
+        for term in selected:
+            df = document_frequency[term]
+            weights.extend((term, math.log(1 + (doc_count - df + 0.5) / (df + 0.5))))
+
+        average_length = total_length / doc_count or 1
+        values = ','.join(['(?, ?)'] * len(selected))
+        rows = conn.execute(
+            f"""
+            WITH query (term, idf) AS (VALUES {values})
+            SELECT p.doc_id,
+                   SUM(q.idf * p.tf * (? + 1) / (p.tf + ? * (1 - ? + ? * d.length / ?))) AS score
+            FROM query q
+            JOIN postings p ON p.term = q.term
+            JOIN documents d ON d.doc_id = p.doc_id
+            GROUP BY p.doc_id
+            ORDER BY score DESC, p.doc_id
+            LIMIT ?
+            """,
+            weights + [self.k1, self.k1, self.b, self.b, average_length, k]
+        ).fetchall()
+        return [(doc_id, score) for doc_id, score in rows]
+
+    def __len__(self):
+        return self._connection().execute('SELECT doc_count FROM stats WHERE id = 0').fetchone()[0]
@@ -0,0 +1,374 @@
+import os
+import sys
+import json
+import mmap
+import zlib
+import array
+import bisect
+import string
+import struct
+import logging
+from skill_matcher import SkillMatcher, load_taxonomy, DEFAULT_TAXONOMY_PATH
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+MAGIC = b'RPSTBL01'
+EMPTY_SLOT = 0xFFFFFFFF
+
+# File layout: MAGIC, a little-endian uint32 directory length, the JSON
+# directory, then 8-byte aligned sections of fixed-width integers. The
+# directory maps each section name to [offset from the data start, array
+# typecode, item count].
+
+
+def _align(size):
+    """Round up to a multiple of 8 bytes."""
+    return (size + 7) & ~7
+
+
+def _string_sections(name, strings):
+    """Encode strings as a UTF-8 blob plus an offsets array (one more entry than strings)."""
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = array.array('I', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return {f'{name}.blob': array.array('B', b''.join(encoded)), f'{name}.offsets': offsets}
+
+
+def _hash_slots(keys):
+    """Build an open-addressing hash index over encoded keys, at most half full."""
+    size = 1
+    while size < 2 * len(keys):
+        size *= 2
+    slots = array.array('I', [EMPTY_SLOT]) * size
+    mask = size - 1
+    for index, key in enumerate(keys):
+        slot = zlib.crc32(key.encode('utf-8')) & mask
+        while slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = index
+    return slots
+
+
+def _map_sections(name, mapping):
+    """Encode a string map (or a set, stored without values) with its hash index."""
+    keys = sorted(mapping)
+    sections = _string_sections(f'{name}.keys', keys)
+    if isinstance(mapping, dict):
+        sections.update(_string_sections(f'{name}.values', [mapping[key] for key in keys]))
+    sections[f'{name}.slots'] = _hash_slots(keys)
+    return sections
+
+
+def write_tables(path, lemmas, stop_words, taxonomy, nouns=(), exceptions=(), meta=None):
+    """
+    Write lemma, stopword and taxonomy tables to a binary file. The file is
+    replaced atomically, so running workers keep their existing mapping.
+
+    Args:
+        path (str): Output file
+        lemmas (dict): Token mapped to its lemma, for tokens whose lemma differs
+        stop_words (iterable): Stopwords
+        taxonomy (dict): Skills taxonomy, as returned by load_taxonomy
+        nouns (iterable): Noun lemmas, needed when meta['repeat_rules'] is set
+        exceptions (iterable): Noun exception forms, needed when meta['repeat_rules'] is set
+        meta (dict): Optional build information stored in the directory
+    """
+    sections = {}
+    sections.update(_map_sections('lemmas', lemmas))
+    sections.update(_map_sections('nouns', set(nouns)))
+    sections.update(_map_sections('exceptions', set(exceptions)))
+
+    sections.update(_string_sections('stopwords', sorted(set(stop_words))))
+
+    automaton = SkillMatcher(taxonomy).tables()
+    sections.update(_string_sections('skills.names', automaton['skills']))
+    sections.update(_string_sections('skills.categories', automaton['categories']))
+    sections['skills.keys'] = array.array('Q', automaton['keys'])
+    sections['skills.targets'] = array.array('I', automaton['targets'])
+    sections['skills.fail'] = array.array('I', automaton['fail'])
+    sections['skills.length'] = array.array('I', automaton['length'])
+    sections['skills.skill'] = array.array('i', automaton['skill'])
+    sections['skills.link'] = array.array('I', automaton['link'])
+
+    directory = {'byteorder': sys.byteorder, 'meta': meta or {}, 'sections': {}}
+    offset = 0
+    for name, values in sections.items():
+        directory['sections'][name] = [offset, values.typecode, len(values)]
+        offset = _align(offset + len(values) * values.itemsize)
+    header = json.dumps(directory).encode('utf-8')
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header)) + header)
+        data_start = _align(f.tell())
+        for name, values in sections.items():
+            f.seek(data_start + directory['sections'][name][0])
+            values.tofile(f)
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+class StringList:
+    """A read-only list of strings stored as a UTF-8 blob and an offsets array."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def raw(self, index):
+        """Get the encoded bytes of an item without decoding them."""
+        return self._blob[self._offsets[index]:self._offsets[index + 1]]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('StringList index out of range')
+        return str(self.raw(index), 'utf-8')
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+
+class StringMap:
+    """
+    A read-only string to string map looked up through a CRC32 hash index.
+    Without values it acts as a set.
+    """
+
+    def __init__(self, keys, values, slots):
+        self._keys = keys
+        self._values = values
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    def _find(self, key):
+        """Find the index of a key, or -1."""
+        if not len(self._keys):
+            return -1
+        encoded = key.encode('utf-8')
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            index = self._slots[slot]
+            if index == EMPTY_SLOT:
+                return -1
+            if self._keys.raw(index) == encoded:
+                return index
+            slot = (slot + 1) & self._mask
+
+    def get(self, key, default=None):
+        index = self._find(key)
+        if index < 0:
+            return default
+        return self._values[index] if self._values is not None else key
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class SortedTransitions:
+    """
+    Automaton transitions looked up by binary search over sorted keys.
+    Recent lookups, hits and misses alike, are memoized in a small private
+    dict, since matching revisits the same shallow states for most characters.
+    """
+
+    def __init__(self, keys, targets, memo_size=65536):
+        self._keys = keys
+        self._targets = targets
+        self._memo = {}
+        self._memo_size = memo_size
+
+    def get(self, key, default=None):
+        target = self._memo.get(key, -1)
+        if target == -1:
+            index = bisect.bisect_left(self._keys, key)
+            target = self._targets[index] if index < len(self._keys) and self._keys[index] == key else None
+            if len(self._memo) >= self._memo_size:
+                self._memo.clear()
+            self._memo[key] = target
+        return default if target is None else target
+
+
+class SharedTables:
+    """
+    Lemma, stopword and skills tables read through a read-only memory map.
+    Every process that opens the same file shares its physical pages, so
+    memory no longer grows with each gunicorn worker's private copies.
+    """
+
+    def __init__(self, path):
+        """
+        Open a tables file built by write_tables.
+
+        Args:
+            path (str): Path to the tables file
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a shared tables file")
+        header_length = struct.unpack_from('<I', self._mmap, len(MAGIC))[0]
+        header_end = len(MAGIC) + 4 + header_length
+        directory = json.loads(self._mmap[len(MAGIC) + 4:header_end].decode('utf-8'))
+        if directory['byteorder'] != sys.byteorder:
+            raise ValueError(f"{path} was built on a {directory['byteorder']}-endian machine")
+        self.meta = directory['meta']
+
+        data = memoryview(self._mmap)[_align(header_end):]
+        self._sections = {}
+        for name, (offset, typecode, count) in directory['sections'].items():
+            itemsize = array.array(typecode).itemsize
+            self._sections[name] = data[offset:offset + count * itemsize].cast(typecode)
+
+        self.lemmas = self._map('lemmas')
+        self.nouns = self._map('nouns')
+        self.exceptions = self._map('exceptions')
+        self.stopwords = self._strings('stopwords')
+        self._substitutions = [tuple(rule) for rule in self.meta.get('substitutions', [])]
+        self._repeat_rules = self.meta.get('repeat_rules', False)
+
+    def _strings(self, name):
+        """Get a StringList section."""
+        return StringList(self._sections[f'{name}.blob'], self._sections[f'{name}.offsets'])
+
+    def _map(self, name):
+        """Get a StringMap section."""
+        values = self._strings(f'{name}.values') if f'{name}.values.blob' in self._sections else None
+        return StringMap(self._strings(f'{name}.keys'), values, self._sections[f'{name}.slots'])
+
+    def lemmatize(self, token):
+        """
+        Get the lemma of a token.
+
+        Args:
+            token (str): Lowercase token
+
+        Returns:
+            str: The lemma, or the token itself
+        """
+        lemma = self.lemmas.get(token)
+        if lemma is not None:
+            return lemma
+        if not self._repeat_rules or token in self.nouns or token in self.exceptions:
+            return token
+
+        # Some NLTK versions keep applying the substitution rules while no
+        # lemma is found; the table only holds single-step results
+        forms = self._apply_rules([token])
+        while forms:
+            forms = self._apply_rules(forms)
+            found = [form for form in forms if form in self.nouns]
+            if found:
+                return min(found, key=len)
+        return token
+
+    def _apply_rules(self, forms):
+        """Apply WordNet's noun substitution rules once to each form."""
+        return [form[:-len(old)] + new
+                for form in forms
+                for old, new in self._substitutions
+                if form.endswith(old)]
+
+    def skill_matcher(self):
+        """
+        Get a SkillMatcher running directly on the mapped automaton.
+
+        Returns:
+            SkillMatcher: The matcher
+        """
+        sections = self._sections
+        return SkillMatcher.from_tables(
+            skills=self._strings('skills.names'),
+            categories=self._strings('skills.categories'),
+            transitions=SortedTransitions(sections['skills.keys'], sections['skills.targets']),
+            fail=sections['skills.fail'],
+            length=sections['skills.length'],
+            skill=sections['skills.skill'],
+            link=sections['skills.link']
+        )
+
+
+def build_lemma_table():
+    """
+    Precompute WordNetLemmatizer.lemmatize for every token whose lemma differs
+    from the token itself after one pass of WordNet's noun rules. Such a token
+    is either a noun exception or a noun lemma inflected by one substitution
+    rule, so generating those candidates covers every single-step lemma.
+
+    Returns:
+        tuple: (lemmas, nouns, exceptions, meta) where lemmas maps tokens to
+            lemmas, nouns are the noun lemmas, exceptions the noun exception
+            forms and meta describes the rules for lookups the table does not cover
+    """
+    from nltk.corpus import wordnet
+    from nltk.stem import WordNetLemmatizer
+
+    lemmatizer = WordNetLemmatizer()
+    punctuation = set(string.punctuation)
+
+    # Tokens never contain whitespace or ASCII punctuation (preprocess_text strips it)
+    nouns = [name for name in wordnet.all_lemma_names(pos=wordnet.NOUN)
+             if not punctuation.intersection(name)]
+    candidates = set(nouns)
+    exceptions = list(wordnet._exception_map[wordnet.NOUN])
+    candidates.update(exceptions)
+    substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS[wordnet.NOUN]
+    for name in nouns:
+        for inflected, base in substitutions:
+            if name.endswith(base):
+                candidates.add(name[:len(name) - len(base)] + inflected)
+
+    lemmas = {}
+    for token in candidates:
+        lemma = lemmatizer.lemmatize(token)
+        if lemma != token:
+            lemmas[token] = lemma
+
+    # NLTK versions that reapply the rules until a lemma is found turn 'dogss' into 'dog'
+    meta = {
+        'substitutions': substitutions,
+        'repeat_rules': lemmatizer.lemmatize('dogss') == 'dog'
+    }
+    return lemmas, nouns, exceptions, meta
+
+
+def build(path, taxonomy_path=DEFAULT_TAXONOMY_PATH):
+    """
+    Build the tables file from WordNet, NLTK stopwords and a taxonomy file.
+
+    Args:
+        path (str): Output file
+        taxonomy_path (str): Skills taxonomy file
+    """
+    from nltk.corpus import stopwords
+
+    lemmas, nouns, exceptions, meta = build_lemma_table()
+    stop_words = stopwords.words('english')
+    taxonomy = load_taxonomy(taxonomy_path)
+    meta['taxonomy'] = os.path.basename(taxonomy_path)
+    if not meta['repeat_rules']:
+        # Every lemma is a single-step result, so the table alone is exact
+        nouns = exceptions = ()
+    write_tables(path, lemmas, stop_words, taxonomy, nouns=nouns, exceptions=exceptions, meta=meta)
+    logger.info(f"Wrote {len(lemmas)} lemmas, {len(set(stop_words))} stopwords and "
+                f"{sum(len(entries) for entries in taxonomy.values())} skills to {path}")
+
+
+if __name__ == '__main__':
+    # Usage: python shared_tables.py build OUTPUT [TAXONOMY]
+    if len(sys.argv) not in (3, 4) or sys.argv[1] != 'build':
+        sys.exit('Usage: python shared_tables.py build OUTPUT [TAXONOMY]')
+    build(*sys.argv[2:])
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import logging
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Lock and result files unused for this long are removed
+_STALE_SECONDS = 3600
+
+# Look for stale files after this many calls
+_CLEANUP_INTERVAL = 500
+
+
+class _Call:
+    """One in-flight call and its outcome."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key within a process: the first
+    caller runs the function, later callers wait for it and get the same
+    result or exception. Nothing is kept once the call finishes.
+    """
+
+    def __init__(self):
+        """Initialize the SingleFlight."""
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """
+        Run fn, unless a call with the same key is already in flight.
+
+        Args:
+            key (str): Identity of the call, e.g. a prompt hash
+            fn (callable): Function to run without arguments
+
+        Returns:
+            The result of fn, possibly from another thread's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class HostSingleFlight:
+    """
+    Coalesces concurrent calls with the same key across processes on one
+    host, such as gunicorn workers, through per-key lock files. The worker
+    holding the lock runs the function and writes its JSON result next to the
+    lock; workers that had to wait for the lock read that result instead of
+    calling again. Results must be JSON-serializable.
+    """
+
+    def __init__(self, directory, result_ttl=10, wait_timeout=120, poll_interval=0.05):
+        """
+        Initialize the HostSingleFlight.
+
+        Args:
+            directory (str): Directory for lock and result files, shared by the workers
+            result_ttl (float): Seconds a result may be reused by a worker that waited for it
+            wait_timeout (float): Seconds to wait for another worker before calling anyway
+            poll_interval (float): Seconds between lock attempts while waiting
+        """
+        if fcntl is None:
+            raise RuntimeError("Host-wide single flight needs fcntl file locks (Unix only)")
+        self.directory = directory
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.calls = 0
+        self.shared = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _wait(self, fd):
+        """Wait until the lock is free and take it; returns False on timeout."""
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                continue
+        return False
+
+    def _read(self, path):
+        """Read a result written within result_ttl seconds, or None."""
+        try:
+            if time.time() - os.path.getmtime(path) > self.result_ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, result):
+        """Write a result atomically."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not share single-flight result: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _cleanup(self):
+        """Remove lock and result files nobody has used for a long time."""
+        cutoff = time.time() - _STALE_SECONDS
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def do(self, key, fn):
+        """
+        Run fn, unless another worker on the host is already running it for the same key.
+
+        Args:
+            key (str): Identity of the call; used in file names, so a hex digest
+            fn (callable): Function to run without arguments, returning JSON-serializable data
+
+        Returns:
+            The result of fn, possibly from another worker's call
+        """
+        lock_path = os.path.join(self.directory, f"{key}.lock")
+        result_path = os.path.join(self.directory, f"{key}.json")
+
+        with open(lock_path, 'a') as lock_file:
+            fd = lock_file.fileno()
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                locked = True
+            except BlockingIOError:
+                # Another worker is making this call; wait for its result
+                locked = self._wait(fd)
+                if locked:
+                    result = self._read(result_path)
+                    if result is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+                        self.shared += 1
+                        return result
+                    # The other worker failed; make the call here
+                else:
+                    logger.warning("Timed out waiting for another worker's call; calling anyway")
+
+            try:
+                # Mark the lock as in use so cleanup leaves it alone
+                os.utime(lock_path)
+                self.calls += 1
+                result = fn()
+                if locked:
+                    self._write(result_path, result)
+                return result
+            finally:
+                if locked:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                if self.calls % _CLEANUP_INTERVAL == 0:
+                    self._cleanup()
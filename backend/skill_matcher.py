@@ -0,0 +1,239 @@
+import os
+import logging
+from collections import deque
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Transitions are kept in one flat dict keyed by (state << 21) | ord(char);
+# 21 bits hold any Unicode code point. A dict per trie node would cost an
+# order of magnitude more memory for a taxonomy of tens of thousands of skills.
+_CHAR_BITS = 21
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skills_taxonomy.txt')
+
+
+def load_taxonomy(path):
+    """
+    Load a skills taxonomy file.
+
+    Each line holds a skill, optionally followed by aliases separated by '|'.
+    A line in square brackets starts a category; lines starting with '#'
+    are comments (a '#' elsewhere is part of the name, as in 'c#').
+
+    Args:
+        path (str): Path to the taxonomy file
+
+    Returns:
+        dict: Category name mapped to a list of (skill, aliases) tuples
+    """
+    taxonomy = {}
+    category = 'other'
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                category = line[1:-1].strip()
+                continue
+            names = [name.strip() for name in line.split('|') if name.strip()]
+            taxonomy.setdefault(category, []).append((names[0], names[1:]))
+    return taxonomy
+
+
+class SkillMatcher:
+    """
+    Finds every taxonomy skill in a text in one linear pass, using an
+    Aho-Corasick automaton over the lowercased skill names and aliases.
+    Matches must start and end on word boundaries, so 'java' does not match
+    inside 'javascript', and overlapping matches resolve to the leftmost,
+    longest skill, so 'c++' wins over 'c'.
+    """
+
+    def __init__(self, taxonomy):
+        """
+        Initialize the SkillMatcher.
+
+        Args:
+            taxonomy (dict): Category name mapped to a list of skill names or
+                (skill, aliases) tuples
+        """
+        self.skills = []
+        self.categories = []   # Category of each skill, by skill id
+        self._goto = {}
+        self._fail = [0]
+        self._length = [0]     # Length of the name ending at each state, 0 if none
+        self._skill = [-1]     # Skill id of the name ending at each state
+        self._link = [0]       # Nearest state on the fail chain with an output
+
+        skill_ids = {}
+        patterns = 0
+        for category, entries in taxonomy.items():
+            for entry in entries:
+                skill, aliases = (entry, ()) if isinstance(entry, str) else entry
+                skill = skill.lower()
+                if skill not in skill_ids:
+                    skill_ids[skill] = len(self.skills)
+                    self.skills.append(skill)
+                    self.categories.append(category)
+                skill_id = skill_ids[skill]
+                for name in (skill, *aliases):
+                    self._insert(name.lower(), skill_id)
+                    patterns += 1
+
+        self._build_links()
+        logger.info(f"Compiled {len(self.skills)} skills ({patterns} names) into {len(self._fail)} states")
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Build a SkillMatcher from a taxonomy file.
+
+        Args:
+            path (str): Path to the taxonomy file
+
+        Returns:
+            SkillMatcher: The compiled matcher
+        """
+        return cls(load_taxonomy(path))
+
+    @classmethod
+    def from_tables(cls, skills, categories, transitions, fail, length, skill, link):
+        """
+        Wrap a precompiled automaton, such as one read from shared memory,
+        without rebuilding it. See tables() for the meaning of each argument.
+
+        Returns:
+            SkillMatcher: The matcher
+        """
+        matcher = cls.__new__(cls)
+        matcher.skills = skills
+        matcher.categories = categories
+        matcher._goto = transitions
+        matcher._fail = fail
+        matcher._length = length
+        matcher._skill = skill
+        matcher._link = link
+        return matcher
+
+    def tables(self):
+        """
+        Export the compiled automaton as flat integer sequences.
+
+        Returns:
+            dict: 'skills' and 'categories' (names by skill id), 'keys' (sorted
+                transition keys, (state << 21) | ord(char)) and 'targets' (the
+                state each key leads to), and per-state 'fail', 'length',
+                'skill' and 'link' sequences
+        """
+        keys = sorted(self._goto)
+        return {
+            'skills': list(self.skills),
+            'categories': list(self.categories),
+            'keys': keys,
+            'targets': [self._goto[key] for key in keys],
+            'fail': list(self._fail),
+            'length': list(self._length),
+            'skill': list(self._skill),
+            'link': list(self._link)
+        }
+
+    def _insert(self, name, skill_id):
+        """Add a name to the trie."""
+        state = 0
+        for ch in name:
+            key = (state << _CHAR_BITS) | ord(ch)
+            nxt = self._goto.get(key)
+            if nxt is None:
+                nxt = len(self._fail)
+                self._goto[key] = nxt
+                self._fail.append(0)
+                self._length.append(0)
+                self._skill.append(-1)
+                self._link.append(0)
+            state = nxt
+        # Keep the first skill registered for a name
+        if not self._length[state]:
+            self._length[state] = len(name)
+            self._skill[state] = skill_id
+
+    def _build_links(self):
+        """Compute failure and output links breadth first."""
+        children = {}
+        for key, child in self._goto.items():
+            children.setdefault(key >> _CHAR_BITS, []).append((key & ((1 << _CHAR_BITS) - 1), child))
+
+        # Children of the root fail back to the root
+        queue = deque(child for _, child in children.get(0, ()))
+        while queue:
+            state = queue.popleft()
+            for char, child in children.get(state, ()):
+                fallback = self._fail[state]
+                nxt = self._goto.get((fallback << _CHAR_BITS) | char)
+                while nxt is None and fallback:
+                    fallback = self._fail[fallback]
+                    nxt = self._goto.get((fallback << _CHAR_BITS) | char)
+                nxt = nxt or 0
+                self._fail[child] = nxt
+                self._link[child] = nxt if self._length[nxt] else self._link[nxt]
+                queue.append(child)
+
+    def find(self, text):
+        """
+        Find the skills mentioned in a text.
+
+        Args:
+            text (str): Raw text
+
+        Returns:
+            list: Canonical skill names in order of first mention
+        """
+        text = text.lower()
+        goto = self._goto
+        fail = self._fail
+        lengths = self._length
+        skills = self._skill
+        link = self._link
+
+        matches = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            char = ord(ch)
+            while True:
+                nxt = goto.get((state << _CHAR_BITS) | char)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+
+            hit = state if lengths[state] else link[state]
+            while hit:
+                matches.append((end - lengths[hit], end, skills[hit]))
+                hit = link[hit]
+
+        # Keep matches on word boundaries, leftmost longest first, without overlaps
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        found = []
+        seen = set()
+        covered = 0
+        size = len(text)
+        for start, end, skill_id in matches:
+            if start < covered:
+                continue
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < size and text[end].isalnum():
+                continue
+            covered = end
+            if skill_id not in seen:
+                seen.add(skill_id)
+                found.append(self.skills[skill_id])
+        return found
+
+    def __len__(self):
+        return len(self.skills)
@@ -0,0 +1,124 @@
+import io
+import os
+import sys
+import pytest
+
+# The backend modules are imported by name, as app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _nltk_data_available():
+    """Whether the WordNet data the analyzer lemmatizes with is installed."""
+    from nltk.stem import WordNetLemmatizer
+    try:
+        WordNetLemmatizer().lemmatize('tests')
+    except LookupError:
+        return False
+    return True
+
+
+@pytest.fixture(scope='session')
+def nltk_data():
+    """Skip tests that need the local NLTK data when it is not installed."""
+    if not _nltk_data_available():
+        pytest.skip("NLTK data is not installed (python startup.py bundle DIR and set NLTK_DATA=DIR)")
+
+
+@pytest.fixture(scope='session')
+def make_analyzer(nltk_data):
+    """Build ResumeAnalyzers from local NLTK data; tests using them are skipped without it."""
+    from analyzer import ResumeAnalyzer
+    return lambda **options: ResumeAnalyzer(nltk_download=False, **options)
+
+
+class FakeClock:
+    """A clock standing still at `now` until a test moves it."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def make_clock(monkeypatch):
+    """Replace a clock function, e.g. make_clock(job_queue.time, 'time'), with a FakeClock."""
+    def make(target, name):
+        clock = FakeClock()
+        monkeypatch.setattr(target, name, clock)
+        return clock
+    return make
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of a fresh SQLite database."""
+    return str(tmp_path / 'test.db')
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """Import app.py once, with its databases in a temporary directory and no warm-up."""
+    directory = tmp_path_factory.mktemp('app')
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv('GEMINI_API_KEY', 'test-key')
+        # Nothing listens on the discard port, so a real Gemini call fails fast
+        env.setenv('GEMINI_API_URL', 'http://127.0.0.1:9/v1beta/models/test:generateContent')
+        env.setenv('GEMINI_MAX_RETRIES', '0')
+        env.setenv('NLTK_DOWNLOAD', 'False')
+        env.setenv('WARMUP_ENABLED', 'False')
+        env.setenv('JOB_PROFILE_STORE_PATH', str(directory / 'job_profiles.db'))
+        env.setenv('RESUME_INDEX_PATH', str(directory / 'resume_index.db'))
+        import app
+    return app
+
+
+def _pdf(text):
+    """A one-page PDF showing a line of text, written object by object."""
+    content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode('latin-1')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _docx(*paragraphs):
+    """A Word document with the given paragraphs."""
+    import docx
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+@pytest.fixture(scope='session')
+def make_pdf():
+    """Build small PDF files; tests using them are skipped without PyPDF2."""
+    pytest.importorskip('PyPDF2')
+    return _pdf
+
+
+@pytest.fixture(scope='session')
+def make_docx():
+    """Build small .docx files; tests using them are skipped without python-docx."""
+    pytest.importorskip('docx')
+    return _docx
@@ -0,0 +1,155 @@
+import os
+import time
+import threading
+import pytest
+from analysis_pool import AnalysisPool, AnalysisUnavailable, AnalysisTimeout, PoolBusy
+
+RESUME = "SKILLS\nPython, SQL\nEXPERIENCE\nEngineer at Acme\nEDUCATION\nB.Sc. Computer Science"
+
+
+class KillsWorker:
+    """Argument that takes its worker process down while being unpickled."""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def wait_for_restart(pool, timeout=60):
+    deadline = time.monotonic() + timeout
+    while pool._restarting:
+        assert time.monotonic() < deadline, "Pool did not restart"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def pool():
+    # Spawned workers do not inherit locks held by the test runner's threads
+    pool = AnalysisPool(analyzer_kwargs={'nltk_download': False}, workers=1, max_pending=2,
+                        timeout=30, warmup=False, start_method='spawn')
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_runs_analyzer_methods_in_workers(pool):
+    sections = pool.run('extract_sections', RESUME)
+    assert set(sections) >= {'skills', 'experience', 'education'}
+
+
+def test_crashed_worker_restarts_the_pool(pool):
+    broken = pool._executor
+    with pytest.raises(AnalysisUnavailable):
+        pool.run('extract_sections', KillsWorker())
+    wait_for_restart(pool)
+    assert pool._executor is not broken
+    assert 'skills' in pool.run('extract_sections', RESUME)
+
+
+def test_stale_restart_keeps_the_healthy_pool(pool):
+    broken = pool._executor
+    with pytest.raises(AnalysisUnavailable):
+        pool.run('extract_sections', KillsWorker())
+    wait_for_restart(pool)
+    healthy = pool._executor
+
+    # A thread that saw the same crash late must not tear down the replacement
+    pool._restart(broken)
+    assert pool._executor is healthy
+    assert 'skills' in pool.run('extract_sections', RESUME)
+
+
+def test_crash_seen_after_a_restart_keeps_the_healthy_pool(pool, monkeypatch):
+    submit = pool._submit
+    replacements = []
+
+    def submit_then_restart(*args):
+        # Another thread replaces the pool while this task is failing
+        submitted = submit(*args)
+        pool._executor = pool._launch()
+        replacements.append(pool._executor)
+        return submitted
+
+    monkeypatch.setattr(pool, '_submit', submit_then_restart)
+    with pytest.raises(AnalysisUnavailable):
+        pool.run('extract_sections', KillsWorker())
+    monkeypatch.undo()
+    wait_for_restart(pool)
+    assert pool._executor is replacements[0]
+    assert 'skills' in pool.run('extract_sections', RESUME)
+
+
+def test_restart_runs_in_the_background(pool, monkeypatch):
+    launching, release = threading.Event(), threading.Event()
+    launch = pool._launch
+
+    def slow_launch():
+        launching.set()
+        release.wait(10)
+        return launch()
+
+    monkeypatch.setattr(pool, '_launch', slow_launch)
+    broken = pool._executor
+    try:
+        # The caller that saw the crash is not held up by the relaunch
+        with pytest.raises(AnalysisUnavailable):
+            pool.run('extract_sections', KillsWorker())
+        assert launching.wait(10)
+
+        # Other callers are turned away at once while the new workers start
+        with pytest.raises(AnalysisUnavailable):
+            pool.run('extract_sections', RESUME)
+        assert pool._lock.acquire(timeout=1)
+        pool._lock.release()
+    finally:
+        release.set()
+    wait_for_restart(pool)
+    assert pool._executor is not broken
+    assert 'skills' in pool.run('extract_sections', RESUME)
+
+
+def test_failed_restart_is_retried_by_the_next_caller(pool, monkeypatch):
+    launch = pool._launch
+    attempts = []
+
+    def failing_launch():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise TimeoutError('workers did not start')
+        return launch()
+
+    monkeypatch.setattr(pool, '_launch', failing_launch)
+    broken = pool._executor
+    with pytest.raises(AnalysisUnavailable):
+        pool.run('extract_sections', KillsWorker())
+    wait_for_restart(pool)
+    assert pool._executor is broken
+
+    with pytest.raises(AnalysisUnavailable):
+        pool.run('extract_sections', RESUME)
+    wait_for_restart(pool)
+    assert len(attempts) == 2
+    assert 'skills' in pool.run('extract_sections', RESUME)
+
+
+def test_workers_share_one_startup_deadline():
+    with pytest.raises(TimeoutError):
+        AnalysisPool(analyzer_kwargs={'nltk_download': False}, workers=2, warmup=False,
+                     start_method='spawn', startup_timeout=0.01)
+
+
+def test_queue_is_bounded_and_tasks_time_out(pool):
+    pool.run('extract_sections', RESUME)
+    blocker = pool.submit('extract_sections', 'x' * 10)
+    with pytest.raises(AnalysisTimeout):
+        pool.run('extract_sections', 'SKILLS\n' * 400000, timeout=0.001)
+    blocker.result(30)
+    # Both slots come back once the tasks stop running
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            pool.submit('extract_sections', RESUME).result(30)
+            pool.submit('extract_sections', RESUME).result(30)
+            break
+        except PoolBusy:
+            time.sleep(0.05)
+    else:
+        pytest.fail('Pool slots were not released')
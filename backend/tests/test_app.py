@@ -0,0 +1,231 @@
+import io
+import os
+import json
+
+import pytest
+from gemini_client import GeminiError
+from result_cache import ResultCache
+from upload_store import UploadStore
+
+RULES_RESULT = {'overall_score': 55, 'suggestions': ['Add metrics']}
+GEMINI_RESULT = {'overall_score': 80, 'suggestions': ['Mention Kubernetes']}
+BODY = {'resume_text': 'Python developer', 'job_description': 'Python developer wanted'}
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    # Rule-based analysis is stubbed; the analyzer itself is tested elsewhere
+    monkeypatch.setattr(app_module, '_run_analysis', lambda method, *args, **kwargs: dict(RULES_RESULT))
+    monkeypatch.setattr(app_module, 'result_cache', None)
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def gemini(app_module, monkeypatch):
+    """Record the calls that reach Gemini and answer them with GEMINI_RESULT."""
+    calls = []
+
+    def analyze(resume_text, job_description):
+        calls.append((resume_text, job_description))
+        return dict(GEMINI_RESULT)
+
+    monkeypatch.setattr(app_module.gemini_analyzer, 'analyze', analyze)
+    monkeypatch.setattr(app_module.gemini_analyzer, 'available', lambda: True)
+    return calls
+
+
+@pytest.mark.parametrize('budget', ['inf', '-1', 'nan', 'soon'])
+def test_rules_only_requests_ignore_the_latency_budget(client, budget):
+    response = client.post('/api/analyze', json=BODY, headers={'X-Latency-Budget-Ms': budget})
+    assert response.status_code == 200
+    assert response.headers['X-Analysis-Engine'] == 'rules'
+
+
+@pytest.mark.parametrize('budget', ['inf', '-inf', 'nan', '-1', 'soon'])
+def test_gemini_requests_reject_invalid_budgets(client, gemini, budget):
+    response = client.post('/api/analyze', json={**BODY, 'use_gemini': True},
+                           headers={'X-Latency-Budget-Ms': budget})
+    assert response.status_code == 400
+    assert gemini == []
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1500', 1.5),
+    ('1e300', 60.0),
+    ('0', 60.0),
+])
+def test_latency_budget_is_clamped_to_the_maximum(app_module, monkeypatch, value, expected):
+    monkeypatch.setattr(app_module, 'ANALYSIS_LATENCY_BUDGET_MAX_MS', 60000)
+    with app_module.app.test_request_context(headers={'X-Latency-Budget-Ms': value}):
+        assert app_module._latency_budget({}) == expected
+
+
+def test_zero_budget_waits_indefinitely_without_a_maximum(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'ANALYSIS_LATENCY_BUDGET_MAX_MS', 0)
+    with app_module.app.test_request_context(json={'latency_budget_ms': 0}):
+        assert app_module._latency_budget({'latency_budget_ms': 0}) is None
+
+
+def test_huge_budget_still_waits_for_gemini(client, gemini):
+    response = client.post('/api/analyze', json={**BODY, 'use_gemini': True},
+                           headers={'X-Latency-Budget-Ms': '1e300'})
+    assert response.status_code == 200
+    assert response.headers['X-Analysis-Engine'] == 'gemini'
+    assert response.get_json() == GEMINI_RESULT
+
+
+def multipart(filename, content, boundary='test-boundary'):
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n').encode('utf-8')
+    return head + content + f'\r\n--{boundary}--\r\n'.encode('utf-8'), f'multipart/form-data; boundary={boundary}'
+
+
+def test_cache_keys_on_normalized_text_but_analyzes_the_original(client, app_module, monkeypatch):
+    analyzed = []
+
+    def run_analysis(method, resume_text, job):
+        analyzed.append((resume_text, job))
+        return dict(RULES_RESULT)
+
+    monkeypatch.setattr(app_module, '_run_analysis', run_analysis)
+    monkeypatch.setattr(app_module, 'result_cache', ResultCache())
+    resume = 'SKILLS\r\n  Python,   SQL  \r\n'
+    response = client.post('/api/analyze', json={**BODY, 'resume_text': resume})
+    assert response.headers['X-Cache'] == 'miss'
+    # Scores must not depend on RESULT_CACHE_ENABLED, so the text is passed on as sent
+    assert analyzed == [(resume, BODY['job_description'])]
+    response = client.post('/api/analyze', json={**BODY, 'resume_text': 'SKILLS\nPython, SQL'})
+    assert response.headers['X-Cache'] == 'hit-memory'
+    assert len(analyzed) == 1
+
+@pytest.fixture
+def upload_store(app_module, monkeypatch, tmp_path):
+    store = UploadStore(str(tmp_path / 'uploads'))
+    monkeypatch.setattr(app_module, 'upload_store', store)
+    return store
+
+
+def upload(client, filename, content):
+    return client.post('/api/upload', data={'file': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+
+def test_binary_upload_is_rejected_before_the_body_is_read(client, upload_store):
+    body, content_type = multipart('resume.pdf', b'\x7fELF\x02\x01\x01' + b'\x00' * (8 * 1024 * 1024))
+    stream = io.BytesIO(body)
+    response = client.post('/api/upload', input_stream=stream, content_type=content_type,
+                           content_length=len(body))
+    assert response.status_code == 415
+    # The form parser stopped after the first chunks of the 8 MB body
+    assert 0 < stream.tell() < len(body) // 4
+    assert os.listdir(upload_store.directory) == []
+
+
+def test_legacy_doc_upload_is_rejected(client):
+    response = upload(client, 'resume.doc', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 2048)
+    assert response.status_code == 415
+    assert '.docx' in response.get_json()['error']
+
+
+def test_disallowed_extension_is_rejected(client):
+    assert upload(client, 'resume.exe', b'MZ' + b'\x00' * 2048).status_code == 400
+
+
+def test_pdf_docx_and_text_uploads_are_extracted(client, make_pdf, make_docx):
+    for filename, content in [('resume.pdf', make_pdf('Python developer')),
+                              ('resume.docx', make_docx('Python developer')),
+                              ('resume.txt', b'Python developer\n')]:
+        response = upload(client, filename, content)
+        assert response.status_code == 200, filename
+        assert 'Python developer' in response.get_json()['resume_text']
+
+
+def test_mislabelled_upload_is_extracted_by_its_content(client, make_pdf):
+    response = upload(client, 'resume.txt', make_pdf('Go and Terraform'))
+    assert response.status_code == 200
+    text = response.get_json()['resume_text']
+    assert 'Go and Terraform' in text
+    assert '%PDF' not in text
+
+
+def test_duplicate_uploads_share_one_stored_file(client, upload_store, make_pdf):
+    content = make_pdf('Python developer')
+    first = upload(client, 'first.pdf', content).get_json()['file_id']
+    second = upload(client, 'second.pdf', content).get_json()['file_id']
+    assert first == second
+    assert os.listdir(os.path.join(upload_store.directory, first[:2])) == [f'{first}.pdf']
+
+
+def events(response):
+    """Parse a Server-Sent Events body into (event, data) pairs."""
+    parsed = []
+    for message in response.get_data(as_text=True).split('\n\n'):
+        if message:
+            event, data = message.split('\n')
+            parsed.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return parsed
+
+
+def test_stream_sends_each_stage_then_the_summary(app_module, nltk_data):
+    client = app_module.app.test_client()
+    response = client.post('/api/analyze/stream', json=BODY)
+    assert response.mimetype == 'text/event-stream'
+    received = events(response)
+    assert [event for event, _ in received] == ['skills', 'experience', 'education', 'keywords',
+                                                'suggestions', 'summary']
+    summary = received[-1][1]
+    assert summary == app_module.resume_analyzer.analyze(BODY['resume_text'], BODY['job_description'])
+    for event, data in received[:4]:
+        assert data == {'score': summary[f'{event}_score'], 'details': summary[f'{event}_details']}
+    assert received[4][1] == {'suggestions': summary['suggestions']}
+
+
+def test_stream_forwards_gemini_fields_as_they_arrive(app_module, monkeypatch):
+    result = {
+        'overall_score': 70, 'skills_score': 80, 'skills_details': {'matched': ['python'], 'missing': []},
+        'experience_details': ['5 years'], 'experience_score': 60,
+        'education_score': 50, 'education_details': ['B.Sc.'],
+        'keywords_score': 40, 'keywords_details': {'matched': [], 'missing': ['go']},
+        'suggestions': ['Add Go']
+    }
+    monkeypatch.setattr(app_module.gemini_analyzer, 'available', lambda: True)
+    monkeypatch.setattr(app_module.gemini_analyzer, 'analyze_stream', lambda resume, job: iter(result.items()))
+    response = app_module.app.test_client().post('/api/analyze/stream', json={**BODY, 'use_gemini': True})
+    received = events(response)
+    # A dimension is sent once both its score and details arrived, whatever their order
+    assert [event for event, _ in received] == ['overall', 'skills', 'experience', 'education', 'keywords',
+                                                'suggestions', 'summary']
+    assert received[0][1] == {'score': 70}
+    assert received[2][1] == {'score': 60, 'details': ['5 years']}
+    assert received[-1][1] == result
+
+
+def test_stream_falls_back_to_the_rules_when_gemini_fails(app_module, monkeypatch, nltk_data):
+    def failing(resume, job):
+        raise GeminiError('Gemini API is unavailable')
+        yield
+
+    monkeypatch.setattr(app_module.gemini_analyzer, 'available', lambda: True)
+    monkeypatch.setattr(app_module.gemini_analyzer, 'analyze_stream', failing)
+    response = app_module.app.test_client().post('/api/analyze/stream', json={**BODY, 'use_gemini': True})
+    received = [event for event, _ in events(response)]
+    assert received[0] == 'skills'
+    assert received[-1] == 'summary'
+
+
+def test_stream_reports_a_failure_after_the_first_event(app_module, monkeypatch):
+    def stages(resume, job):
+        yield 'skills', {'score': 10, 'details': {}}
+        raise RuntimeError('analysis broke')
+
+    monkeypatch.setattr(app_module.resume_analyzer, 'analyze_stages', stages)
+    response = app_module.app.test_client().post('/api/analyze/stream', json=BODY)
+    received = events(response)
+    assert [event for event, _ in received] == ['skills', 'error']
+    assert 'analysis broke' in received[1][1]['error']
+
+
+def test_stream_rejects_missing_fields(app_module):
+    response = app_module.app.test_client().post('/api/analyze/stream', json={'resume_text': 'x'})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
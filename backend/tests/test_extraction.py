@@ -0,0 +1,95 @@
+import io
+
+import pytest
+from extraction import (SNIFF_BYTES, SniffedUpload, UnsupportedFile, FileTypeNotAllowed,
+                        check_type, detect_type, extract_text, sniff_upload)
+
+OLE_HEADER = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\x00' * 504
+ELF_HEADER = b'\x7fELF\x02\x01\x01' + b'\x00' * 505
+PNG_HEADER = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR' + b'\x00' * 496
+
+
+@pytest.mark.parametrize('head, expected', [
+    (b'%PDF-1.7\n%\xe2\xe3\xcf\xd3', 'pdf'),
+    (b'\xef\xbb\xbf\r\n%PDF-1.4', 'pdf'),
+    (b'PK\x03\x04\x14\x00\x06\x00', 'docx'),
+    (OLE_HEADER, 'doc'),
+    (b'Jane Doe\nPython developer\n', 'txt'),
+    ('Zoë Müller, Köln'.encode('utf-8'), 'txt'),
+    (ELF_HEADER, None),
+    (PNG_HEADER, None),
+])
+def test_detect_type_reads_magic_bytes(head, expected):
+    assert detect_type(head) == expected
+
+
+def test_pdf_header_past_the_sniffed_bytes_is_not_found():
+    assert detect_type(b'\x00' * SNIFF_BYTES + b'%PDF-1.4') is None
+
+
+@pytest.mark.parametrize('head', [b'', OLE_HEADER, ELF_HEADER, PNG_HEADER])
+def test_check_type_rejects_unsupported_content(head):
+    with pytest.raises(UnsupportedFile) as error:
+        check_type(head)
+    assert error.value.status_code == 415
+
+
+def test_sniff_upload_leaves_the_stream_rewound():
+    stream = io.BytesIO(b'%PDF-1.4\nrest of the file')
+    stream.read(3)
+    assert sniff_upload(stream) == 'pdf'
+    assert stream.tell() == 0
+
+
+def test_upload_with_a_disallowed_name_is_rejected_at_once():
+    with pytest.raises(FileTypeNotAllowed) as error:
+        SniffedUpload('resume.exe')
+    assert error.value.status_code == 400
+
+
+def test_binary_upload_is_rejected_while_arriving():
+    upload = SniffedUpload('resume.pdf')
+    # Werkzeug writes the body in chunks; the first full sniff window decides
+    upload.write(ELF_HEADER[:100])
+    with pytest.raises(UnsupportedFile):
+        upload.write(ELF_HEADER[100:] + b'\x00' * 4096)
+
+
+def test_supported_upload_is_kept_whole():
+    upload = SniffedUpload('resume.txt', max_size=1024)
+    body = b'Python developer\n' * 500
+    for start in range(0, len(body), 300):
+        upload.write(body[start:start + 300])
+    upload.seek(0)
+    assert upload.read() == body
+    assert upload._rolled
+
+
+def test_text_from_a_stream_is_decoded_and_the_stream_stays_open():
+    stream = io.BytesIO('Zoë\r\nPython \xff'.encode('utf-8') + b'\xff')
+    assert extract_text(stream, 'txt') == 'Zoë\nPython \xff'
+    assert not stream.closed
+
+
+def test_pdf_from_a_stream(make_pdf):
+    stream = io.BytesIO(make_pdf('Python developer with SQL'))
+    assert sniff_upload(stream) == 'pdf'
+    assert 'Python developer with SQL' in extract_text(stream, 'pdf')
+    assert not stream.closed
+
+
+def test_docx_from_a_stream(make_docx):
+    stream = io.BytesIO(make_docx('Jane Doe', 'Python developer'))
+    assert sniff_upload(stream) == 'docx'
+    assert extract_text(stream, 'docx') == 'Jane Doe\nPython developer'
+    assert not stream.closed
+
+
+def test_content_not_the_name_picks_the_extractor(make_pdf, tmp_path):
+    # A PDF named .txt is read as a PDF, from a path as well as a stream
+    path = tmp_path / 'resume.txt'
+    path.write_bytes(make_pdf('Kubernetes operator'))
+    with open(path, 'rb') as f:
+        file_type = sniff_upload(f)
+    assert file_type == 'pdf'
+    assert 'Kubernetes operator' in extract_text(str(path), file_type)
@@ -0,0 +1,176 @@
+import io
+import pytest
+import requests
+import gemini_client
+from gemini_client import GeminiClient, CircuitBreaker, CircuitOpen, GeminiError, parse_retry_after
+
+
+def make_response(status_code, body=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def clock(make_clock):
+    return make_clock(gemini_client.time, 'monotonic')
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(gemini_client.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def make_client(outcomes, breaker=None, **options):
+    """A client whose session returns or raises the given outcomes in turn."""
+    client = GeminiClient('https://gemini.test/generate', 'key', breaker=breaker, **options)
+    calls = []
+
+    def post(url, **kwargs):
+        calls.append(url)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    client.session.post = post
+    return client, calls
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.allow()
+        breaker.record_failure()
+
+
+def test_breaker_opens_at_threshold_and_closes_after_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    open_breaker(breaker)
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    clock.now += 30
+    assert breaker.state == 'half_open'
+    assert breaker.allow() is True
+    # Only one trial call at a time
+    assert not breaker.available()
+    with pytest.raises(CircuitOpen):
+        breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow() is False
+
+
+def test_failed_trial_reopens_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    open_breaker(breaker)
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+
+def test_retries_transient_errors_honouring_retry_after(sleeps):
+    client, calls = make_client([
+        make_response(503, headers={'Retry-After': '2'}),
+        requests.ConnectionError('reset'),
+        make_response(200, b'{"candidates": []}')
+    ], backoff_base=0.1, backoff_max=8)
+    assert client.generate('{}') == {'candidates': []}
+    assert len(calls) == 3
+    assert sleeps[0] >= 2
+    assert client.breaker.state == 'closed'
+
+
+def test_gives_up_after_max_retries(sleeps):
+    client, calls = make_client([make_response(500)] * 3, max_retries=2)
+    with pytest.raises(GeminiError) as excinfo:
+        client.post('{}')
+    assert excinfo.value.status_code == 500
+    assert len(calls) == 3
+
+
+def test_does_not_wait_for_long_retry_after(sleeps):
+    client, calls = make_client([make_response(429, headers={'Retry-After': '60'})], backoff_max=8)
+    with pytest.raises(GeminiError):
+        client.post('{}')
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_client_error_is_not_retried_and_leaves_circuit_closed(sleeps):
+    client, calls = make_client([make_response(400)], breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(GeminiError) as excinfo:
+        client.post('{}')
+    assert excinfo.value.status_code == 400
+    assert len(calls) == 1
+    assert client.breaker.state == 'closed'
+
+
+def test_open_circuit_fails_without_calling(clock, sleeps):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    client, calls = make_client([], breaker=breaker)
+    with pytest.raises(CircuitOpen):
+        client.post('{}')
+    assert calls == []
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.ChunkedEncodingError('broken'),
+    requests.exceptions.TooManyRedirects('loop'),
+    requests.exceptions.InvalidURL('bad url'),
+    requests.exceptions.ContentDecodingError('bad gzip')
+])
+def test_any_request_error_during_trial_reopens_circuit(clock, sleeps, error):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock.now += 30
+    client, _ = make_client([error], breaker=breaker, max_retries=0)
+    with pytest.raises(GeminiError):
+        client.post('{}')
+    assert breaker.state == 'open'
+
+    clock.now += 30
+    assert breaker.available()
+
+
+@pytest.mark.parametrize('outcome', [RuntimeError('unexpected'), make_response(400)])
+def test_trial_is_released_when_it_neither_succeeds_nor_fails(clock, sleeps, outcome):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock.now += 30
+    client, _ = make_client([outcome], breaker=breaker)
+    with pytest.raises(Exception):
+        client.post('{}')
+    assert breaker.state == 'half_open'
+    assert breaker.available()
+
+
+def test_invalid_json_raises_gemini_error(sleeps):
+    client, _ = make_client([make_response(200, b'<html>not json</html>')])
+    with pytest.raises(GeminiError):
+        client.generate('{}')
+
+
+def test_stream_decodes_server_sent_events(sleeps):
+    body = b'data: {"n": 1}\r\n\r\n: keep-alive\r\n\r\ndata: {"n": 2}\r\n\r\n'
+    client, _ = make_client([make_response(200, body)])
+    assert list(client.stream('{}', 'https://gemini.test/stream')) == [{'n': 1}, {'n': 2}]
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('3', 3.0),
+    ('-1', 0.0),
+    ('Thu, 01 Jan 1970 00:00:00 GMT', 0.0),
+    ('soon', None),
+    (None, None)
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+from hedging import Hedger
+
+
+@pytest.fixture
+def hedger():
+    hedger = Hedger(max_workers=2)
+    yield hedger
+    hedger.shutdown()
+
+
+def test_preferred_result_in_time_wins(hedger):
+    assert hedger.run(lambda: 'gemini', lambda: 'rules', budget=5) == ('gemini', True)
+
+
+def test_fallback_runs_while_the_preferred_call_is_running(hedger):
+    fallback_ran = threading.Event()
+
+    def preferred():
+        # Finishes only once the fallback has run on the caller's thread
+        assert fallback_ran.wait(5)
+        return 'gemini'
+
+    def fallback():
+        fallback_ran.set()
+        return 'rules'
+
+    assert hedger.run(preferred, fallback, budget=5) == ('gemini', True)
+
+
+def test_late_preferred_result_goes_to_the_callback(hedger):
+    release = threading.Event()
+    late = []
+    delivered = threading.Event()
+
+    def on_late_result(result):
+        late.append(result)
+        delivered.set()
+
+    result = hedger.run(lambda: release.wait(5) and 'gemini', lambda: 'rules', budget=0.05,
+                        on_late_result=on_late_result)
+    assert result == ('rules', False)
+    assert late == []
+    release.set()
+    assert delivered.wait(5)
+    assert late == ['gemini']
+
+
+def test_late_result_that_is_unacceptable_or_failed_is_dropped(hedger):
+    release = threading.Event()
+    late = []
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('upstream failed')
+
+    hedger.run(lambda: release.wait(5) and 'bad', lambda: 'rules', budget=0.05,
+               acceptable=lambda result: result != 'bad', on_late_result=late.append)
+    hedger.run(failing, lambda: 'rules', budget=0.05, on_late_result=late.append)
+    release.set()
+    hedger.executor.shutdown(wait=True)
+    assert late == []
+
+
+def test_unacceptable_preferred_result_uses_the_fallback(hedger):
+    result = hedger.run(lambda: {'overall_score': 0}, lambda: 'rules', budget=5,
+                        acceptable=lambda result: result['overall_score'] > 0)
+    assert result == ('rules', False)
+
+
+def test_failed_preferred_call_uses_the_fallback(hedger):
+    def preferred():
+        raise RuntimeError('upstream failed')
+
+    assert hedger.run(preferred, lambda: 'rules', budget=5) == ('rules', False)
+
+
+def test_failed_fallback_is_ignored_when_the_preferred_call_succeeds(hedger):
+    def fallback():
+        raise ValueError('rules failed')
+
+    assert hedger.run(lambda: 'gemini', fallback, budget=5) == ('gemini', True)
+
+
+def test_failed_fallback_is_raised_when_the_preferred_call_does_not_help(hedger):
+    def fallback():
+        raise ValueError('rules failed')
+
+    with pytest.raises(ValueError, match='rules failed'):
+        hedger.run(lambda: 'bad', fallback, budget=5, acceptable=lambda result: result != 'bad')
+
+    def preferred():
+        raise RuntimeError('upstream failed')
+
+    with pytest.raises(ValueError, match='rules failed'):
+        hedger.run(preferred, fallback, budget=5)
+
+
+def test_preferred_call_that_has_not_started_is_cancelled():
+    hedger = Hedger(max_workers=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def busy():
+        started.set()
+        release.wait(5)
+
+    hedger.executor.submit(busy)
+    assert started.wait(5)
+    calls = []
+    late = []
+    try:
+        # The only thread is busy, so the preferred call is still queued at the deadline
+        result = hedger.run(lambda: calls.append(1) or 'gemini', lambda: 'rules', budget=0.05,
+                            on_late_result=late.append)
+        assert result == ('rules', False)
+    finally:
+        release.set()
+        hedger.executor.shutdown(wait=True)
+    assert calls == []
+    assert late == []
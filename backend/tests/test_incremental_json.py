@@ -0,0 +1,167 @@
+import json
+
+import pytest
+import gemini_analyzer
+from gemini_analyzer import GeminiAnalyzer, REQUIRED_FIELDS
+from gemini_client import GeminiError
+from incremental_json import IncrementalObjectParser
+from loadtest.gemini_stub import analysis_result
+
+RESULT = analysis_result('resume and job description')
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalObjectParser()
+    fields = []
+    for i in range(0, len(text), size):
+        fields.extend(parser.feed(text[i:i + size]))
+    return parser, fields
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 40, 10000])
+def test_members_are_reported_in_order_for_any_chunking(size):
+    text = f"```json\n{json.dumps(RESULT, indent=2)}\n```"
+    parser, fields = feed_in_chunks(text, size)
+    assert fields == list(RESULT.items())
+    assert parser.done
+    assert parser.finish() == []
+    assert parser.fields == RESULT
+
+
+def test_a_member_is_reported_once_its_value_is_complete():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"overall_score": 7') == []
+    assert parser.feed('2, "skills_details": {"matched": ["py') == [('overall_score', 72)]
+    assert parser.feed('thon"], "missing": []}') == []
+    assert parser.feed('}') == [('skills_details', {'matched': ['python'], 'missing': []})]
+
+
+def test_brackets_and_quotes_inside_strings_are_text():
+    value = {'suggestions': ['Use "quotes", {braces} and [brackets]', 'Back\\slash \\" and }'], 'score': 1}
+    _, fields = feed_in_chunks(json.dumps(value), 3)
+    assert dict(fields) == value
+
+
+def test_text_around_the_object_is_ignored():
+    parser = IncrementalObjectParser()
+    assert parser.feed('Here you go: {"a": 1} and {"b": 2}') == [('a', 1)]
+    assert parser.fields == {'a': 1}
+
+
+def test_an_invalid_member_is_skipped():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"a": nope, "b": 2}') == [('b', 2)]
+
+
+def test_finish_keeps_the_complete_items_of_a_truncated_list():
+    parser = IncrementalObjectParser()
+    parser.feed('{"overall_score": 80, "suggestions": ["Quantify results", "Add a sum')
+    assert parser.finish() == [('suggestions', ['Quantify results'])]
+    assert parser.fields == {'overall_score': 80, 'suggestions': ['Quantify results']}
+
+
+def test_finish_closes_a_truncated_nested_object():
+    parser = IncrementalObjectParser()
+    parser.feed('{"skills_details": {"matched": ["python", "sql"], "missing": ["g')
+    assert parser.finish() == [('skills_details', {'matched': ['python', 'sql'], 'missing': []})]
+
+
+@pytest.mark.parametrize('tail, expected', [
+    ('["a", 1', ['a']),
+    ('["a", tr', ['a']),
+    ('["a",', ['a']),
+    ('["a", {"b": "x"', ['a', {'b': 'x'}]),
+    ('["a", {"b": 1', ['a', {}]),
+    ('[', []),
+])
+def test_finish_drops_cut_off_items(tail, expected):
+    parser = IncrementalObjectParser()
+    parser.feed('{"list": ' + tail)
+    assert parser.finish() == [('list', expected)]
+
+
+def test_finish_does_not_guess_a_truncated_scalar():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"overall_score": 80, "skills_score": 6') == [('overall_score', 80)]
+    assert parser.finish() == []
+    assert parser.fields == {'overall_score': 80}
+
+
+@pytest.mark.parametrize('cut', range(1, 400, 13))
+def test_finish_salvages_only_valid_prefixes(cut):
+    text = json.dumps(RESULT)[:cut]
+    parser, _ = feed_in_chunks(text, 5)
+    parser.finish()
+    # Every salvaged field is the full value or a prefix of its list items
+    for key, value in parser.fields.items():
+        full = RESULT[key]
+        if isinstance(full, list):
+            assert value == full[:len(value)]
+        elif isinstance(full, dict):
+            for part, items in value.items():
+                assert items == full[part][:len(items)]
+        else:
+            assert value == full
+
+
+class FakeClient:
+    """Streams canned events, optionally failing after them."""
+
+    def __init__(self, chunks, error=None, finish_reason='STOP'):
+        self.chunks = chunks
+        self.error = error
+        self.finish_reason = finish_reason
+
+    def stream(self, payload, url):
+        for index, chunk in enumerate(self.chunks):
+            candidate = {'content': {'parts': [{'text': chunk}], 'role': 'model'}}
+            if index == len(self.chunks) - 1 and self.error is None:
+                candidate['finishReason'] = self.finish_reason
+            yield {'candidates': [candidate]}
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setattr(gemini_analyzer, 'load_dotenv', lambda: None)
+    monkeypatch.setenv('GEMINI_SINGLE_FLIGHT', 'off')
+    return GeminiAnalyzer(api_key='test-key')
+
+
+def stream_fields(analyzer, client):
+    analyzer.client = client
+    return list(analyzer.analyze_stream('Python developer resume', 'Python developer job'))
+
+
+def test_analyze_stream_yields_every_field(analyzer):
+    text = f"```json\n{json.dumps(RESULT, indent=2)}\n```"
+    chunks = [text[i:i + 40] for i in range(0, len(text), 40)]
+    assert stream_fields(analyzer, FakeClient(chunks)) == list(RESULT.items())
+
+
+def test_analyze_stream_keeps_fields_of_an_interrupted_stream(analyzer):
+    text = json.dumps(RESULT)
+    cut = text.index('"education_score"')
+    fields = stream_fields(analyzer, FakeClient([text[:cut]], error=GeminiError('Connection reset')))
+    received = dict(fields)
+    assert set(received) == set(REQUIRED_FIELDS)
+    assert received['overall_score'] == RESULT['overall_score']
+    assert received['education_score'] == 0
+    # Fields from the model come first, defaults after them
+    assert [field for field, _ in fields][:4] == list(RESULT)[:4]
+
+
+def test_analyze_stream_recovers_a_field_cut_off_by_the_token_limit(analyzer):
+    text = json.dumps(RESULT)
+    cut = text.index('"suggestions"') + len('"suggestions": ["') + 5
+    received = dict(stream_fields(analyzer, FakeClient([text[:cut]], finish_reason='MAX_TOKENS')))
+    assert received['keywords_details'] == RESULT['keywords_details']
+    assert received['suggestions'] == []
+
+
+def test_analyze_stream_raises_when_nothing_arrived(analyzer):
+    with pytest.raises(GeminiError):
+        stream_fields(analyzer, FakeClient(['{"overall'], error=GeminiError('Connection reset')))
+    with pytest.raises(GeminiError, match='No JSON'):
+        stream_fields(analyzer, FakeClient(['I cannot help with that.']))
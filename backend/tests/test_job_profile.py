@@ -0,0 +1,74 @@
+import job_profile
+from job_profile import JobStore, job_id_for
+
+JOB = """Senior Python Engineer
+
+Requirements:
+- 5+ years of experience with Python and SQL
+- Experience with AWS, Docker and Kubernetes
+- Bachelor's degree in Computer Science
+
+Skills: Python, Django, PostgreSQL, REST APIs, communication
+"""
+
+RESUME = """Jane Doe
+SKILLS
+Python, Django, SQL, Docker, AWS
+EXPERIENCE
+Backend Engineer, Acme (2016 - 2023): built REST APIs in Python
+EDUCATION
+Bachelor of Science in Computer Science
+"""
+
+
+def test_store_is_shared_between_connections(db_path):
+    JobStore(db_path).put(job_id_for(JOB), JOB)
+    assert JobStore(db_path).get(job_id_for(JOB)) == JOB
+    assert JobStore(db_path).get('unknown') is None
+
+
+def test_store_expires_unused_registrations(db_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_profile.time, 'time', lambda: now[0])
+    store = JobStore(db_path, ttl=7200)
+    store.put('a', JOB)
+
+    # A lookup after the touch interval extends the registration
+    now[0] += 5000
+    assert store.get('a') == JOB
+    now[0] += 5000
+    assert store.get('a') == JOB
+    now[0] += 7200
+    assert store.get('a') is None
+
+    # Registering again revives it
+    store.put('a', JOB)
+    assert store.get('a') == JOB
+
+
+def test_job_id_resolves_in_another_worker(make_analyzer, db_path):
+    registering = make_analyzer(job_store=JobStore(db_path))
+    other = make_analyzer(job_store=JobStore(db_path), job_profile_cache_size=1)
+
+    job_id = registering.register_job(JOB).job_id
+    profile = other.get_job_profile(job_id)
+    assert profile is not None
+    assert profile.job_id == job_id
+    assert profile.text == JOB
+    assert other.analyze(RESUME, profile) == registering.analyze(RESUME, registering.get_job_profile(job_id))
+
+    # Evicted from the worker's cache, the profile is compiled again from the store
+    other.compile_job('Another job description mentioning Java')
+    assert other.get_job_profile(job_id).text == JOB
+
+
+def test_unknown_job_id(make_analyzer, db_path):
+    analyzer = make_analyzer(job_store=JobStore(db_path))
+    assert analyzer.get_job_profile(job_id_for('never registered')) is None
+
+
+def test_without_store_only_this_worker_knows_the_job(make_analyzer):
+    registering, other = make_analyzer(), make_analyzer()
+    job_id = registering.register_job(JOB).job_id
+    assert registering.get_job_profile(job_id) is not None
+    assert other.get_job_profile(job_id) is None
@@ -0,0 +1,235 @@
+import time
+
+import pytest
+import job_queue
+from job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+
+
+@pytest.fixture
+def clock(make_clock):
+    return make_clock(job_queue.time, 'time')
+
+
+class Handler:
+    """Records payloads and fails the first `failures` runs."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.payloads = []
+
+    def __call__(self, payload):
+        self.payloads.append(payload)
+        if len(self.payloads) <= self.failures:
+            raise RuntimeError(f"failure {len(self.payloads)}")
+        return {'score': payload['n'] * 2}
+
+
+def make_queue(db_path, handler=None, **options):
+    options = {'retry_delay': 5, 'lease_timeout': 300, 'queue_timeout': 600, 'result_ttl': 3600, **options}
+    return JobQueue(db_path, handler or Handler(), **options)
+
+
+def test_submitted_job_runs_and_keeps_its_result(clock, db_path):
+    handler = Handler()
+    queue = make_queue(db_path, handler)
+    job_id = queue.submit({'n': 21})
+    assert queue.get(job_id)['status'] == QUEUED
+
+    clock.now += 1
+    assert queue.run_once()
+    assert not queue.run_once()
+    job = queue.get(job_id)
+    assert (job['status'], job['result'], job['attempts']) == (DONE, {'score': 42}, 1)
+    assert (job['created_at'], job['updated_at']) == (1000.0, 1001.0)
+    assert handler.payloads == [{'n': 21}]
+    assert queue.stats() == {QUEUED: 0, RUNNING: 0, DONE: 1, FAILED: 0}
+
+
+def test_unknown_job_is_none(clock, db_path):
+    assert make_queue(db_path).get('missing') is None
+
+
+def test_jobs_run_oldest_first(clock, db_path):
+    handler = Handler()
+    queue = make_queue(db_path, handler)
+    for n in range(3):
+        queue.submit({'n': n})
+        clock.now += 1
+    while queue.run_once():
+        pass
+    assert handler.payloads == [{'n': 0}, {'n': 1}, {'n': 2}]
+
+
+def test_failed_runs_are_retried_with_exponential_backoff(clock, db_path):
+    handler = Handler(failures=2)
+    queue = make_queue(db_path, handler, max_attempts=3)
+    job_id = queue.submit({'n': 1})
+
+    assert queue.run_once()
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts']) == (QUEUED, 1)
+
+    # Not due before the first retry delay
+    clock.now += 4.9
+    assert not queue.run_once()
+    clock.now += 0.1
+    assert queue.run_once()
+    assert queue.get(job_id)['attempts'] == 2
+
+    # The second retry waits twice as long
+    clock.now += 9.9
+    assert not queue.run_once()
+    clock.now += 0.1
+    assert queue.run_once()
+    job = queue.get(job_id)
+    assert (job['status'], job['result'], job['attempts']) == (DONE, {'score': 2}, 3)
+
+
+def test_job_fails_after_max_attempts(clock, db_path):
+    queue = make_queue(db_path, Handler(failures=5), max_attempts=2)
+    job_id = queue.submit({'n': 1})
+    queue.run_once()
+    clock.now += 5
+    queue.run_once()
+    job = queue.get(job_id)
+    assert (job['status'], job['error'], job['attempts']) == (FAILED, 'failure 2', 2)
+    clock.now += 100
+    assert not queue.run_once()
+
+
+def test_job_of_a_crashed_executor_runs_again_after_its_lease(clock, db_path):
+    handler = Handler()
+    crashed = make_queue(db_path, handler)
+    job_id = crashed.submit({'n': 3})
+    # Claimed by an executor that never finishes it
+    assert crashed._claim() == (job_id, {'n': 3}, 1)
+
+    # Another worker process on the same database
+    survivor = make_queue(db_path, handler)
+    clock.now += 299
+    assert not survivor.run_once()
+    assert survivor.get(job_id)['status'] == RUNNING
+    clock.now += 1
+    assert survivor.run_once()
+    job = survivor.get(job_id)
+    assert (job['status'], job['result'], job['attempts']) == (DONE, {'score': 6}, 2)
+
+
+def test_late_run_of_a_reclaimed_job_records_nothing(clock, db_path):
+    queue = make_queue(db_path)
+    job_id = queue.submit({'n': 1})
+    _, _, first = queue._claim()
+    clock.now += 300
+    _, _, second = queue._claim()
+    assert (first, second) == (1, 2)
+
+    # The first run outlived its lease; its outcome must not overwrite the second run's
+    queue._finish(job_id, first, error='stale failure')
+    assert queue.get(job_id)['status'] == RUNNING
+    queue._finish(job_id, first, result={'score': 0})
+    assert queue.get(job_id)['status'] == RUNNING
+
+    queue._finish(job_id, second, result={'score': 2})
+    job = queue.get(job_id)
+    assert (job['status'], job['result']) == (DONE, {'score': 2})
+
+
+def test_job_whose_lease_expires_on_its_last_attempt_fails(clock, db_path):
+    queue = make_queue(db_path, max_attempts=1)
+    job_id = queue.submit({'n': 1})
+    queue._claim()
+    clock.now += 300
+    assert not queue.run_once()
+    queue._prune()
+    job = queue.get(job_id)
+    assert (job['status'], job['error']) == (FAILED, 'Executor stopped while running the job')
+
+
+def test_queued_job_past_its_deadline_expires(clock, db_path):
+    handler = Handler(failures=1)
+    queue = make_queue(db_path, handler, retry_delay=1000, queue_timeout=600)
+    job_id = queue.submit({'n': 1})
+    queue.run_once()
+
+    # The retry would be due after the deadline
+    clock.now += 600
+    assert not queue.run_once()
+    queue._prune()
+    job = queue.get(job_id)
+    assert (job['status'], job['error']) == (FAILED, 'Job expired before it could finish')
+    assert len(handler.payloads) == 1
+
+
+def test_running_job_is_not_expired_while_its_lease_holds(clock, db_path):
+    queue = make_queue(db_path, lease_timeout=300, queue_timeout=100)
+    job_id = queue.submit({'n': 1})
+    _, _, attempt = queue._claim()
+    clock.now += 200
+    assert not queue.run_once()
+    queue._prune()
+    assert queue.get(job_id)['status'] == RUNNING
+    queue._finish(job_id, attempt, result={'score': 2})
+    assert queue.get(job_id)['status'] == DONE
+
+
+def test_finished_jobs_expire_after_the_result_ttl(clock, db_path):
+    queue = make_queue(db_path, result_ttl=3600)
+    job_id = queue.submit({'n': 1})
+    clock.now += 10
+    queue.run_once()
+    clock.now += 3599
+    assert queue.get(job_id)['status'] == DONE
+    clock.now += 1
+    assert queue.get(job_id) is None
+    # Still stored until pruned
+    assert queue.stats()[DONE] == 1
+
+    queue._prune()
+    assert queue.stats()[DONE] == 0
+
+
+def test_prune_runs_at_most_once_a_minute_and_keeps_pending_jobs(clock, db_path):
+    queue = make_queue(db_path, result_ttl=10)
+    done_id = queue.submit({'n': 1})
+    queue.run_once()
+    queue._prune()
+    pending_id = queue.submit({'n': 2})
+
+    clock.now += 30
+    queue._prune()
+    assert queue.stats()[DONE] == 1
+    clock.now += 30
+    queue._prune()
+    assert queue.stats() == {QUEUED: 1, RUNNING: 0, DONE: 0, FAILED: 0}
+    assert queue.get(done_id) is None
+    assert queue.get(pending_id)['status'] == QUEUED
+
+
+def test_idle_poll_does_not_write(clock, db_path):
+    queue = make_queue(db_path, Handler(failures=1), max_attempts=1, queue_timeout=100)
+    queue.submit({'n': 1})
+    queue.submit({'n': 2})
+    queue._claim()
+    queue.run_once()
+    queue._pruned_at = clock.now
+    # Neither job is runnable: one failed, the other is still leased
+    clock.now += 30
+
+    statements = []
+    queue._connection().set_trace_callback(statements.append)
+    assert not queue.run_once()
+    assert [statement.split()[0] for statement in statements] == ['SELECT']
+
+
+def test_executor_threads_run_submitted_jobs(db_path):
+    queue = JobQueue(db_path, Handler(), executors=2, poll_interval=0.05)
+    queue.start()
+    try:
+        job_ids = [queue.submit({'n': n}) for n in range(5)]
+        deadline = time.monotonic() + 10
+        while queue.stats()[DONE] < 5:
+            assert time.monotonic() < deadline, "Timed out"
+            time.sleep(0.02)
+    finally:
+        queue.stop(timeout=5)
+    assert [queue.get(job_id)['result'] for job_id in job_ids] == [{'score': n * 2} for n in range(5)]
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+from lemma_cache import LemmaCache
+
+
+class Lemmatizer:
+    """Strips a trailing 's' and records what it was asked."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, token):
+        self.calls.append(token)
+        return token[:-1] if token.endswith('s') else token
+
+
+def test_repeat_lookups_are_served_from_the_cache():
+    lemmatizer = Lemmatizer()
+    cache = LemmaCache(lemmatizer, maxsize=10)
+    assert cache.lemmatize('skills') == 'skill'
+    assert cache.lemmatize('skills') == 'skill'
+    assert cache.lemmatize('python') == 'python'
+    assert lemmatizer.calls == ['skills', 'python']
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3, 'size': 2, 'maxsize': 10}
+
+
+def test_least_recently_used_entry_is_evicted():
+    lemmatizer = Lemmatizer()
+    cache = LemmaCache(lemmatizer, maxsize=2)
+    cache.lemmatize('a')
+    cache.lemmatize('b')
+    # Reading 'a' makes 'b' the least recently used
+    cache.lemmatize('a')
+    cache.lemmatize('c')
+    assert len(cache) == 2
+    lemmatizer.calls.clear()
+    cache.lemmatize('a')
+    cache.lemmatize('c')
+    assert lemmatizer.calls == []
+    cache.lemmatize('b')
+    assert lemmatizer.calls == ['b']
+
+
+def test_invalid_size_is_rejected():
+    with pytest.raises(ValueError):
+        LemmaCache(Lemmatizer(), maxsize=0)
+
+
+def test_preload_keeps_the_most_frequent_words(tmp_path):
+    lemmatizer = Lemmatizer()
+    cache = LemmaCache(lemmatizer, maxsize=3)
+    path = tmp_path / 'frequencies.txt'
+    path.write_text('Skills 900\nyears 800\n\nteams 700\nprojects 600\n', encoding='utf-8')
+    assert cache.preload(str(path)) == 3
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+
+    lemmatizer.calls.clear()
+    # Preloaded words are lowercased and found without calling the lemmatizer
+    assert [cache.lemmatize(word) for word in ('skills', 'years', 'teams')] == ['skill', 'year', 'team']
+    assert lemmatizer.calls == []
+    assert cache.lemmatize('projects') == 'project'
+    assert lemmatizer.calls == ['projects']
+
+
+def test_preload_evicts_the_least_frequent_word_first():
+    cache = LemmaCache(Lemmatizer(), maxsize=2)
+    cache.preload(['skills', 'years'])
+    cache.lemmatize('teams')
+    assert 'skills' in cache._cache
+    assert 'years' not in cache._cache
+
+
+def test_clear_resets_entries_and_statistics():
+    cache = LemmaCache(Lemmatizer(), maxsize=10)
+    cache.lemmatize('skills')
+    cache.lemmatize('skills')
+    cache.clear()
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_ratio': 0.0, 'size': 0, 'maxsize': 10}
+
+
+def test_concurrent_lookups_stay_within_the_bound():
+    cache = LemmaCache(Lemmatizer(), maxsize=50)
+    words = [f'word{n}s' for n in range(200)]
+    errors = []
+
+    def lookup():
+        for word in words * 3:
+            if cache.lemmatize(word) != word[:-1]:
+                errors.append(word)
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) == 50
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 4 * 600
+
+
+def test_analyzer_lemmatizes_through_the_cache(make_analyzer):
+    analyzer = make_analyzer(lemma_cache_size=100)
+    analyzer.preprocess_text('Managed teams and projects; managed teams')
+    stats = analyzer.lemma_cache.stats()
+    assert stats['hits'] >= 2
+    assert stats['size'] <= 100
@@ -0,0 +1,182 @@
+import io
+import re
+import threading
+
+import pytest
+from metrics import Histogram, Metrics, server_timing, metrics as global_metrics
+
+SAMPLE = re.compile(r'^[a-z_]+(\{[a-z_]+="(?:[^"\\]|\\.)*"(,le="[^"]+")?\})? [0-9.e+-]+$')
+
+
+def test_histogram_exposition_format():
+    histogram = Histogram('test_seconds', 'Test durations.', 'stage', buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe('parse', seconds)
+    histogram.observe('gemini', 0.2)
+    assert histogram.render() == [
+        '# HELP test_seconds Test durations.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{stage="gemini",le="0.1"} 0',
+        'test_seconds_bucket{stage="gemini",le="1.0"} 1',
+        'test_seconds_bucket{stage="gemini",le="+Inf"} 1',
+        'test_seconds_sum{stage="gemini"} 0.2',
+        'test_seconds_count{stage="gemini"} 1',
+        # Buckets are cumulative, and a value on a bound counts towards it
+        'test_seconds_bucket{stage="parse",le="0.1"} 2',
+        'test_seconds_bucket{stage="parse",le="1.0"} 3',
+        'test_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'test_seconds_sum{stage="parse"} 2.65',
+        'test_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    histogram = Histogram('test_seconds', 'Test durations.', 'endpoint', buckets=(1.0,))
+    histogram.observe('a"b\\c\nd', 0.5)
+    lines = histogram.render()
+    assert 'test_seconds_count{endpoint="a\\"b\\\\c\\nd"} 1' in lines
+    assert all(SAMPLE.match(line) for line in lines if not line.startswith('#'))
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    with metrics.stage('parse'):
+        pass
+    assert metrics.stage('parse') is metrics.stage('other')
+    assert metrics.render() == '\n'.join([
+        '# HELP resumepro_stage_duration_seconds Time spent in each analysis and upload stage.',
+        '# TYPE resumepro_stage_duration_seconds histogram',
+        '# HELP resumepro_request_duration_seconds Time spent serving each endpoint.',
+        '# TYPE resumepro_request_duration_seconds histogram',
+    ]) + '\n'
+
+
+def test_stages_go_to_the_histogram_and_the_request():
+    metrics = Metrics()
+    metrics.enable()
+    metrics.start_request()
+    with metrics.stage('parse'):
+        pass
+    metrics.observe('worker_stage', 0.25)
+    timings = metrics.finish_request()
+    assert [name for name, _ in timings] == ['parse', 'worker_stage']
+    assert timings[1] == ('worker_stage', 0.25)
+    page = metrics.render()
+    assert 'resumepro_stage_duration_seconds_count{stage="parse"} 1' in page
+    assert 'resumepro_stage_duration_seconds_sum{stage="worker_stage"} 0.25' in page
+    # Nothing is collected once the request finished
+    metrics.observe('late', 0.1)
+    assert metrics.finish_request() == []
+
+
+def test_stage_is_recorded_when_the_block_raises():
+    metrics = Metrics()
+    metrics.enable()
+    with metrics.collect() as timings:
+        with pytest.raises(ValueError):
+            with metrics.stage('parse'):
+                raise ValueError
+    assert [name for name, _ in timings] == ['parse']
+
+
+def test_collect_nests_and_restores():
+    metrics = Metrics()
+    metrics.enable()
+    metrics.start_request()
+    with metrics.collect() as inner:
+        metrics.observe('inner', 0.1)
+    metrics.observe('outer', 0.2)
+    assert inner == [('inner', 0.1)]
+    assert metrics.finish_request() == [('outer', 0.2)]
+
+
+def test_requests_on_other_threads_are_kept_apart():
+    metrics = Metrics()
+    metrics.enable()
+    metrics.start_request()
+    other = []
+
+    def serve():
+        metrics.start_request()
+        metrics.observe('other', 0.1)
+        other.extend(metrics.finish_request())
+
+    thread = threading.Thread(target=serve)
+    thread.start()
+    thread.join()
+    metrics.observe('mine', 0.2)
+    assert metrics.finish_request() == [('mine', 0.2)]
+    assert other == [('other', 0.1)]
+
+
+def test_bound_functions_record_into_the_calling_request():
+    metrics = Metrics()
+    metrics.enable()
+    metrics.start_request()
+
+    def gemini_call():
+        with metrics.stage('gemini_http'):
+            pass
+        return 'result'
+
+    bound = metrics.bind(gemini_call)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(bound()))
+    thread.start()
+    thread.join()
+    assert results == ['result']
+    assert [name for name, _ in metrics.finish_request()] == ['gemini_http']
+    # Without a request being collected, bind leaves the function alone
+    assert metrics.bind(gemini_call) is gemini_call
+
+
+def test_server_timing_sums_repeated_stages_in_milliseconds():
+    header = server_timing([('analyzer_skills', 0.002), ('gemini_http', 0.8124), ('analyzer_skills', 0.00031)])
+    assert header == 'analyzer_skills;dur=2.31, gemini_http;dur=812.40'
+    assert server_timing([]) == ''
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(global_metrics, 'enabled', True)
+
+
+def test_metrics_endpoint_is_off_when_disabled(app_module, monkeypatch):
+    monkeypatch.setattr(global_metrics, 'enabled', False)
+    response = app_module.app.test_client().get('/metrics')
+    assert response.status_code == 404
+    assert 'Server-Timing' not in response.headers
+
+
+def test_responses_carry_server_timing(app_module, enabled):
+    client = app_module.app.test_client()
+    response = client.post('/api/upload', data={'file': (io.BytesIO(b'Python developer'), 'cv.txt')},
+                           content_type='multipart/form-data')
+    stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+    assert stages == ['upload_extract', 'total']
+    assert re.fullmatch(r'(\w+;dur=\d+\.\d{2})(, \w+;dur=\d+\.\d{2})*', response.headers['Server-Timing'])
+
+    page = client.get('/metrics')
+    assert page.mimetype == 'text/plain'
+    assert page.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    text = page.get_data(as_text=True)
+    assert 'resumepro_request_duration_seconds_count{endpoint="upload_file"}' in text
+    assert 'resumepro_stage_duration_seconds_count{stage="upload_extract"}' in text
+
+
+def test_gemini_stages_on_the_hedge_thread_reach_server_timing(app_module, enabled, monkeypatch):
+    def analyze(resume_text, job_description):
+        with global_metrics.stage('gemini_http'):
+            pass
+        return {'overall_score': 80}
+
+    monkeypatch.setattr(app_module, '_run_analysis', lambda method, *args, **kwargs: {'overall_score': 55})
+    monkeypatch.setattr(app_module, 'result_cache', None)
+    monkeypatch.setattr(app_module.gemini_analyzer, 'available', lambda: True)
+    monkeypatch.setattr(app_module.gemini_analyzer, 'analyze', analyze)
+    response = app_module.app.test_client().post('/api/analyze', json={
+        'resume_text': 'Python developer', 'job_description': 'Python developer wanted',
+        'use_gemini': True, 'latency_budget_ms': 5000
+    })
+    assert response.headers['X-Analysis-Engine'] == 'gemini'
+    assert 'gemini_http;dur=' in response.headers['Server-Timing']
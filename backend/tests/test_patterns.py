@@ -0,0 +1,101 @@
+import re
+import random
+import pytest
+from analyzer import ResumeAnalyzer
+from benchmarks.corpus import generate_resume, generate_job
+
+# Fragments that stress case folding, offsets and line handling
+FRAGMENTS = ['ı', 'ſ', 'İ', 'K', 'ß', 'é', '東京', 'MS', 'Ph.D', 'M.B.A.', 'EXPERIENCE IN Go, ',
+             'Knowledge Of X. ', 'toolschool', '12 YRS EXP', '5+ years of experience', '  \t', '\r',
+             'degree in\nphysics', 'Bachelor in Computer Science', 'master@foo.com', '(555) 123-4567',
+             'Increased revenue by 20%', '\nSKILLS\n', '\nEducation\n', '\nWork Experience\n']
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return ResumeAnalyzer(nltk_download=False)
+
+
+def reference_sections(analyzer, text):
+    """Section extraction as it was before the patterns were merged: every pattern on every line."""
+    sections = {}
+    current_section = None
+    section_content = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        is_header = False
+        for section, pattern in analyzer.section_patterns.items():
+            if re.search(pattern, line) and len(line) < 50:
+                if current_section:
+                    sections[current_section] = '\n'.join(section_content)
+                current_section = section
+                section_content = []
+                is_header = True
+                break
+        if not is_header and current_section:
+            section_content.append(line)
+    if current_section and section_content:
+        sections[current_section] = '\n'.join(section_content)
+    if not sections:
+        sections['full_text'] = text
+    return sections
+
+
+def reference_scan(analyzer, text):
+    """Every rule set matched pattern by pattern with the re module."""
+    degree = next((name for name, pattern in analyzer.degree_patterns.items() if re.search(pattern, text)), None)
+    years = re.search(analyzer.years_pattern, text, re.IGNORECASE)
+    field = None
+    for pattern in analyzer.field_patterns:
+        match = re.search(pattern, text)
+        if match:
+            field = match.group(1)
+            break
+    return {
+        'degree': degree,
+        'years': int(years.group(1)) if years else None,
+        'field': field,
+        'requirements': [[m.group(1) for m in re.finditer(p, text)] for p in analyzer.requirement_patterns],
+        'has_contact': any(re.search(p, text) for p in analyzer.contact_patterns),
+        'has_achievement': any(re.search(p, text) for p in analyzer.achievement_patterns),
+        'non_ascii': len(re.findall(r'[^\x00-\x7F]', text))
+    }
+
+
+def scan(analyzer, text):
+    result = analyzer.patterns.scan(text)
+    return {name: getattr(result, name) for name in
+            ('degree', 'years', 'field', 'requirements', 'has_contact', 'has_achievement', 'non_ascii')}
+
+
+def fuzz_corpus(count=300):
+    for seed in range(count):
+        rng = random.Random(seed)
+        text = generate_resume(seed) if seed % 2 else generate_job(seed, size=rng.randint(200, 1500))
+        for _ in range(rng.randint(0, 8)):
+            position = rng.randint(0, len(text))
+            text = text[:position] + rng.choice(FRAGMENTS) + text[position:]
+        if rng.random() < 0.3:
+            text = text.upper()
+        yield text
+
+
+def test_merged_scanners_match_original_patterns(analyzer):
+    for text in fuzz_corpus():
+        assert scan(analyzer, text) == reference_scan(analyzer, text), text[:200]
+        assert analyzer.extract_sections(text) == reference_sections(analyzer, text), text[:200]
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'ı ſ İ',
+    'SKILLS\nPython\nEDUCATION\nPH.D. IN PHYSICS\nEXPERIENCE\n10+ YRS EXPERIENCE',
+    'Master of Science in Data Science, ſtatistics minor',
+    "Bachelor's degree in Computer Science or related field. Experience in Go, Rust.",
+    'Requirements: knowledge of SQL. Proficiency in Python. Familiarity with AWS.'
+])
+def test_edge_cases_match_original_patterns(analyzer, text):
+    assert scan(analyzer, text) == reference_scan(analyzer, text)
+    assert analyzer.extract_sections(text) == reference_sections(analyzer, text)
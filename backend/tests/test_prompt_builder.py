@@ -0,0 +1,98 @@
+import re
+import pytest
+from prompt_builder import PromptBuilder, estimate_tokens, split_lines, clean_lines, _is_low_value
+
+SHORT_SKILLS = ['Go', 'C#', 'C++', 'R', 'AI', 'ML', 'GPA: 3.9', '3.8/4.0']
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 (555) 123-4567 | https://github.com/janedoe
+
+SKILLS
+{skills}
+
+EXPERIENCE
+Backend Engineer, Acme (2019 - 2023)
+Built payment APIs in Go and Python
+
+EDUCATION
+B.Sc. Computer Science
+GPA: 3.9
+"""
+
+HEADINGS = re.compile(r'^(SKILLS|EXPERIENCE|EDUCATION)$')
+
+
+def extract_sections(text):
+    """Group lines under upper-case headings, as ResumeAnalyzer.extract_sections does for real resumes."""
+    sections = {}
+    current = None
+    for line in text.split('\n'):
+        if HEADINGS.match(line):
+            current = line.lower()
+            sections[current] = line
+        elif current:
+            sections[current] += '\n' + line
+    return sections
+
+
+def padding(lines, prefix='Delivered'):
+    return '\n'.join(f"{prefix} project {i} with measurable impact on revenue and latency" for i in range(lines))
+
+
+def test_document_within_budget_is_sent_whole():
+    builder = PromptBuilder(extract_sections, token_budget=4000)
+    resume = RESUME.format(skills='\n'.join(SHORT_SKILLS))
+    prompt = builder.build(resume, 'Looking for a Go engineer\nLooking for a Go engineer')
+    for line in split_lines(resume):
+        assert line in prompt
+    # Repeated lines are only dropped when over budget
+    assert prompt.count('Looking for a Go engineer') == 2
+
+
+def test_short_skill_lines_survive_compaction():
+    builder = PromptBuilder(extract_sections, token_budget=700)
+    resume = RESUME.format(skills='\n'.join(SHORT_SKILLS)) + padding(200)
+    prompt = builder.build(resume, 'Go developer wanted')
+    assert estimate_tokens(prompt) <= 700
+    lines = prompt.split('\n')
+    for skill in SHORT_SKILLS:
+        assert skill in lines
+    # Contact details go first when over budget
+    assert 'jane.doe@example.com' not in prompt
+
+
+def test_over_budget_keeps_every_section():
+    builder = PromptBuilder(extract_sections, token_budget=1200)
+    resume = (RESUME.format(skills='Python, Go, SQL\n' + padding(100, 'Skilled'))
+              + padding(100))
+    prompt = builder.build(resume, padding(100, 'Required'))
+    assert estimate_tokens(prompt) <= 1200
+    for label in ('Skills:', 'Experience:', 'Education:'):
+        assert label in prompt
+    assert 'B.Sc. Computer Science' in prompt
+
+
+def test_clean_lines_drops_repeats_and_page_markers():
+    lines = split_lines('Acme Corp — Resume\nPage 1 of 2\nPython\n\n  Acme Corp   — Resume \nPage 2 of 2\n')
+    assert clean_lines(lines) == ['Acme Corp — Resume', 'Python']
+
+
+@pytest.mark.parametrize('line', [
+    'jane.doe@example.com',
+    'jane.doe@example.com | +1 (555) 123-4567 | https://github.com/janedoe',
+    'linkedin.com/in/janedoe · 555.867.5309',
+    'www.janedoe.dev',
+    '+353 1 555 0199',
+    'Page 3 of 4',
+    'References available upon request'
+])
+def test_low_value_lines(line):
+    assert _is_low_value(line)
+
+
+@pytest.mark.parametrize('line', SHORT_SKILLS + [
+    'ASP.NET', 'Vue.io, Node.js, Express.js', 'Socket.io', '2015 - 2019', '01/2020 - 03/2023',
+    'Contact me about Go projects at jane@example.com'
+])
+def test_content_lines_are_kept(line):
+    assert not _is_low_value(line)
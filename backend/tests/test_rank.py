@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from benchmarks.corpus import generate_resume, generate_job
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resumes')
+
+
+@pytest.fixture(scope='module')
+def analyzer(make_analyzer):
+    return make_analyzer()
+
+
+@pytest.fixture(scope='module')
+def resumes():
+    committed = []
+    for name in sorted(os.listdir(RESUME_DIR)):
+        with open(os.path.join(RESUME_DIR, name), encoding='utf-8') as f:
+            committed.append(f.read())
+    return committed + [generate_resume(seed) for seed in range(9)]
+
+
+@pytest.fixture(scope='module')
+def job():
+    return generate_job(3)
+
+
+def reference_ranking(analyzer, job, resumes):
+    """Every resume analyzed on its own, sorted by score with earlier resumes first on ties."""
+    scores = [analyzer.analyze(text, job)['overall_score'] for text in resumes]
+    return sorted(range(len(resumes)), key=lambda index: (-scores[index], index)), scores
+
+
+def test_ranking_matches_individual_analyses(analyzer, job, resumes):
+    order, scores = reference_ranking(analyzer, job, resumes)
+    ranked = analyzer.rank(job, resumes, k=None)
+    assert [item['id'] for item in ranked] == order
+    assert [item['overall_score'] for item in ranked] == [scores[index] for index in order]
+    assert [item['rank'] for item in ranked] == list(range(1, len(resumes) + 1))
+
+
+@pytest.mark.parametrize('k', [1, 3, 5])
+def test_top_k_is_a_prefix_of_the_full_ranking(analyzer, job, resumes, k):
+    full = analyzer.rank(job, resumes, k=None)
+    assert analyzer.rank(job, resumes, k=k) == full[:k]
+
+
+def test_ties_keep_the_earlier_resume(analyzer, job, resumes):
+    # Identical resumes score the same; the earlier one ranks first, also at the cut-off
+    batch = [('first', resumes[0]), ('second', resumes[0]), ('third', resumes[0])]
+    assert [item['id'] for item in analyzer.rank(job, batch, k=None)] == ['first', 'second', 'third']
+    assert [item['id'] for item in analyzer.rank(job, batch, k=2)] == ['first', 'second']
+
+    # A copy of the best resume added last ranks right after it, unless another resume ties
+    order, _ = reference_ranking(analyzer, job, resumes)
+    texts = resumes + [resumes[order[0]]]
+    expected, _ = reference_ranking(analyzer, job, texts)
+    ranked = analyzer.rank(job, list(enumerate(texts)), k=2)
+    assert [item['id'] for item in ranked] == expected[:2]
+    assert expected[0] == order[0]
+
+
+def test_ids_details_and_suggestions(analyzer, job, resumes):
+    ranked = analyzer.rank(job, [('alice', resumes[0]), ('bob', resumes[1])], k=1,
+                           include_details=True, include_suggestions=True)
+    assert len(ranked) == 1
+    item = ranked[0]
+    assert item['id'] in ('alice', 'bob')
+    analysis = analyzer.analyze(dict([('alice', resumes[0]), ('bob', resumes[1])])[item['id']], job)
+    for dimension in ('skills', 'experience', 'education', 'keywords'):
+        assert item[f'{dimension}_score'] == analysis[f'{dimension}_score']
+        assert item[f'{dimension}_details'] == analysis[f'{dimension}_details']
+    assert isinstance(item['suggestions'], list)
+
+    plain = analyzer.rank(job, resumes[:2], k=1)[0]
+    assert 'skills_details' not in plain and 'suggestions' not in plain
+
+
+def test_compiled_job_profile_ranks_the_same(analyzer, job, resumes):
+    profile = analyzer.compile_job(job)
+    assert analyzer.rank(profile, resumes, k=4) == analyzer.rank(job, resumes, k=4)
+
+
+def test_empty_batch(analyzer, job):
+    assert analyzer.rank(job, [], k=5) == []
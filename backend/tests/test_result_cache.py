@@ -0,0 +1,91 @@
+import pytest
+import result_cache
+from result_cache import ResultCache, normalize_text, result_key
+
+RESULT = {'overall_score': 72, 'skills_details': {'matched': ['python'], 'missing': ['go']}}
+
+
+@pytest.fixture
+def clock(make_clock):
+    return make_clock(result_cache.time, 'time')
+
+
+def test_normalize_text_ignores_whitespace_differences():
+    assert normalize_text('  Python\r\nSQL   and\tAWS \r\n') == normalize_text('Python\nSQL and AWS')
+    assert normalize_text('Python\nSQL') != normalize_text('Python SQL')
+
+
+def test_result_key_separates_every_part():
+    key = result_key('resume', 'job', 'rules', '2')
+    assert key == result_key('resume', 'job', 'rules', '2')
+    assert key != result_key('resume', 'job', 'gemini', '2')
+    assert key != result_key('resume', 'job', 'rules', '3')
+    # Moving text between the parts must not collide
+    assert result_key('ab', 'c', 'rules', '2') != result_key('a', 'bc', 'rules', '2')
+
+
+def test_memory_hit_and_miss(clock):
+    cache = ResultCache()
+    assert cache.get('k') is None
+    cache.put('k', RESULT)
+    assert cache.get('k') == RESULT
+    assert cache.get_json('k')[1] == 'memory'
+    stats = cache.stats()
+    assert (stats['memory_hits'], stats['misses']) == (2, 1)
+
+
+def test_entries_expire(clock):
+    cache = ResultCache(ttl=60)
+    cache.put('k', RESULT)
+    clock.now += 61
+    assert cache.get('k') is None
+    assert len(cache) == 0
+
+
+def test_memory_tier_is_bounded_by_bytes(clock):
+    value_size = len(result_cache.json.dumps(RESULT))
+    cache = ResultCache(memory_bytes=value_size * 3)
+    for i in range(5):
+        cache.put(f'k{i}', RESULT)
+        # Reading k0 keeps it most recently used
+        cache.get('k0')
+    assert cache.stats()['memory_bytes'] <= value_size * 3
+    assert cache.get('k0') == RESULT
+    assert cache.get('k1') is None
+    assert cache.stats()['evictions'] == 2
+
+
+def test_disk_tier_is_shared_between_workers(clock, db_path):
+    ResultCache(path=db_path).put('k', RESULT)
+    other = ResultCache(path=db_path)
+    assert other.get_json('k')[1] == 'disk'
+    # The disk hit is kept in memory for the next lookup
+    assert other.get_json('k')[1] == 'memory'
+    assert other.get('k') == RESULT
+
+
+def test_disk_tier_expires_and_prunes_least_recently_read(clock, db_path):
+    value_size = len(result_cache.json.dumps(RESULT))
+    cache = ResultCache(memory_bytes=0, ttl=3600, path=db_path, disk_bytes=value_size * 4)
+    for i in range(4):
+        cache.put(f'k{i}', RESULT)
+        clock.now += 100
+    # Read k0 after the touch interval, so k1 becomes the least recently read
+    assert cache.get('k0') == RESULT
+    cache.put('k4', RESULT)
+    stats = cache.stats()
+    assert stats['disk_bytes'] <= value_size * 4
+    assert cache.get('k1') is None
+    assert cache.get('k0') == RESULT
+    assert cache.get('k4') == RESULT
+
+    clock.now += 3600
+    assert cache.get('k4') is None
+
+
+def test_clear(clock, db_path):
+    cache = ResultCache(path=db_path)
+    cache.put('k', RESULT)
+    cache.clear()
+    assert cache.get('k') is None
+    assert cache.stats()['disk_entries'] == 0
@@ -0,0 +1,149 @@
+import math
+import threading
+
+import pytest
+from resume_index import ResumeIndex
+
+DOCS = {
+    'alice': 'python python django postgres aws',
+    'bob': 'java spring postgres',
+    'carol': 'python pandas numpy statistics python python',
+    'dave': 'javascript react css html',
+}
+
+
+def tokenize(text):
+    return text.lower().split()
+
+
+@pytest.fixture
+def index(db_path):
+    index = ResumeIndex(db_path, tokenize)
+    for doc_id, text in DOCS.items():
+        index.add(doc_id, text)
+    return index
+
+
+def bm25(docs, query, k1=1.2, b=0.75):
+    """Score every document containing a query term, straight from the BM25 formula."""
+    tokenized = {doc_id: tokenize(text) for doc_id, text in docs.items()}
+    average_length = sum(map(len, tokenized.values())) / len(tokenized)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(term in tokens for tokens in tokenized.values())
+        if not df:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, tokens in tokenized.items():
+            tf = tokens.count(term)
+            if tf:
+                norm = tf + k1 * (1 - b + b * len(tokens) / average_length)
+                scores[doc_id] = scores.get(doc_id, 0) + idf * tf * (k1 + 1) / norm
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def assert_scores(actual, expected):
+    assert [doc_id for doc_id, _ in actual] == [doc_id for doc_id, _ in expected]
+    for (_, score), (_, reference) in zip(actual, expected):
+        assert score == pytest.approx(reference)
+
+
+@pytest.mark.parametrize('query', [
+    'python',
+    'python postgres',
+    'postgres aws django',
+    'java javascript',
+    'python statistics numpy react',
+])
+def test_scores_match_bm25(index, query):
+    assert_scores(index.search(query), bm25(DOCS, query))
+
+
+def test_hand_computed_scores(index):
+    # 'aws' is only in alice's 5 terms; the average length is 18 / 4 = 4.5
+    idf = math.log(1 + (4 - 1 + 0.5) / (1 + 0.5))
+    tf_part = 1 * 2.2 / (1 + 1.2 * (0.25 + 0.75 * 5 / 4.5))
+    assert index.search('aws') == [('alice', pytest.approx(idf * tf_part))]
+
+    # carol says python three times in 6 terms, alice twice in 5
+    ranked = index.search('python')
+    assert [doc_id for doc_id, _ in ranked] == ['carol', 'alice']
+
+
+def test_unknown_terms_and_empty_index(index, tmp_path):
+    assert index.search('haskell') == []
+    assert index.search('') == []
+    assert ResumeIndex(str(tmp_path / 'empty.db'), tokenize).search('python') == []
+
+
+def test_k_limits_results_and_ties_break_by_id(index):
+    index.add('erin', 'java spring postgres')
+    ranked = index.search('java spring', k=2)
+    assert [doc_id for doc_id, _ in ranked] == ['bob', 'erin']
+    assert ranked[0][1] == pytest.approx(ranked[1][1])
+    assert len(index.search('java spring', k=1)) == 1
+
+
+def document_frequencies(index):
+    return dict(index._connection().execute('SELECT term, df FROM terms'))
+
+
+def test_delete_updates_statistics(index):
+    assert index.delete('carol')
+    assert not index.delete('carol')
+    remaining = {doc_id: text for doc_id, text in DOCS.items() if doc_id != 'carol'}
+    assert len(index) == 3
+    assert document_frequencies(index)['python'] == 1
+    # Terms only carol had are gone
+    assert 'pandas' not in document_frequencies(index)
+    assert index.get('carol') is None
+    for query in ('python', 'postgres python', 'react'):
+        assert_scores(index.search(query), bm25(remaining, query))
+
+
+def test_re_adding_replaces_the_old_version(index):
+    index.add('bob', 'python kubernetes')
+    updated = {**DOCS, 'bob': 'python kubernetes'}
+    assert len(index) == 4
+    frequencies = document_frequencies(index)
+    assert (frequencies['python'], frequencies['postgres'], frequencies['kubernetes']) == (3, 1, 1)
+    assert 'java' not in frequencies
+    for query in ('python', 'java postgres', 'kubernetes python'):
+        assert_scores(index.search(query), bm25(updated, query))
+
+
+def test_statistics_after_deleting_and_adding_back(index):
+    stats = index._connection().execute('SELECT doc_count, total_length FROM stats').fetchone()
+    frequencies = document_frequencies(index)
+    index.delete('alice')
+    index.add('alice', DOCS['alice'])
+    assert index._connection().execute('SELECT doc_count, total_length FROM stats').fetchone() == stats
+    assert document_frequencies(index) == frequencies
+    assert_scores(index.search('python postgres aws'), bm25(DOCS, 'python postgres aws'))
+
+
+def test_stored_text_and_metadata(index):
+    index.add('frank', 'Go gRPC', metadata={'name': 'Frank'})
+    assert index.get('frank') == {'id': 'frank', 'text': 'Go gRPC', 'metadata': {'name': 'Frank'}}
+    assert index.get_many(['frank', 'missing', 'bob']) == [('frank', 'Go gRPC'), ('bob', DOCS['bob'])]
+
+
+def test_second_connection_sees_the_same_index(index, db_path):
+    # Another worker process opening the same database
+    other = ResumeIndex(db_path, tokenize)
+    assert len(other) == 4
+    assert other.search('python postgres') == index.search('python postgres')
+
+    other.delete('alice')
+    other.add('grace', 'python aws terraform')
+    updated = {**{doc_id: text for doc_id, text in DOCS.items() if doc_id != 'alice'},
+               'grace': 'python aws terraform'}
+    assert_scores(index.search('python aws'), bm25(updated, 'python aws'))
+
+
+def test_other_threads_use_their_own_connection(index):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(index.search('python')))
+    thread.start()
+    thread.join()
+    assert results == [index.search('python')]
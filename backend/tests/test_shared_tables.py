@@ -0,0 +1,119 @@
+import random
+
+import pytest
+from shared_tables import SharedTables, write_tables, build
+from skill_matcher import SkillMatcher, load_taxonomy, DEFAULT_TAXONOMY_PATH
+from benchmarks.corpus import generate_resume, generate_job
+
+TAXONOMY = load_taxonomy(DEFAULT_TAXONOMY_PATH)
+LEMMAS = {'skills': 'skill', 'analyses': 'analysis', 'geese': 'goose', 'cafés': 'café', '東京s': '東京'}
+STOP_WORDS = ['the', 'and', 'of', 'über', 'the']
+
+
+def texts():
+    return [generate_resume(seed) for seed in range(5)] + [generate_job(seed) for seed in range(5)]
+
+
+@pytest.fixture
+def tables(tmp_path):
+    path = str(tmp_path / 'tables.bin')
+    write_tables(path, LEMMAS, STOP_WORDS, TAXONOMY, meta={'taxonomy': 'test'})
+    return SharedTables(path)
+
+
+def test_round_trip_keeps_lemmas(tables):
+    for token, lemma in LEMMAS.items():
+        assert tables.lemmatize(token) == lemma
+        assert token in tables.lemmas
+    assert len(tables.lemmas) == len(LEMMAS)
+    # Tokens without an entry are their own lemma
+    assert tables.lemmatize('python') == 'python'
+    assert tables.lemmas.get('python') is None
+
+
+def test_round_trip_keeps_stopwords_and_meta(tables):
+    assert list(tables.stopwords) == sorted(set(STOP_WORDS))
+    assert tables.stopwords[-1] == 'über'
+    with pytest.raises(IndexError):
+        tables.stopwords[len(tables.stopwords)]
+    assert tables.meta == {'taxonomy': 'test'}
+
+
+def test_round_trip_keeps_the_taxonomy(tables):
+    mapped = tables.skill_matcher()
+    compiled = SkillMatcher(TAXONOMY)
+    assert list(mapped.skills) == compiled.skills
+    assert list(mapped.categories) == compiled.categories
+    for text in texts() + ['C++, C#, node.js and Machine Learning', 'javascript not java']:
+        assert mapped.find(text) == compiled.find(text)
+
+
+def test_empty_tables(tmp_path):
+    path = str(tmp_path / 'empty.bin')
+    write_tables(path, {}, [], {})
+    tables = SharedTables(path)
+    assert tables.lemmatize('skills') == 'skills'
+    assert list(tables.stopwords) == []
+    assert tables.skill_matcher().find('python') == []
+
+
+def test_rebuild_replaces_the_file_atomically(tmp_path):
+    path = str(tmp_path / 'tables.bin')
+    write_tables(path, {'skills': 'skill'}, ['the'], TAXONOMY)
+    old = SharedTables(path)
+    write_tables(path, {'jobs': 'job'}, ['a'], TAXONOMY)
+    # Workers that mapped the old file keep reading it
+    assert old.lemmatize('skills') == 'skill'
+    assert SharedTables(path).lemmatize('jobs') == 'job'
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a tables file at all')
+    with pytest.raises(ValueError):
+        SharedTables(str(path))
+
+
+def test_repeated_rules_find_multi_step_lemmas(tmp_path):
+    path = str(tmp_path / 'tables.bin')
+    meta = {'substitutions': [['s', ''], ['ses', 's']], 'repeat_rules': True}
+    write_tables(path, {'dogs': 'dog'}, [], {}, nouns=['dog', 'bus'], exceptions=['dogs'], meta=meta)
+    tables = SharedTables(path)
+    assert tables.lemmatize('dogs') == 'dog'
+    assert tables.lemmatize('dogss') == 'dog'
+    # Noun lemmas and exception forms are never reduced further
+    assert tables.lemmatize('bus') == 'bus'
+    assert tables.lemmatize('catss') == 'catss'
+
+
+@pytest.fixture(scope='module')
+def wordnet_tables(nltk_data, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('tables') / 'tables.bin')
+    build(path)
+    return SharedTables(path)
+
+
+def test_lemmas_match_wordnet(wordnet_tables):
+    from nltk.corpus import wordnet
+    from nltk.stem import WordNetLemmatizer
+
+    lemmatizer = WordNetLemmatizer()
+    rng = random.Random(11)
+    nouns = sorted(wordnet.all_lemma_names(pos=wordnet.NOUN))
+    tokens = set(rng.sample(nouns, 3000))
+    # Inflected forms, exceptions and tokens WordNet does not know
+    tokens.update(noun + suffix for noun in rng.sample(nouns, 1000) for suffix in ('s', 'es', 'ss', 'ies'))
+    tokens.update(rng.sample(sorted(wordnet._exception_map[wordnet.NOUN]), 500))
+    for text in texts():
+        tokens.update(word.lower() for word in text.split() if word.isalpha())
+    tokens.update(['dogss', 'geese', 'women', 'analyses', 'data', 'glasses', 'buses', 'ss', 'is', 'kubernetes'])
+
+    mismatches = {token: (wordnet_tables.lemmatize(token), lemmatizer.lemmatize(token))
+                  for token in tokens if wordnet_tables.lemmatize(token) != lemmatizer.lemmatize(token)}
+    assert mismatches == {}
+
+
+def test_stopwords_match_nltk(wordnet_tables):
+    from nltk.corpus import stopwords
+    assert set(wordnet_tables.stopwords) == set(stopwords.words('english'))
+    assert wordnet_tables.meta['taxonomy'] == 'skills_taxonomy.txt'
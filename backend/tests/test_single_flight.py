@@ -0,0 +1,207 @@
+import os
+import time
+import threading
+
+import pytest
+from single_flight import SingleFlight, HostSingleFlight, fcntl
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def waiting(flight):
+    """Event set once the flight finds the lock taken and starts waiting."""
+    event = threading.Event()
+    wait = flight._wait
+
+    def _wait(fd):
+        event.set()
+        return wait(fd)
+
+    flight._wait = _wait
+    return event
+
+
+def run_threads(count, target):
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_with_the_same_key_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {'overall_score': 80}
+
+    threads, results = run_threads(5, lambda: flight.do('key', fn))
+    wait_until(lambda: flight.shared == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'overall_score': 80}] * 5
+    assert (flight.calls, flight.shared) == (1, 4)
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    release = threading.Event()
+    threads, results = run_threads(1, lambda: flight.do('slow', lambda: release.wait(5) and 'slow'))
+    wait_until(lambda: flight.calls == 1)
+
+    assert flight.do('fast', lambda: 'fast') == 'fast'
+    release.set()
+    threads[0].join()
+    assert results == ['slow']
+    assert flight.shared == 0
+
+
+def test_waiters_get_the_callers_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError('upstream failed')
+
+    threads, results = run_threads(3, lambda: flight.do('key', fn))
+    wait_until(lambda: flight.shared == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.calls == 1
+
+
+def test_finished_calls_are_not_reused():
+    flight = SingleFlight()
+    calls = []
+    flight.do('key', lambda: calls.append(1))
+    flight.do('key', lambda: calls.append(1))
+    assert len(calls) == 2
+    assert flight._calls == {}
+
+
+def test_a_failed_call_is_forgotten():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
+    assert flight.do('key', lambda: 1) == 1
+
+
+needs_fcntl = pytest.mark.skipif(fcntl is None, reason="fcntl file locks are Unix only")
+
+
+@needs_fcntl
+def test_host_waiters_reuse_the_result_of_the_lock_holder(tmp_path):
+    # Each instance stands for one worker; flock locks separate opens of the file
+    leader = HostSingleFlight(str(tmp_path), poll_interval=0.01)
+    follower = HostSingleFlight(str(tmp_path), poll_interval=0.01)
+    follower_waiting = waiting(follower)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return {'overall_score': 64}
+
+    threads, results = run_threads(1, lambda: leader.do('abc123', slow))
+    started.wait(5)
+    follower_threads, follower_results = run_threads(
+        1, lambda: follower.do('abc123', lambda: {'overall_score': 0}))
+    assert follower_waiting.wait(5)
+    release.set()
+    for thread in threads + follower_threads:
+        thread.join()
+
+    assert results == [{'overall_score': 64}]
+    assert follower_results == [{'overall_score': 64}]
+    assert (leader.calls, follower.calls, follower.shared) == (1, 0, 1)
+
+
+@needs_fcntl
+def test_host_waiter_calls_itself_when_the_lock_holder_failed(tmp_path):
+    leader = HostSingleFlight(str(tmp_path), poll_interval=0.01)
+    follower = HostSingleFlight(str(tmp_path), poll_interval=0.01)
+    follower_waiting = waiting(follower)
+    release = threading.Event()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError('upstream failed')
+
+    threads, results = run_threads(1, lambda: leader.do('abc123', failing))
+    started.wait(5)
+    follower_threads, follower_results = run_threads(1, lambda: follower.do('abc123', lambda: 'own'))
+    assert follower_waiting.wait(5)
+    release.set()
+    for thread in threads + follower_threads:
+        thread.join()
+
+    assert isinstance(results[0], RuntimeError)
+    assert follower_results == ['own']
+    assert (follower.calls, follower.shared) == (1, 0)
+
+
+@needs_fcntl
+def test_host_results_are_not_reused_by_later_callers(tmp_path):
+    flight = HostSingleFlight(str(tmp_path))
+    assert flight.do('abc123', lambda: 1) == 1
+    # Nobody was waiting, so the next caller takes the lock and calls again
+    assert flight.do('abc123', lambda: 2) == 2
+    assert flight.calls == 2
+
+
+@needs_fcntl
+def test_host_ignores_results_older_than_the_ttl(tmp_path):
+    flight = HostSingleFlight(str(tmp_path), result_ttl=10)
+    path = tmp_path / 'abc123.json'
+    path.write_text('{"overall_score": 1}')
+    assert flight._read(str(path)) == {'overall_score': 1}
+    old = time.time() - 11
+    os.utime(path, (old, old))
+    assert flight._read(str(path)) is None
+
+
+@needs_fcntl
+def test_host_waiter_calls_anyway_after_the_wait_timeout(tmp_path):
+    leader = HostSingleFlight(str(tmp_path), poll_interval=0.01)
+    follower = HostSingleFlight(str(tmp_path), wait_timeout=0.05, poll_interval=0.01)
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'leader'
+
+    threads, _ = run_threads(1, lambda: leader.do('abc123', slow))
+    started.wait(5)
+    try:
+        assert follower.do('abc123', lambda: 'follower') == 'follower'
+    finally:
+        release.set()
+        threads[0].join()
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+from skill_matcher import SkillMatcher, DEFAULT_TAXONOMY_PATH, load_taxonomy
+from benchmarks.corpus import generate_resume, generate_job
+
+TAXONOMY = load_taxonomy(DEFAULT_TAXONOMY_PATH)
+
+# Text around skill names: word boundaries, glued letters and digits, punctuation
+SEPARATORS = [' ', '  ', ', ', '/', '-', '.', '(', ')', '\n', '\t', '', 'x', '9', '_', '+', '#', 'é', 'ß']
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher(TAXONOMY)
+
+
+def names(taxonomy):
+    """Every (name, skill) pair in registration order, skills lowercased."""
+    pairs = []
+    for entries in taxonomy.values():
+        for entry in entries:
+            skill, aliases = (entry, ()) if isinstance(entry, str) else entry
+            for name in (skill, *aliases):
+                pairs.append((name.lower(), skill.lower()))
+    return pairs
+
+
+def reference_find(taxonomy, text):
+    """Every occurrence of every name by substring search, kept on word boundaries, leftmost longest first."""
+    skill_of = {}
+    for name, skill in names(taxonomy):
+        skill_of.setdefault(name, skill)
+    text = text.lower()
+    matches = []
+    for name, skill in skill_of.items():
+        start = text.find(name)
+        while start >= 0:
+            end = start + len(name)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                matches.append((start, end, skill))
+            start = text.find(name, start + 1)
+    matches.sort(key=lambda match: (match[0], -match[1]))
+    found = []
+    covered = 0
+    for start, end, skill in matches:
+        if start < covered:
+            continue
+        covered = end
+        if skill not in found:
+            found.append(skill)
+    return found
+
+
+def mangle_case(rng, text):
+    return ''.join(ch.upper() if rng.random() < 0.3 else ch for ch in text)
+
+
+def fuzz_text(rng, all_names):
+    parts = []
+    for _ in range(rng.randint(1, 25)):
+        parts.append(rng.choice(SEPARATORS))
+        parts.append(mangle_case(rng, rng.choice(all_names)))
+    parts.append(rng.choice(SEPARATORS))
+    return ''.join(parts)
+
+
+def corpus():
+    rng = random.Random(10)
+    all_names = [name for name, _ in names(TAXONOMY)] + ['jav', 'scrip', 'node', 'learning', 'machine', 'net']
+    texts = [fuzz_text(rng, all_names) for _ in range(400)]
+    texts += [generate_resume(seed) for seed in range(10)]
+    texts += [generate_job(seed) for seed in range(10)]
+    return texts
+
+
+EDGE_CASES = [
+    '',
+    'java',
+    'javascript',
+    'java javascript',
+    'JavaScript and JAVA',
+    'javascripts',
+    'java2',
+    'java_script',
+    'c++ and c# and c',
+    'c++11',
+    'cpp/c++',
+    'node.js',
+    'node.jsx',
+    'nodejs, node',
+    'asp.net core',
+    'asp.net.core',
+    '.net',
+    'dotnet and .NET',
+    'machine learning',
+    'Machine  learning',
+    'machine-learning',
+    'machine learningml',
+    'ML engineer',
+    'go lang',
+    'golang',
+    'objective-c',
+    'objective-cpp',
+    'html5css3',
+    'react.js/vue.js/angular.js',
+    'İstanbul java',
+    'javİascript',
+]
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_the_reference(matcher, text):
+    assert matcher.find(text) == reference_find(TAXONOMY, text)
+
+
+def test_fuzzed_corpus_matches_the_reference(matcher):
+    for text in corpus():
+        assert matcher.find(text) == reference_find(TAXONOMY, text), text
+
+
+def test_word_boundaries_and_nesting(matcher):
+    assert matcher.find('javascript') == ['javascript']
+    assert matcher.find('java, javascript') == ['java', 'javascript']
+    assert matcher.find('javascripts') == []
+    assert matcher.find('Python3') == []
+
+
+def test_aliases_report_the_canonical_skill(matcher):
+    assert matcher.find('Used JS and ECMAScript') == ['javascript']
+    assert matcher.find('Deep into Machine Learning and ML') == ['machine learning']
+    assert matcher.find('CPP') == ['c++']
+
+
+def test_names_with_punctuation(matcher):
+    assert matcher.find('C++ and C#') == ['c++', 'c#']
+    assert matcher.find('ASP.NET Core and .NET') == ['asp.net', '.net']
+
+
+def test_small_taxonomy_with_overlapping_names():
+    taxonomy = {'x': ['ab', ('abc', ['b c']), 'bcd', ('a b c d', ['cd'])]}
+    matcher = SkillMatcher(taxonomy)
+    for text in ['abcd', 'abc d', 'ab cd', 'a b c d', 'ab, bcd', 'b c d', 'xab abc b cd']:
+        assert matcher.find(text) == reference_find(taxonomy, text), text
+
+
+def test_tables_round_trip(matcher):
+    tables = matcher.tables()
+    transitions = dict(zip(tables['keys'], tables['targets']))
+    copy = SkillMatcher.from_tables(tables['skills'], tables['categories'], transitions, tables['fail'],
+                                    tables['length'], tables['skill'], tables['link'])
+    for text in corpus()[:50]:
+        assert copy.find(text) == matcher.find(text)
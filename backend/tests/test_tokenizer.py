@@ -0,0 +1,78 @@
+import os
+import glob
+import pytest
+from nltk.tokenize import NLTKWordTokenizer
+from benchmarks.corpus import generate_resume, generate_job
+from tokenizer import compare, fast_word_tokenize, PUNCTUATION_TABLE
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resumes')
+
+# The word tokenizer nltk.word_tokenize applies to each sentence
+reference_tokenize = NLTKWordTokenizer().tokenize
+
+EDGE_CASES = {
+    'straight_quotes': '"Team player" with \'hands-on\' `backtick` ``double\'\' experience',
+    'curly_quotes': 'He said “ship it” and ‘test it’ — «quoted» „low“',
+    'dashes': 'Python – Java — Go ‒ Rust ― C++',
+    'contractions': "I can't, won't and shouldn't; y'all gonna gotta wanna lemme gimme",
+    'contraction_case': 'Cannot CANNOT GoNNa Wanna-be wannabe wanna',
+    'curly_contractions': 'don’t can’t it’s ’90s ‘80s',
+    'ellipses': 'Wait... what… really.... ok . . .',
+    'urls': 'https://github.com/user/repo?x=1&y=2#frag www.example.com mailto:a@b.com',
+    'emails_phones': 'jane.doe+cv@example.co.uk (555) 123-4567 +44 20 7946 0958',
+    'non_ascii': 'Résumé naïve café Zürich São Paulo 東京 Москва 🚀 ☕ ﬁ ½ ² ™',
+    'technical': 'C++ C# .NET Node.js ASP.NET 3.8/4.0 GPA: 3.9 $100k 50% 10x',
+    'whitespace': 'tab\tsep\nnew line\r\nwindows nbsp thin​zero-width',
+    'brackets': '(parens) [brackets] {braces} <angle> a/b a\\b a|b',
+    'empty': '',
+    'blank': ' \n\t '
+}
+
+
+def load_resumes():
+    texts = []
+    for path in sorted(glob.glob(os.path.join(RESUMES_DIR, '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    return texts
+
+
+def assert_equivalent(texts, reference=reference_tokenize):
+    result = compare(texts, reference=reference)
+    for index in result['mismatches']:
+        prepared = texts[index].lower().translate(PUNCTUATION_TABLE)
+        assert fast_word_tokenize(prepared) == reference(prepared), f"text {index} tokenizes differently"
+    return result
+
+
+def test_committed_resumes_match_nltk():
+    texts = load_resumes()
+    assert len(texts) >= 3
+    assert_equivalent(texts)
+
+
+def test_generated_corpus_matches_nltk():
+    texts = [generate_resume(seed, size) for seed in range(10) for size in ('1page', '2page')]
+    texts += [generate_job(seed) for seed in range(10)]
+    assert_equivalent(texts)
+
+
+@pytest.mark.parametrize('name', sorted(EDGE_CASES))
+def test_edge_cases_match_nltk(name):
+    assert_equivalent([EDGE_CASES[name]])
+
+
+def test_matches_word_tokenize_with_sentence_splitting():
+    """nltk.word_tokenize also splits sentences first, which needs the punkt data."""
+    from nltk.tokenize import word_tokenize
+    try:
+        word_tokenize('probe')
+    except LookupError:
+        pytest.skip('NLTK punkt data is not installed')
+    assert_equivalent(load_resumes() + list(EDGE_CASES.values()), reference=word_tokenize)
+
+
+def test_fast_tokenizer_is_faster():
+    texts = [generate_resume(seed, '2page') for seed in range(20)]
+    result = compare(texts, reference=reference_tokenize)
+    assert result['fast_seconds'] < result['reference_seconds']
@@ -0,0 +1,58 @@
+import io
+import os
+import hashlib
+import threading
+
+from upload_store import UploadStore
+
+
+def stored_files(directory):
+    return sorted(os.path.relpath(os.path.join(root, name), directory)
+                  for root, _, names in os.walk(directory) for name in names)
+
+
+def test_files_are_stored_under_their_digest(tmp_path):
+    store = UploadStore(str(tmp_path / 'uploads'))
+    content = b'%PDF-1.4 resume'
+    stream = io.BytesIO(content)
+    file_id = store.put(stream, 'pdf')
+    assert file_id == hashlib.sha256(content).hexdigest()
+    assert store.path(file_id, 'pdf') == str(tmp_path / 'uploads' / file_id[:2] / f'{file_id}.pdf')
+    with open(store.path(file_id, 'pdf'), 'rb') as f:
+        assert f.read() == content
+    # The stream is rewound for extraction
+    assert stream.tell() == 0
+
+
+def test_duplicate_uploads_are_stored_once(tmp_path):
+    directory = str(tmp_path / 'uploads')
+    store = UploadStore(directory)
+    first = store.put(io.BytesIO(b'same resume'), 'txt')
+    path = store.path(first, 'txt')
+    stored_at = os.path.getmtime(path)
+    second = store.put(io.BytesIO(b'same resume'), 'txt')
+    assert first == second
+    assert os.path.getmtime(path) == stored_at
+    assert stored_files(directory) == [os.path.join(first[:2], f'{first}.txt')]
+
+    other = store.put(io.BytesIO(b'other resume'), 'txt')
+    assert other != first
+    assert len(stored_files(directory)) == 2
+
+
+def test_concurrent_identical_uploads_leave_one_complete_file(tmp_path):
+    directory = str(tmp_path / 'uploads')
+    store = UploadStore(directory)
+    content = os.urandom(3 * 1024 * 1024)
+    ids = []
+    threads = [threading.Thread(target=lambda: ids.append(store.put(io.BytesIO(content), 'pdf')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 1
+    # No temporary files are left behind
+    assert stored_files(directory) == [os.path.join(ids[0][:2], f'{ids[0]}.pdf')]
+    with open(store.path(ids[0], 'pdf'), 'rb') as f:
+        assert f.read() == content
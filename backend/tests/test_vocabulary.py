@@ -0,0 +1,50 @@
+import numpy as np
+from vocabulary import Vocabulary, match_ids, match_matrix
+
+
+def test_encode_interns_tokens_once():
+    vocabulary = Vocabulary()
+    first = vocabulary.encode(['python', 'sql', 'python'])
+    assert first[0] == first[2] != first[1]
+    assert list(vocabulary.encode(['sql'])) == [first[1]]
+    assert vocabulary.decode(first) == ['python', 'sql', 'python']
+    assert len(vocabulary) == 2
+
+
+def test_table_starts_over_when_full():
+    vocabulary = Vocabulary(max_size=100)
+    for i in range(50):
+        vocabulary.encode([f"resume{i}-{j}" for j in range(10)])
+        assert len(vocabulary) <= 100
+    assert vocabulary.generation > 0
+    assert vocabulary.decode(vocabulary.encode(['python', 'go'])) == ['python', 'go']
+
+
+def test_consistent_reencodes_across_a_reset():
+    vocabulary = Vocabulary(max_size=10)
+    resume = [f"r{i}" for i in range(8)] + ['python']
+    job = [f"j{i}" for i in range(8)] + ['python']
+    resume_ids, job_ids = vocabulary.consistent(lambda: (vocabulary.encode(resume), vocabulary.encode(job)))
+    # Both lists were encoded in one generation, so the shared token has the same id
+    assert resume_ids[-1] == job_ids[-1]
+    assert match_ids(np.unique(resume_ids), np.unique(job_ids)).sum() == 1
+
+
+def test_bounded_vocabulary_scores_like_an_unbounded_one(make_analyzer):
+    bounded, unbounded = make_analyzer(vocabulary_size=300), make_analyzer()
+    job_text = "Python developer with SQL, Docker and AWS experience"
+    bounded_job, unbounded_job = bounded.compile_job(job_text), unbounded.compile_job(job_text)
+    resumes = [' '.join(f"word{i}x{j}" for j in range(30)) + ' python developer sql docker'
+               for i in range(40)]
+    for resume in resumes:
+        assert bounded.analyze(resume, bounded_job) == unbounded.analyze(resume, unbounded_job)
+        assert len(bounded.vocabulary) <= 300 + 100
+    assert bounded.vocabulary.generation > 0
+    assert (bounded.keyword_match_matrix(resumes, [bounded_job]).tolist()
+            == unbounded.keyword_match_matrix(resumes, [unbounded_job]).tolist())
+
+
+def test_match_matrix_scores():
+    resumes = [np.array([1, 2, 3]), np.array([4]), np.array([], dtype=np.int32)]
+    jobs = [np.array([1, 2]), np.array([], dtype=np.int32)]
+    assert match_matrix(resumes, jobs).tolist() == [[100, 100], [0, 100], [0, 100]]
@@ -0,0 +1,96 @@
+import re
+import string
+import sys
+import time
+
+# Quotes and dashes nltk.word_tokenize pads into tokens of their own. All other
+# characters it treats specially are ASCII punctuation.
+_PADDED = '«“‘„»”’‒–—―'
+_PADDED_RE = re.compile(f'[{_PADDED}]')
+
+# The contractions nltk.word_tokenize splits that contain no punctuation
+_CONTRACTIONS = ('cannot', 'gimme', 'gonna', 'gotta', 'lemme', 'wanna')
+_CONTRACTIONS_RE = re.compile(r'(?i)\b(?:cannot|gimme|gonna|gotta|lemme)\b|\bwanna(?=\s|$)')
+
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def _split_contraction(match):
+    """Split a contraction into its two words, e.g. 'gonna' into 'gon na'."""
+    word = match.group()
+    return f' {word[:3]} {word[3:]} '
+
+
+def fast_word_tokenize(text):
+    """
+    Tokenize text the way nltk.word_tokenize does, for text that has already
+    had ASCII punctuation removed (as preprocess_text does). On such text the
+    Punkt sentence splitter and most Treebank rules never fire, so a
+    whitespace split plus the few remaining rules gives identical tokens.
+
+    Args:
+        text (str): Text without ASCII punctuation
+
+    Returns:
+        list: List of tokens
+    """
+    if text.isascii():
+        # Contractions are rare; skip the regex unless one might be present
+        lowered = text.lower()
+        if not any(word in lowered for word in _CONTRACTIONS):
+            return text.split()
+    else:
+        text = _PADDED_RE.sub(r' \g<0> ', text)
+    return _CONTRACTIONS_RE.sub(_split_contraction, text).split()
+
+
+def compare(texts, reference=None):
+    """
+    Check fast_word_tokenize against nltk.word_tokenize on preprocessed texts
+    and time both.
+
+    Args:
+        texts (list): Raw texts, e.g. extracted resumes
+        reference (callable): Tokenizer to compare against, nltk.word_tokenize by default
+
+    Returns:
+        dict: Mismatching text indices and the time each tokenizer took in seconds
+    """
+    if reference is None:
+        from nltk.tokenize import word_tokenize
+        reference = word_tokenize
+
+    prepared = [text.lower().translate(PUNCTUATION_TABLE) for text in texts]
+
+    start = time.perf_counter()
+    expected = [reference(text) for text in prepared]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [fast_word_tokenize(text) for text in prepared]
+    fast_time = time.perf_counter() - start
+
+    return {
+        'mismatches': [i for i, (a, b) in enumerate(zip(expected, actual)) if a != b],
+        'reference_seconds': reference_time,
+        'fast_seconds': fast_time
+    }
+
+
+if __name__ == '__main__':
+    # Usage: python tokenizer.py resume.pdf [resume.docx ...]
+    from extraction import extract_text
+
+    paths = sys.argv[1:]
+    if not paths:
+        sys.exit('Usage: python tokenizer.py FILE [FILE ...]')
+    texts = [extract_text(path, path.rsplit('.', 1)[-1].lower()) for path in paths]
+
+    result = compare(texts)
+    for i in result['mismatches']:
+        print(f"MISMATCH: {paths[i]}")
+    speedup = result['reference_seconds'] / result['fast_seconds'] if result['fast_seconds'] else float('inf')
+    print(f"{len(texts) - len(result['mismatches'])}/{len(texts)} identical; "
+          f"nltk {result['reference_seconds'] * 1000:.1f} ms, fast {result['fast_seconds'] * 1000:.1f} ms "
+          f"({speedup:.1f}x)")
+    sys.exit(1 if result['mismatches'] else 0)
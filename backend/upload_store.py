@@ -0,0 +1,77 @@
+import os
+import hashlib
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO,
+                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Bytes hashed and copied per read
+_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadStore:
+    """
+    A content-addressed store of uploaded files. Each file is kept once under
+    the SHA-256 of its content, so re-uploads take no extra space and names
+    chosen by users can never collide or escape the directory.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialize the UploadStore.
+
+        Args:
+            directory (str): Directory holding the files, created if missing
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, file_id, file_type):
+        """
+        Path of a stored file.
+
+        Args:
+            file_id (str): SHA-256 hex digest returned by put()
+            file_type (str): File type used as the extension, e.g. 'pdf'
+
+        Returns:
+            str: Path, sharded by the first two digest characters
+        """
+        return os.path.join(self.directory, file_id[:2], f"{file_id}.{file_type}")
+
+    def put(self, stream, file_type):
+        """
+        Store a file unless an identical one is stored already.
+
+        Args:
+            stream (file): Seekable binary stream, rewound afterwards
+            file_type (str): File type used as the extension, e.g. 'pdf'
+
+        Returns:
+            str: File id, the SHA-256 hex digest of the content
+        """
+        digest = hashlib.sha256()
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        file_id = digest.hexdigest()
+
+        path = self.path(file_id, file_type)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                stream.seek(0)
+                with open(tmp_path, 'wb') as f:
+                    for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b''):
+                        f.write(chunk)
+                os.replace(tmp_path, path)
+                logger.info(f"Stored upload {file_id}.{file_type}")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        stream.seek(0)
+        return file_id
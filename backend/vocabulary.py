@@ -0,0 +1,149 @@
+import threading
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Interns tokens to integer ids so keyword sets can be compared with
+    vectorized NumPy operations instead of Python sets of strings.
+    The table is bounded: once full it starts over under a new generation,
+    and ids are only comparable within one generation, so callers caching
+    ids keep the generation they were encoded in.
+    """
+
+    def __init__(self, max_size=200000):
+        """
+        Initialize an empty Vocabulary.
+
+        Args:
+            max_size (int): Tokens interned before the table starts over
+        """
+        self.max_size = max_size
+        self.generation = 0
+        self._ids = {}
+        self._tokens = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def encode(self, tokens):
+        """
+        Map tokens to ids, interning unseen tokens.
+
+        Args:
+            tokens (list): Tokens to encode
+
+        Returns:
+            numpy.ndarray: Token ids in the same order, valid in the generation
+                that was current before the call unless it changed meanwhile
+        """
+        ids = self._ids
+        missing = [token for token in tokens if token not in ids]
+        if missing:
+            with self._lock:
+                if (len(self._tokens) + len(missing) > self.max_size
+                        and not getattr(self._local, 'pinned', False)):
+                    # Start over rather than grow with every distinct document
+                    self._ids, self._tokens = {}, []
+                    self.generation += 1
+                ids = self._ids
+                for token in tokens:
+                    if token not in ids:
+                        ids[token] = len(self._tokens)
+                        self._tokens.append(token)
+        return np.fromiter((ids[token] for token in tokens), dtype=np.int32, count=len(tokens))
+
+    def consistent(self, encode):
+        """
+        Run a function that encodes several token lists, repeating it until
+        all of them were encoded in the same generation.
+
+        Args:
+            encode (callable): Function returning the encoded ids
+
+        Returns:
+            The function's result
+        """
+        generation = self.generation
+        result = encode()
+        if self.generation == generation:
+            return result
+        # Retry without starting over again, which could repeat for as long as the
+        # function encodes more tokens than fit beside the ones it already added
+        self._local.pinned = True
+        try:
+            while True:
+                generation = self.generation
+                result = encode()
+                if self.generation == generation:
+                    return result
+        finally:
+            self._local.pinned = False
+
+    def decode(self, ids):
+        """
+        Map ids of the current generation back to tokens.
+
+        Args:
+            ids (iterable): Token ids
+
+        Returns:
+            list: Tokens
+        """
+        return [self._tokens[i] for i in ids]
+
+    def __len__(self):
+        return len(self._tokens)
+
+
+def match_ids(resume_ids, job_ids):
+    """
+    Find which job keywords appear among the resume keywords.
+
+    Args:
+        resume_ids (numpy.ndarray): Unique resume keyword ids
+        job_ids (numpy.ndarray): Unique job keyword ids
+
+    Returns:
+        numpy.ndarray: Boolean mask over job_ids
+    """
+    return np.isin(job_ids, resume_ids, assume_unique=True)
+
+
+def _indicator(id_arrays, columns):
+    """Build a 0/1 matrix marking which of the given columns each id array contains."""
+    matrix = np.zeros((len(id_arrays), len(columns)), dtype=np.float64)
+    lengths = [len(ids) for ids in id_arrays]
+    if not len(columns) or not sum(lengths):
+        return matrix
+    ids = np.concatenate(id_arrays)
+    rows = np.repeat(np.arange(len(id_arrays)), lengths)
+    positions = np.minimum(np.searchsorted(columns, ids), len(columns) - 1)
+    hit = columns[positions] == ids
+    matrix[rows[hit], positions[hit]] = 1.0
+    return matrix
+
+
+def match_matrix(resume_id_arrays, job_id_arrays):
+    """
+    Compute keyword match scores for every resume and job pair in one batched
+    operation. Columns are restricted to the jobs' keywords, so the matrices
+    stay small however large the vocabulary grows.
+
+    Args:
+        resume_id_arrays (list): Unique keyword id arrays, one per resume
+        job_id_arrays (list): Unique keyword id arrays, one per job
+
+    Returns:
+        numpy.ndarray: Integer scores of shape (resumes, jobs)
+    """
+    non_empty = [ids for ids in job_id_arrays if len(ids)]
+    columns = np.unique(np.concatenate(non_empty)) if non_empty else np.empty(0, dtype=np.int32)
+
+    resume_matrix = _indicator(resume_id_arrays, columns)
+    job_matrix = _indicator(job_id_arrays, columns)
+
+    matched = resume_matrix @ job_matrix.T
+    totals = job_matrix.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(totals > 0, matched / totals * 100, 100.0)
+    return np.rint(scores).astype(int)